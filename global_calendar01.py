@@ -23,7 +23,8 @@ from tkinter import ttk, messagebox, font, filedialog, simpledialog
 from tkinter import PhotoImage
 from PIL import Image, ImageTk, ImageDraw, ImageFont
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup, SoupStrainer
 import jdatetime
 import hijri_converter
 import pytz
@@ -31,8 +32,30 @@ import math
 from functools import lru_cache
 import winsound
 import socket
+import sqlite3
 from urllib.request import urlopen
 import urllib.error
+import tracemalloc
+import heapq
+import hashlib
+import queue
+import itertools
+import uuid
+
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+# بازه زمانی (روز) یادآور مناسبت‌های پیش رو
+REMINDER_HORIZON_DAYS = 400
+
+# فاصله بررسی فشرده‌سازی دفترچه مناسبت‌های کاربر (میلی‌ثانیه)
+JOURNAL_COMPACT_INTERVAL_MS = 10 * 60 * 1000
+
+# فقط زیردرخت جدول مناسبت‌ها ساخته می‌شود و بقیه صفحه نادیده گرفته می‌شود
+HOLIDAYS_TABLE_STRAINER = SoupStrainer("table", attrs={"id": "holidays-table"})
 
 # ============================================================================
 # کلاس‌های کمکی و ابزارها
@@ -109,27 +132,450 @@ class DateConverter:
             'is_weekend': date_obj.weekday() >= 5
         }
 
+class EventCache:
+    """کش ماندگار مناسبت‌ها در فایل SQLite"""
+    
+    def __init__(self, path, default_ttl=7 * 24 * 3600):
+        self.path = str(path)
+        self.default_ttl = default_ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS events (
+                source TEXT NOT NULL,
+                calendar TEXT NOT NULL,
+                year INTEGER NOT NULL,
+                events TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                ttl INTEGER NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                content_hash TEXT,
+                PRIMARY KEY (source, calendar, year)
+            )
+        """)
+        # فایل‌های کش قدیمی‌تر ستون content_hash را ندارند
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(events)")}
+        if "content_hash" not in columns:
+            self._conn.execute("ALTER TABLE events ADD COLUMN content_hash TEXT")
+        self._conn.commit()
+    
+    def get(self, source, calendar_type, year):
+        """خواندن یک ردیف کش؛ در صورت نبود None برمی‌گرداند"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT events, fetched_at, ttl, etag, last_modified, content_hash FROM events "
+                "WHERE source = ? AND calendar = ? AND year = ?",
+                (source, calendar_type, year)
+            ).fetchone()
+        
+        if row is None:
+            return None
+        
+        events, fetched_at, ttl, etag, last_modified, content_hash = row
+        return {
+            "events": json.loads(events),
+            "fetched_at": fetched_at,
+            "ttl": ttl,
+            "etag": etag,
+            "last_modified": last_modified,
+            "content_hash": content_hash,
+            "stale": time.time() - fetched_at > ttl
+        }
+    
+    def put(self, source, calendar_type, year, events, ttl=None, etag=None, last_modified=None,
+            content_hash=None):
+        """ذخیره مناسبت‌های یک سال به همراه اعتبارسنج‌ها و هش محتوا"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO events "
+                "(source, calendar, year, events, fetched_at, ttl, etag, last_modified, content_hash) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (source, calendar_type, year, json.dumps(events, ensure_ascii=False),
+                 time.time(), ttl or self.default_ttl, etag, last_modified, content_hash)
+            )
+            self._conn.commit()
+    
+    def touch(self, source, calendar_type, year, etag=None, last_modified=None):
+        """تمدید اعتبار یک ردیف بدون بازنویسی مناسبت‌ها؛ در صورت نبود ردیف False برمی‌گرداند"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE events SET fetched_at = ?, etag = COALESCE(?, etag), "
+                "last_modified = COALESCE(?, last_modified) "
+                "WHERE source = ? AND calendar = ? AND year = ?",
+                (time.time(), etag, last_modified, source, calendar_type, year)
+            )
+            self._conn.commit()
+        return cursor.rowcount > 0
+    
+    def close(self):
+        """بستن فایل کش"""
+        with self._lock:
+            self._conn.close()
+
+class EventJournal:
+    """دفترچه فقط‌افزودنی مناسبت‌های کاربر در قالب JSON Lines
+    
+    هر افزودن، ویرایش یا حذف فقط یک سطر کوچک به انتهای فایل اضافه می‌کند.
+    هنگام شروع، سطرها دوباره اجرا می‌شوند و فشرده‌سازی در پس‌زمینه فایل را
+    با تصویر فعلی مناسبت‌ها جایگزین می‌کند.
+    """
+    
+    def __init__(self, path):
+        self.path = Path(path)
+        self.events = {}          # شناسه -> مناسبت
+        self._by_year = {}        # (تقویم, سال) -> مجموعه شناسه‌ها
+        self._lines = 0
+        self._file = None
+        self._lock = threading.Lock()
+        self._compacting = False
+        self.replay()
+    
+    @staticmethod
+    def _year_key(event):
+        return event.get("calendar", "persian"), int(event["date"].split("/")[0])
+    
+    def _index(self, event):
+        self._by_year.setdefault(self._year_key(event), set()).add(event["id"])
+    
+    def _unindex(self, event):
+        ids = self._by_year.get(self._year_key(event))
+        if ids is not None:
+            ids.discard(event["id"])
+    
+    def _apply(self, record):
+        """اجرای یک سطر دفترچه روی تصویر حافظه"""
+        op = record["op"]
+        event_id = record["id"]
+        
+        if op == "add":
+            event = dict(record["event"], id=event_id)
+            self.events[event_id] = event
+            self._index(event)
+        elif op == "update" and event_id in self.events:
+            self._unindex(self.events[event_id])
+            event = dict(self.events[event_id], **record["changes"])
+            self.events[event_id] = event
+            self._index(event)
+        elif op == "delete" and event_id in self.events:
+            self._unindex(self.events.pop(event_id))
+    
+    def replay(self):
+        """بازسازی مناسبت‌ها از روی فایل دفترچه"""
+        self.events.clear()
+        self._by_year.clear()
+        self._lines = 0
+        
+        if not self.path.exists():
+            return
+        
+        with open(self.path, "rb+") as f:
+            good_end = 0
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # سطر آخر نیمه‌نوشته (مثلاً قطع برق هنگام نوشتن) بریده می‌شود
+                    # تا افزودن بعدی به دنباله آن نچسبد
+                    print(f"سطر ناقص انتهای دفترچه مناسبت‌ها حذف شد: {self._lines + 1}")
+                    f.truncate(good_end)
+                    break
+                good_end += len(line)
+                self._lines += 1
+                try:
+                    self._apply(json.loads(line))
+                except (ValueError, KeyError, TypeError, IndexError):
+                    print(f"سطر نامعتبر در دفترچه مناسبت‌ها: {self._lines}")
+    
+    def _append(self, record):
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._lines += 1
+            self._apply(record)
+    
+    def add(self, event):
+        """افزودن مناسبت و برگرداندن شناسه آن"""
+        event_id = uuid.uuid4().hex
+        self._append({"op": "add", "id": event_id, "event": event, "ts": time.time()})
+        return event_id
+    
+    def update(self, event_id, **changes):
+        """ویرایش بخشی از یک مناسبت"""
+        if event_id not in self.events:
+            raise KeyError(event_id)
+        self._append({"op": "update", "id": event_id, "changes": changes, "ts": time.time()})
+    
+    def delete(self, event_id):
+        """حذف یک مناسبت"""
+        if event_id in self.events:
+            self._append({"op": "delete", "id": event_id, "ts": time.time()})
+    
+    def events_for(self, calendar_type, year):
+        """مناسبت‌های کاربر در یک سال از یک تقویم"""
+        ids = self._by_year.get((calendar_type, year), ())
+        return [self.events[event_id] for event_id in ids]
+    
+    def needs_compaction(self):
+        """آیا سطرهای اضافی (ویرایش و حذف) از تعداد مناسبت‌ها بیشتر شده است"""
+        return self._lines > 2 * len(self.events) + 100
+    
+    def compact(self):
+        """بازنویسی دفترچه با یک سطر برای هر مناسبت زنده"""
+        with self._lock:
+            tmp_path = self.path.with_name(self.path.name + ".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for event_id, event in self.events.items():
+                    record = {"op": "add", "id": event_id, "event": event}
+                    f.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            os.replace(tmp_path, self.path)
+            self._lines = len(self.events)
+    
+    def compact_async(self):
+        """فشرده‌سازی در پس‌زمینه در صورت نیاز"""
+        if self._compacting or not self.needs_compaction():
+            return
+        
+        def task():
+            try:
+                self.compact()
+            except OSError as e:
+                print(f"خطا در فشرده‌سازی دفترچه مناسبت‌ها: {e}")
+            finally:
+                self._compacting = False
+        
+        self._compacting = True
+        threading.Thread(target=task, daemon=True).start()
+    
+    def close(self):
+        """بستن فایل دفترچه"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
 class CalendarAPI:
     """API برای دریافت مناسبت‌های تقویم"""
     
-    def __init__(self):
-        self.base_url = "https://www.timeanddate.com/holidays"
+    # تقویم‌هایی که منبع آنلاین دارند؛ مناسبت‌های داخلی بقیه در کش دیسک ذخیره نمی‌شوند
+    ONLINE_CALENDARS = frozenset({"gregorian"})
+    
+    def __init__(self, base_url="https://www.timeanddate.com/holidays", session=None, cache_path=None):
+        self.base_url = base_url
+        self.source = "timeanddate"
         self.cache = {}
+        # اعتبارسنج‌های HTTP (ETag / Last-Modified) به ازای هر کلید کش
+        self.validators = {}
+        self.session = session or self._create_session()
+        self.store = EventCache(cache_path) if cache_path else None
+        self._refreshed = set()
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _create_session():
+        """ایجاد نشست HTTP مشترک با استخر اتصال و keep-alive"""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=2)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update({
+            "User-Agent": "GlobalCalendar/1.0 (+https://instagram.com/hessamedien)",
+            "Connection": "keep-alive"
+        })
+        return session
+    
+    def close(self):
+        """بستن اتصال‌های باز نشست و فایل کش"""
+        self.session.close()
+        if self.store:
+            self.store.close()
+    
+    def _conditional_get(self, url, cache_key):
+        """درخواست GET شرطی با استفاده از اعتبارسنج‌های ذخیره شده"""
+        headers = {}
+        validator = self.validators.get(cache_key)
+        if validator:
+            if validator.get("etag"):
+                headers["If-None-Match"] = validator["etag"]
+            if validator.get("last_modified"):
+                headers["If-Modified-Since"] = validator["last_modified"]
+        
+        return self.session.get(url, headers=headers, timeout=10)
+    
+    def _store_validators(self, cache_key, response, events, content_hash=None):
+        """ذخیره اعتبارسنج‌ها و هش محتوای پاسخ برای درخواست‌های بعدی"""
+        self.validators[cache_key] = {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "content_hash": content_hash,
+            "events": events
+        }
+    
+    @staticmethod
+    def content_hash(content):
+        """هش SHA-256 بدنه پاسخ برای تشخیص سال‌های تغییر نکرده"""
+        return hashlib.sha256(content).hexdigest()
+    
+    @staticmethod
+    def _declared_encoding(response):
+        """کدگذاری اعلام شده در هدر؛ در غیر این صورت تشخیص به پارسر سپرده می‌شود"""
+        content_type = response.headers.get("Content-Type", "")
+        return response.encoding if "charset" in content_type.lower() else None
+    
+    @staticmethod
+    def parse_holidays_table(content, encoding=None):
+        """استخراج مناسبت‌ها از جدول holidays-table
+        
+        بایت‌های پاسخ مستقیماً به پارسر داده می‌شوند و فقط جدول مناسبت‌ها
+        ساخته می‌شود، نه کل درخت صفحه.
+        """
+        events = []
+        soup = BeautifulSoup(
+            content,
+            HTML_PARSER,
+            parse_only=HOLIDAYS_TABLE_STRAINER,
+            from_encoding=encoding
+        )
+        
+        table = soup.find('table')
+        if table:
+            rows = table.find_all('tr')[1:]  # حذف هدر
+            for row in rows:
+                cols = row.find_all('td')
+                if len(cols) >= 3:
+                    events.append({
+                        "date": cols[0].text.strip(),
+                        "title": cols[2].text.strip(),
+                        "type": "international"
+                    })
+        
+        return events
+    
+    def _load_entry(self, year, calendar_type):
+        """بارگذاری مناسبت‌ها از کش دیسک به حافظه"""
+        if not self.store or calendar_type not in self.ONLINE_CALENDARS:
+            return None
+        
+        cache_key = f"{calendar_type}_{year}"
+        entry = self.store.get(self.source, calendar_type, year)
+        if entry is not None:
+            self.cache[cache_key] = entry["events"]
+            if entry["etag"] or entry["last_modified"] or entry["content_hash"]:
+                self.validators[cache_key] = {
+                    "etag": entry["etag"],
+                    "last_modified": entry["last_modified"],
+                    "content_hash": entry["content_hash"],
+                    "events": entry["events"]
+                }
+        return entry
+    
+    def _save_entry(self, year, calendar_type, events):
+        """ذخیره مناسبت‌های دریافت شده در حافظه و کش دیسک"""
+        cache_key = f"{calendar_type}_{year}"
+        self.cache[cache_key] = events
+        
+        if self.store and calendar_type in self.ONLINE_CALENDARS:
+            validator = self.validators.get(cache_key, {})
+            self.store.put(
+                self.source, calendar_type, year, events,
+                etag=validator.get("etag"),
+                last_modified=validator.get("last_modified"),
+                content_hash=validator.get("content_hash")
+            )
+    
+    def _touch_entry(self, year, calendar_type, events):
+        """تمدید اعتبار سالی که تغییر نکرده است"""
+        if not self.store or calendar_type not in self.ONLINE_CALENDARS:
+            return
+        
+        validator = self.validators.get(f"{calendar_type}_{year}", {})
+        if not self.store.touch(self.source, calendar_type, year,
+                                validator.get("etag"), validator.get("last_modified")):
+            self._save_entry(year, calendar_type, events)
+    
+    def sync_year(self, year, calendar_type):
+        """همگام‌سازی یک سال با منبع آنلاین
+        
+        خروجی (events, changed) است؛ سال تغییر نکرده فقط اعتبارش تمدید
+        می‌شود و نه در کش بازنویسی می‌شود و نه دوباره در فهرست ادغام.
+        """
+        cache_key = f"{calendar_type}_{year}"
+        previous = self.cache.get(cache_key)
+        if previous is None:
+            entry = self._load_entry(year, calendar_type)
+            previous = entry["events"] if entry is not None else None
+        
+        events = self._fetch_online_events(year, calendar_type)
+        if previous is not None and events == previous:
+            self._touch_entry(year, calendar_type, events)
+            return previous, False
+        
+        self._save_entry(year, calendar_type, events)
+        return events, True
+    
+    def sync_years(self, calendar_type, years, callback=None):
+        """همگام‌سازی چند سال؛ فقط سال‌های تغییر کرده به callback داده می‌شوند"""
+        changed = {}
+        for year in years:
+            try:
+                events, is_changed = self.sync_year(year, calendar_type)
+            except Exception as e:
+                print(f"خطا در همگام‌سازی مناسبت‌های {calendar_type} {year}: {e}")
+                continue
+            
+            if is_changed:
+                changed[year] = events
+                if callback:
+                    callback(year, calendar_type, events)
+        
+        return changed
     
     def get_events(self, year, calendar_type="persian"):
-        """دریافت مناسبت‌های سال"""
+        """دریافت مناسبت‌های سال؛ مانند get_cached_events هرگز منتظر شبکه نمی‌ماند"""
+        return self.get_cached_events(year, calendar_type)
+    
+    def get_cached_events(self, year, calendar_type="persian", on_refresh=None):
+        """دریافت مناسبت‌ها بدون انتظار برای شبکه
+        
+        اگر داده‌ای در کش نباشد یا منقضی شده باشد، بروزرسانی در پس‌زمینه
+        انجام می‌شود و پس از اتمام on_refresh فراخوانی می‌شود.
+        """
         cache_key = f"{calendar_type}_{year}"
         
         if cache_key in self.cache:
             return self.cache[cache_key]
         
-        try:
-            events = self._fetch_online_events(year, calendar_type)
-        except:
-            events = self._get_default_events(year, calendar_type)
+        entry = self._load_entry(year, calendar_type)
+        if entry is not None:
+            if entry["stale"]:
+                self.refresh_async(year, calendar_type, on_refresh)
+            return entry["events"]
         
-        self.cache[cache_key] = events
-        return events
+        # مناسبت‌های پیش‌فرض کش نمی‌شوند تا دریافت موفق بعدی پنهان نماند
+        self.refresh_async(year, calendar_type, on_refresh)
+        return self._get_default_events(year, calendar_type)
+    
+    def refresh_async(self, year, calendar_type, callback=None):
+        """بروزرسانی یک سال در پس‌زمینه (حداکثر یک بار در هر اجرا)"""
+        cache_key = f"{calendar_type}_{year}"
+        
+        with self._lock:
+            if cache_key in self._refreshed:
+                return
+            self._refreshed.add(cache_key)
+        
+        # callback فقط برای سال‌هایی که واقعاً تغییر کرده‌اند فراخوانی می‌شود
+        threading.Thread(
+            target=self.sync_years, args=(calendar_type, [year], callback), daemon=True
+        ).start()
     
     def _fetch_online_events(self, year, calendar_type):
         """دریافت مناسبت‌ها از اینترنت"""
@@ -154,22 +600,24 @@ class CalendarAPI:
             elif calendar_type == "gregorian":
                 # مناسبت‌های جهانی
                 url = f"{self.base_url}/iran/{year}"
-                response = requests.get(url, timeout=10)
-                soup = BeautifulSoup(response.text, 'html.parser')
+                cache_key = f"{calendar_type}_{year}"
+                response = self._conditional_get(url, cache_key)
+                
+                validator = self.validators.get(cache_key)
+                if response.status_code == 304 and validator:
+                    # صفحه تغییری نکرده است؛ نیازی به تجزیه دوباره نیست
+                    return list(validator["events"])
+                
+                response.raise_for_status()
+                content_hash = self.content_hash(response.content)
+                if validator and validator.get("content_hash") == content_hash:
+                    # سرور اعتبارسنج نداد ولی محتوا همان است
+                    self._store_validators(cache_key, response, validator["events"], content_hash)
+                    return list(validator["events"])
                 
-                table = soup.find('table', {'id': 'holidays-table'})
-                if table:
-                    rows = table.find_all('tr')[1:]  # حذف هدر
-                    for row in rows:
-                        cols = row.find_all('td')
-                        if len(cols) >= 3:
-                            date_str = cols[0].text.strip()
-                            title = cols[2].text.strip()
-                            events.append({
-                                "date": date_str,
-                                "title": title,
-                                "type": "international"
-                            })
+                events.extend(self.parse_holidays_table(response.content, self._declared_encoding(response)))
+                
+                self._store_validators(cache_key, response, list(events), content_hash)
             
             elif calendar_type == "islamic":
                 # مناسبت‌های اسلامی
@@ -189,7 +637,9 @@ class CalendarAPI:
                 events.extend(islamic_events)
         
         except Exception as e:
+            # خطا به فراخواننده می‌رسد تا داده معتبر کش با فهرست خالی جایگزین نشود
             print(f"خطا در دریافت مناسبت‌ها: {e}")
+            raise
         
         return events
     
@@ -240,6 +690,300 @@ class SunriseSunsetCalculator:
             'day_length': '12:30'  # طول روز فرضی
         }
 
+class UIDispatcher:
+    """صف اجرای کارهای نخ‌های پس‌زمینه روی نخ رابط کاربری
+    
+    Tkinter امن در برابر نخ نیست؛ نخ‌های کاری فقط post می‌کنند و نخ اصلی
+    در هر تیک صف را تا سقف بودجه زمانی خالی می‌کند. باقی‌مانده به تیک بعد
+    می‌رود تا انبوه کارهای پس‌زمینه رابط کاربری را قفل نکند.
+    """
+    
+    TICK_MS = 16          # فاصله تیک‌ها وقتی کار در صف هست
+    IDLE_TICK_MS = 50     # فاصله تیک‌ها در حالت بیکار
+    BUDGET_MS = 8         # سقف زمان اجرای کارها در هر تیک
+    
+    def __init__(self, widget, budget_ms=BUDGET_MS):
+        self.widget = widget
+        self.budget = budget_ms / 1000
+        self._queue = queue.Queue()
+        self._tick_id = None
+        self.start()
+    
+    def post(self, callback, *args, **kwargs):
+        """افزودن کار به صف؛ از هر نخی قابل فراخوانی است"""
+        self._queue.put((callback, args, kwargs))
+    
+    def wrap(self, callback):
+        """تابعی که به جای اجرای callback آن را در صف می‌گذارد"""
+        return lambda *args, **kwargs: self.post(callback, *args, **kwargs)
+    
+    def start(self):
+        if self._tick_id is None:
+            self._tick_id = self.widget.after(self.TICK_MS, self._tick)
+    
+    def stop(self):
+        if self._tick_id is not None:
+            self.widget.after_cancel(self._tick_id)
+            self._tick_id = None
+    
+    def drain(self, budget=None):
+        """اجرای کارهای صف تا خالی شدن یا تمام شدن بودجه؛ تعداد اجرا شده را برمی‌گرداند"""
+        deadline = time.perf_counter() + (self.budget if budget is None else budget)
+        ran = 0
+        while True:
+            try:
+                callback, args, kwargs = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                callback(*args, **kwargs)
+            except Exception as e:
+                print(f"خطا در اجرای کار رابط کاربری: {e}")
+            ran += 1
+            if time.perf_counter() >= deadline:
+                break
+        return ran
+    
+    def _tick(self):
+        self.drain()
+        delay = self.TICK_MS if not self._queue.empty() else self.IDLE_TICK_MS
+        try:
+            self._tick_id = self.widget.after(delay, self._tick)
+        except tk.TclError:
+            self._tick_id = None  # پنجره بسته شده
+
+class EventRowPool:
+    """ردیف‌های قابل استفاده مجدد مناسبت‌ها روی یک Canvas اسکرول‌شونده
+    
+    ردیف‌ها با ارتفاع ثابت به صورت پنجره Canvas قرار می‌گیرند، پس ناحیه
+    اسکرول از تعداد آیتم‌ها حساب می‌شود. فقط به اندازه ناحیه قابل مشاهده
+    ردیف ساخته می‌شود و هنگام اسکرول، ردیف‌های خارج شده از دید به آیتم‌های
+    تازه وارد شده متصل می‌شوند (row.item آیتم متصل است). نمایش مناسبت‌های
+    روز دیگر فقط ردیف‌های موجود را تنظیم می‌کند و ویجت تازه نمی‌سازد.
+    """
+    
+    ROW_HEIGHT = 28
+    
+    def __init__(self, canvas, scrollbar, make_row, bind_row, row_height=ROW_HEIGHT):
+        self.canvas = canvas
+        self.scrollbar = scrollbar
+        self.make_row = make_row
+        self.bind_row = bind_row
+        self.row_height = row_height
+        self.items = []
+        self._rows = []
+        self._windows = []
+        self._bound = []       # اندیس آیتم متصل به هر ردیف
+        self._first = None
+        self.created = 0
+        self.binds = 0
+        
+        self._empty = canvas.create_text(8, 10, anchor="nw", text="", state="hidden")
+        canvas.configure(yscrollcommand=self._on_yview, yscrollincrement=row_height)
+        scrollbar.configure(command=canvas.yview)
+        canvas.bind("<Configure>", self._on_resize, add="+")
+    
+    def set_items(self, items, empty_text="", empty_color="black"):
+        """نمایش فهرست تازه از ابتدا و اتصال دوباره همه ردیف‌های قابل مشاهده"""
+        self.items = items
+        self._bound = [None] * len(self._rows)
+        self._first = None
+        self.canvas.itemconfigure(
+            self._empty, text=empty_text, fill=empty_color,
+            state="hidden" if items else "normal"
+        )
+        self.canvas.configure(scrollregion=(0, 0, 0, len(items) * self.row_height))
+        self.canvas.yview_moveto(0)
+        self._refresh()
+    
+    def _visible(self):
+        first = max(0, int(self.canvas.canvasy(0)) // self.row_height)
+        count = max(1, self.canvas.winfo_height() // self.row_height + 2)
+        return first, max(0, min(count, len(self.items) - first))
+    
+    def _refresh(self):
+        first, count = self._visible()
+        
+        if count > len(self._rows):
+            width = self.canvas.winfo_width()
+            while len(self._rows) < count:
+                row = self.make_row(self.canvas)
+                self._rows.append(row)
+                self._windows.append(self.canvas.create_window(
+                    0, 0, window=row, anchor="nw", width=width, height=self.row_height
+                ))
+                self.created += 1
+            self._bound = [None] * len(self._rows)  # با تغییر اندازه استخر نگاشت ردیف‌ها عوض می‌شود
+        
+        size = len(self._rows)
+        used = set()
+        for index in range(first, first + count):
+            slot = index % size
+            used.add(slot)
+            if self._bound[slot] != index:
+                row = self._rows[slot]
+                row.item = self.items[index]
+                self.bind_row(row, self.items[index])
+                self.canvas.coords(self._windows[slot], 0, index * self.row_height)
+                self._bound[slot] = index
+                self.binds += 1
+            self.canvas.itemconfigure(self._windows[slot], state="normal")
+        
+        for slot in range(size):
+            if slot not in used:
+                self.canvas.itemconfigure(self._windows[slot], state="hidden")
+                self._bound[slot] = None
+        self._first = first
+    
+    def _on_yview(self, first, last):
+        self.scrollbar.set(first, last)
+        if self.canvas.canvasy(0) // self.row_height != self._first:
+            self._refresh()
+    
+    def _on_resize(self, event):
+        for window in self._windows:
+            self.canvas.itemconfigure(window, width=event.width)
+        self._refresh()
+
+class ReminderScheduler:
+    """زمان‌بند یادآورها با هیپ مرتب بر اساس زمان اعلام
+    
+    فقط برای نزدیک‌ترین موعد یک after در Tk تنظیم می‌شود و همه متدها باید
+    از نخ رابط کاربری صدا زده شوند. حذف یادآور تنبل است: ورودی فقط علامت
+    می‌خورد و هنگام رسیدن به سر هیپ دور ریخته می‌شود.
+    """
+    
+    MAX_SLEEP = 60.0          # حداکثر خواب (ثانیه) تا تغییر ساعت سیستم دیر تشخیص داده نشود
+    DRIFT_TOLERANCE = 2.0     # اختلاف مجاز ساعت دیواری با ساعت یکنواخت (ثانیه)
+    MISSED_GRACE = 3600       # یادآورهای عقب‌افتاده تا این مدت هنوز اعلام می‌شوند
+    
+    def __init__(self, widget, on_fire, timezone="Asia/Tehran"):
+        self.widget = widget
+        self.on_fire = on_fire
+        self.timezone = pytz.timezone(timezone)
+        self._heap = []        # [زمان اعلام, ترتیب, شناسه, زمان محلی, داده]
+        self._entries = {}     # شناسه -> ورودی هیپ
+        self._fired = {}       # شناسه -> زمان اعلام، برای یادآورهای اعلام شده در بازه MISSED_GRACE
+        self._removed = 0
+        self._counter = itertools.count()
+        self._after_id = None
+        self._clock_offset = None
+        self.clock_changes = 0
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def _fire_time(self, when):
+        """زمان محلی در منطقه زمانی تنظیم شده -> ثانیه یونیکس"""
+        return self.timezone.localize(when).timestamp()
+    
+    def add(self, reminder_id, when, payload):
+        """افزودن یا جایگزینی یک یادآور؛ when زمان محلی بدون منطقه زمانی است"""
+        self.cancel(reminder_id)
+        
+        fire_at = self._fire_time(when)
+        now = time.time()
+        if fire_at < now - self.MISSED_GRACE:
+            return False
+        if fire_at <= now and reminder_id in self._fired:
+            # زمان‌بندی دوباره (مثلاً پس از ذخیره تنظیمات) یادآور اعلام شده را تکرار نمی‌کند
+            return False
+        
+        entry = [fire_at, next(self._counter), reminder_id, when, payload]
+        heapq.heappush(self._heap, entry)
+        self._entries[reminder_id] = entry
+        
+        if self._heap[0] is entry:
+            self._arm()
+        return True
+    
+    def cancel(self, reminder_id):
+        """لغو یک یادآور"""
+        entry = self._entries.pop(reminder_id, None)
+        if entry is None:
+            return False
+        
+        entry[2] = None
+        self._removed += 1
+        if self._removed > 64 and self._removed > len(self._heap) // 2:
+            self._rebuild()
+        return True
+    
+    def cancel_matching(self, prefix):
+        """لغو همه یادآورهایی که شناسه آن‌ها با prefix شروع می‌شود"""
+        for reminder_id in [key for key in self._entries if key.startswith(prefix)]:
+            self.cancel(reminder_id)
+    
+    def set_timezone(self, timezone):
+        """تغییر منطقه زمانی و محاسبه دوباره زمان همه یادآورها"""
+        self.timezone = pytz.timezone(timezone)
+        for entry in self._entries.values():
+            entry[0] = self._fire_time(entry[3])
+        self._rebuild()
+        self._arm()
+    
+    def _rebuild(self):
+        """حذف ورودی‌های لغو شده و ساخت دوباره هیپ"""
+        self._heap = [entry for entry in self._heap if entry[2] is not None]
+        heapq.heapify(self._heap)
+        self._removed = 0
+    
+    def _arm(self):
+        """تنظیم تنها تایمر برای نزدیک‌ترین موعد"""
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+        
+        while self._heap and self._heap[0][2] is None:
+            heapq.heappop(self._heap)
+            self._removed -= 1
+        
+        if not self._heap:
+            return
+        
+        delay = min(max(self._heap[0][0] - time.time(), 0), self.MAX_SLEEP)
+        self._clock_offset = time.time() - time.monotonic()
+        self._after_id = self.widget.after(int(delay * 1000) + 1, self._wake)
+    
+    def _wake(self):
+        """بیدار شدن تایمر: بررسی تغییر ساعت و اعلام یادآورهای سررسید"""
+        self._after_id = None
+        
+        if abs(time.time() - time.monotonic() - self._clock_offset) > self.DRIFT_TOLERANCE:
+            # ساعت سیستم جابه‌جا شده است؛ زمان‌ها مطلق هستند و فقط موعدها دوباره بررسی می‌شوند
+            self.clock_changes += 1
+        
+        now = time.time()
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            entry = heapq.heappop(self._heap)
+            if entry[2] is None:
+                self._removed -= 1
+                continue
+            
+            del self._entries[entry[2]]
+            if now - entry[0] <= self.MISSED_GRACE:
+                self._fired[entry[2]] = entry[0]
+                due.append(entry[4])
+        
+        if self._fired:
+            self._fired = {key: fired_at for key, fired_at in self._fired.items()
+                           if fired_at >= now - self.MISSED_GRACE}
+        
+        for payload in due:
+            try:
+                self.on_fire(payload)
+            except Exception as e:
+                print(f"خطا در اعلام یادآور: {e}")
+        
+        self._arm()
+    
+    def stop(self):
+        """توقف تایمر"""
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+
 # ============================================================================
 # کلاس‌های رابط کاربری
 # ============================================================================
@@ -910,6 +1654,8 @@ class LoadingScreen:
     
     def animate_loading(self, angle):
         """انیمیشن دایره لودینگ"""
+        if self.window is None:
+            return
         self.canvas.delete(self.loading_arc)
         self.loading_arc = self.canvas.create_arc(
             10, 10, 70, 70,
@@ -941,14 +1687,12 @@ class LoadingScreen:
             
             index = min(int(value / 20), len(status_messages) - 1)
             self.status_label.config(text=status_messages[index])
-            
-            if self.window:
-                self.window.update()
     
     def close(self):
         """بستن صفحه لودینگ"""
         if self.window:
             self.window.destroy()
+            self.window = None
 
 class MainWindow:
     """پنجره اصلی برنامه"""
@@ -965,7 +1709,8 @@ class MainWindow:
         
         # ابزارها
         self.date_converter = DateConverter()
-        self.calendar_api = CalendarAPI()
+        self.calendar_api = CalendarAPI(cache_path=app_instance.cache_file)
+        self.journal = EventJournal(app_instance.journal_file)
         self.sun_calculator = SunriseSunsetCalculator()
         
         # متغیرها
@@ -975,9 +1720,17 @@ class MainWindow:
         self.events = []
         self.notifications = []
         
+        # صف کارهای نخ‌های پس‌زمینه
+        self.ui = UIDispatcher(self.window)
+        
         # ایجاد رابط کاربری
         self.setup_ui()
         
+        # زمان‌بند یادآورها
+        self.reminders = ReminderScheduler(
+            self.window, self.show_reminder_toast, config.get("timezone", "Asia/Tehran")
+        )
+        
         # بارگذاری اولیه
         self.load_data()
     
@@ -1109,6 +1862,7 @@ class MainWindow:
         # منوی ابزارها
         tools_menu = tk.Menu(menubar, tearoff=0)
         menubar.add_cascade(label="ابزارها", menu=tools_menu)
+        tools_menu.add_command(label="افزودن مناسبت", command=self.show_event_editor)
         tools_menu.add_command(label="مبدل تاریخ", command=self.show_date_converter)
         tools_menu.add_command(label="تنظیمات منطقه", command=self.show_location_settings)
         tools_menu.add_command(label="تنظیمات اعلان", command=self.show_notification_settings)
@@ -1336,20 +2090,13 @@ class MainWindow:
             bg=self.theme_colors["secondary"],
             highlightthickness=0
         )
-        scrollbar = tk.Scrollbar(events_frame, orient="vertical", command=events_canvas.yview)
-        self.events_content = tk.Frame(events_canvas, bg=self.theme_colors["secondary"])
-        
-        events_canvas.configure(yscrollcommand=scrollbar.set)
+        scrollbar = tk.Scrollbar(events_frame, orient="vertical")
         
         scrollbar.pack(side="right", fill="y")
         events_canvas.pack(side="left", fill="both", expand=True)
         
-        events_canvas.create_window((0, 0), window=self.events_content, anchor="nw")
-        
-        def configure_scrollregion(event):
-            events_canvas.configure(scrollregion=events_canvas.bbox("all"))
-        
-        self.events_content.bind("<Configure>", configure_scrollregion)
+        # ردیف‌های مناسبت بین روزها دوباره استفاده می‌شوند
+        self.event_rows = EventRowPool(events_canvas, scrollbar, self.make_event_row, self.bind_event_row)
         
         # اطلاعات نجومی
         if self.config.get("show_sunrise_sunset", True):
@@ -1468,11 +2215,18 @@ class MainWindow:
         
         # دریافت مناسبت‌ها
         if self.config.get("show_events", True):
-            threading.Thread(target=self.load_events, daemon=True).start()
+            self.load_events_async()
         
         # دریافت اطلاعات نجومی
         if self.config.get("show_sunrise_sunset", True):
             self.update_astronomical_info()
+        
+        # یادآور مناسبت‌های پیش رو
+        self.schedule_event_reminders()
+        self.schedule_user_reminders()
+        
+        # فشرده‌سازی دوره‌ای دفترچه مناسبت‌های کاربر
+        self.compact_journal()
     
     def update_calendar(self):
         """به‌روزرسانی نمایش تقویم"""
@@ -1578,36 +2332,50 @@ class MainWindow:
         # به‌روزرسانی اطلاعات روز انتخابی
         self.update_day_info()
     
+    def fetch_events(self):
+        """دریافت مناسبت‌های سال انتخابی؛ بدون دسترسی به ویجت‌ها و امن برای نخ پس‌زمینه"""
+        year = self.selected_date.year
+        # نمایش فوری از کش؛ بروزرسانی شبکه در پس‌زمینه انجام می‌شود
+        return self.calendar_api.get_cached_events(
+            year,
+            self.current_calendar,
+            on_refresh=lambda *args: self.ui.post(self.load_events)
+        )
+    
+    def apply_events(self, events):
+        """اعمال مناسبت‌های دریافت شده روی رابط کاربری (فقط نخ اصلی)"""
+        user_year = self.calendar_year(self.current_calendar, self.selected_date)
+        self.events = events + self.journal.events_for(self.current_calendar, user_year)
+        
+        # به‌روزرسانی نمایش مناسبت‌ها
+        self.update_events_display()
+        
+        # به‌روزرسانی وضعیت
+        self.status_label.config(text=f"{len(events)} مناسبت بارگذاری شد")
+    
     def load_events(self):
         """بارگذاری مناسبت‌ها"""
         try:
-            year = self.selected_date.year
-            events = self.calendar_api.get_events(year, self.current_calendar)
-            self.events = events
-            
-            # به‌روزرسانی نمایش مناسبت‌ها
-            self.update_events_display()
-            
-            # به‌روزرسانی وضعیت
-            self.status_label.config(text=f"{len(events)} مناسبت بارگذاری شد")
+            self.apply_events(self.fetch_events())
         except Exception as e:
             self.status_label.config(text=f"خطا در بارگذاری مناسبت‌ها: {e}")
     
+    def load_events_async(self):
+        """بارگذاری مناسبت‌ها در نخ پس‌زمینه؛ نتیجه از طریق صف رابط کاربری اعمال می‌شود"""
+        def task():
+            try:
+                events = self.fetch_events()
+            except Exception as e:
+                self.ui.post(self.status_label.config, text=f"خطا در بارگذاری مناسبت‌ها: {e}")
+                return
+            self.ui.post(self.apply_events, events)
+        
+        threading.Thread(target=task, daemon=True).start()
+    
     def update_events_display(self):
         """به‌روزرسانی نمایش مناسبت‌ها"""
-        # پاک کردن ویجت‌های قبلی
-        for widget in self.events_content.winfo_children():
-            widget.destroy()
-        
         if not self.events:
-            no_events = tk.Label(
-                self.events_content,
-                text="هیچ مناسبتی برای نمایش وجود ندارد",
-                font=("Segoe UI", 10),
-                fg=self.theme_colors["text"],
-                bg=self.theme_colors["secondary"]
-            )
-            no_events.pack(pady=10)
+            self.event_rows.set_items([], "هیچ مناسبتی برای نمایش وجود ندارد", self.theme_colors["text"])
             return
         
         # نمایش مناسبت‌های ماه جاری
@@ -1623,38 +2391,46 @@ class MainWindow:
         # مرتب‌سازی بر اساس تاریخ
         month_events.sort(key=lambda x: x["date"])
         
-        for event in month_events[:10]:  # حداکثر 10 مناسبت
-            event_frame = tk.Frame(self.events_content, bg=self.theme_colors["secondary"])
-            event_frame.pack(fill="x", padx=5, pady=2)
-            
-            # نشانگر نوع مناسبت
-            color = "#0078d4" if event.get("type") == "national" else "#28a745"
-            indicator = tk.Frame(event_frame, bg=color, width=3, height=20)
-            indicator.pack(side="left", fill="y", padx=(0, 5))
-            
-            # اطلاعات مناسبت
-            info_label = tk.Label(
-                event_frame,
-                text=f"{event['date']}: {event['title'][:30]}...",
-                font=("Segoe UI", 9),
-                fg=self.theme_colors["text"],
-                bg=self.theme_colors["secondary"],
-                anchor="w"
-            )
-            info_label.pack(side="left", fill="x", expand=True)
-            
-            # دکمه اطلاعات بیشتر
-            more_btn = tk.Button(
-                event_frame,
-                text="...",
-                font=("Segoe UI", 8),
-                fg=self.theme_colors["accent"],
-                bg=self.theme_colors["secondary"],
-                relief="flat",
-                cursor="hand2"
-            )
-            more_btn.pack(side="right")
-            more_btn.bind("<Button-1>", lambda e, ev=event: self.show_event_details(ev))
+        # ردیف‌ها مجازی هستند، پس همه مناسبت‌های ماه بدون سقف نمایش داده می‌شوند
+        self.event_rows.set_items(month_events)
+    
+    def make_event_row(self, parent):
+        """ساخت یک ردیف قابل استفاده مجدد: نشانگر نوع، متن و دکمه اطلاعات بیشتر"""
+        event_frame = tk.Frame(parent, bg=self.theme_colors["secondary"])
+        
+        # نشانگر نوع مناسبت
+        event_frame.indicator = tk.Frame(event_frame, width=3, height=20)
+        event_frame.indicator.pack(side="left", fill="y", padx=(0, 5))
+        
+        # دکمه اطلاعات بیشتر؛ مناسبت از row.item خوانده می‌شود
+        more_btn = tk.Button(
+            event_frame,
+            text="...",
+            font=("Segoe UI", 8),
+            fg=self.theme_colors["accent"],
+            bg=self.theme_colors["secondary"],
+            relief="flat",
+            cursor="hand2"
+        )
+        more_btn.pack(side="right")
+        more_btn.bind("<Button-1>", lambda e: self.show_event_details(event_frame.item))
+        
+        # اطلاعات مناسبت
+        event_frame.info = tk.Label(
+            event_frame,
+            font=("Segoe UI", 9),
+            fg=self.theme_colors["text"],
+            bg=self.theme_colors["secondary"],
+            anchor="w"
+        )
+        event_frame.info.pack(side="left", fill="x", expand=True)
+        return event_frame
+    
+    def bind_event_row(self, event_frame, event):
+        """نمایش یک مناسبت در ردیف بازیافتی"""
+        color = "#0078d4" if event.get("type") == "national" else "#28a745"
+        event_frame.indicator.configure(bg=color)
+        event_frame.info.configure(text=f"{event['date']}: {event['title'][:30]}...")
     
     def update_day_info(self):
         """به‌روزرسانی اطلاعات روز"""
@@ -1727,6 +2503,26 @@ class MainWindow:
         self.time_label.config(text=current_time)
         self.window.after(1000, self.update_time)
     
+    def _calendar_converters(self, calendar_type):
+        """مبدل‌های (از میلادی، به میلادی) یک نوع تقویم"""
+        if calendar_type == "persian":
+            return self.date_converter.gregorian_to_persian, self.date_converter.persian_to_gregorian
+        if calendar_type == "islamic":
+            return self.date_converter.gregorian_to_hijri, self.date_converter.hijri_to_gregorian
+        same = lambda y, m, d: (y, m, d)
+        return same, same
+    
+    def calendar_year(self, calendar_type, date_obj):
+        """سال یک تاریخ میلادی در تقویم داده شده"""
+        from_gregorian = self._calendar_converters(calendar_type)[0]
+        return from_gregorian(date_obj.year, date_obj.month, date_obj.day)[0]
+    
+    def to_gregorian_date(self, calendar_type, date_str):
+        """تبدیل رشته «سال/ماه/روز» یک تقویم به تاریخ میلادی"""
+        y, m, d = map(int, date_str.split("/"))
+        to_gregorian = self._calendar_converters(calendar_type)[1]
+        return datetime(*to_gregorian(y, m, d)).date()
+    
     def format_date(self, date_obj):
         """فرمت‌دهی تاریخ"""
         if self.current_calendar == "persian":
@@ -2165,7 +2961,9 @@ class MainWindow:
     
     def save_location_settings(self, timezone, lat, lon, window):
         """ذخیره تنظیمات منطقه"""
-        self.config["timezone"] = timezone
+        if timezone != self.config.get("timezone"):
+            self.config["timezone"] = timezone
+            self.reminders.set_timezone(timezone)
         try:
             self.config["latitude"] = float(lat)
             self.config["longitude"] = float(lon)
@@ -2175,12 +2973,204 @@ class MainWindow:
         window.destroy()
         messagebox.showinfo("ذخیره شد", "تنظیمات منطقه با موفقیت ذخیره شد.")
     
+    def schedule_event_reminders(self):
+        """زمان‌بندی یادآور مناسبت‌های پیش رو"""
+        self.reminders.cancel_matching("event:")
+        if not self.config.get("notifications", True):
+            return
+        
+        try:
+            hour, minute = map(int, self.config.get("notify_time", "09:00").split(":"))
+            days_before = int(self.config.get("notify_days_before", 0))
+        except ValueError:
+            hour, minute, days_before = 9, 0, 0
+        
+        now = datetime.now()
+        today = now.date()
+        horizon = today + timedelta(days=REMINDER_HORIZON_DAYS)
+        
+        for calendar_type in ("persian", "islamic", "gregorian"):
+            current_year = self.calendar_year(calendar_type, now)
+            for year in (current_year, current_year + 1):
+                for event in self.calendar_api.get_cached_events(year, calendar_type):
+                    try:
+                        event_day = self.to_gregorian_date(calendar_type, event["date"])
+                    except (KeyError, ValueError):
+                        continue
+                    
+                    if not today <= event_day <= horizon:
+                        continue
+                    
+                    notify_day = event_day - timedelta(days=days_before)
+                    when = datetime(notify_day.year, notify_day.month, notify_day.day, hour, minute)
+                    self.reminders.add(
+                        f"event:{calendar_type}:{event['date']}:{event['title']}",
+                        when,
+                        {"title": event["title"], "date": event["date"]}
+                    )
+    
+    def schedule_user_reminder(self, event):
+        """زمان‌بندی یادآور یک مناسبت کاربر"""
+        reminder_id = f"user:{event['id']}"
+        self.reminders.cancel(reminder_id)
+        if not event.get("reminder") or not self.config.get("notifications", True):
+            return
+        
+        try:
+            hour, minute = map(int, event["reminder"].split(":"))
+            event_day = self.to_gregorian_date(event.get("calendar", "persian"), event["date"])
+        except (KeyError, ValueError):
+            return
+        
+        if event_day <= datetime.now().date() + timedelta(days=REMINDER_HORIZON_DAYS):
+            when = datetime(event_day.year, event_day.month, event_day.day, hour, minute)
+            self.reminders.add(reminder_id, when, {"title": event["title"], "date": event["date"]})
+    
+    def schedule_user_reminders(self):
+        """زمان‌بندی یادآور همه مناسبت‌های کاربر"""
+        self.reminders.cancel_matching("user:")
+        for event in self.journal.events.values():
+            self.schedule_user_reminder(event)
+    
+    def show_reminder_toast(self, reminder):
+        """نمایش اعلان کوچک در گوشه صفحه"""
+        if not self.config.get("notifications", True):
+            return
+        
+        toast = tk.Toplevel(self.window)
+        toast.overrideredirect(True)
+        toast.attributes("-topmost", True)
+        toast.configure(bg=self.theme_colors["accent"])
+        
+        body = tk.Frame(toast, bg=self.theme_colors["secondary"])
+        body.pack(fill="both", expand=True, padx=2, pady=2)
+        
+        tk.Label(
+            body,
+            text=f"🔔 {reminder['title']}",
+            font=("Segoe UI", 11, "bold"),
+            fg=self.theme_colors["fg"],
+            bg=self.theme_colors["secondary"]
+        ).pack(anchor="e", padx=15, pady=(10, 2))
+        
+        tk.Label(
+            body,
+            text=reminder.get("date", ""),
+            font=("Segoe UI", 9),
+            fg=self.theme_colors["text"],
+            bg=self.theme_colors["secondary"]
+        ).pack(anchor="e", padx=15, pady=(0, 10))
+        
+        toast.update_idletasks()
+        width, height = max(toast.winfo_width(), 280), toast.winfo_height()
+        x = toast.winfo_screenwidth() - width - 20
+        y = toast.winfo_screenheight() - height - 60
+        toast.geometry(f"{width}x{height}+{x}+{y}")
+        
+        toast.bind("<Button-1>", lambda e: toast.destroy())
+        toast.after(8000, toast.destroy)
+        
+        try:
+            winsound.MessageBeep()
+        except Exception:
+            pass
+    
     def show_notification_settings(self):
         """تنظیمات اعلان"""
-        messagebox.showinfo("تنظیمات اعلان", "این بخش در نسخه بعدی اضافه خواهد شد.")
+        settings_window = tk.Toplevel(self.window)
+        settings_window.title("تنظیمات اعلان")
+        settings_window.geometry("400x300")
+        settings_window.configure(bg=self.theme_colors["bg"])
+        
+        tk.Label(
+            settings_window,
+            text="تنظیمات اعلان",
+            font=("Segoe UI", 14, "bold"),
+            fg=self.theme_colors["accent"],
+            bg=self.theme_colors["bg"]
+        ).pack(pady=20)
+        
+        notify_var = tk.BooleanVar(value=self.config.get("notifications", True))
+        tk.Checkbutton(
+            settings_window,
+            text="یادآوری مناسبت‌ها",
+            variable=notify_var,
+            font=("Segoe UI", 11),
+            fg=self.theme_colors["text"],
+            bg=self.theme_colors["bg"],
+            selectcolor=self.theme_colors["secondary"]
+        ).pack(anchor="w", padx=20, pady=5)
+        
+        # ساعت یادآوری
+        time_frame = tk.Frame(settings_window, bg=self.theme_colors["bg"])
+        time_frame.pack(fill="x", padx=20, pady=10)
+        
+        tk.Label(
+            time_frame,
+            text="ساعت یادآوری (HH:MM):",
+            font=("Segoe UI", 11),
+            fg=self.theme_colors["text"],
+            bg=self.theme_colors["bg"]
+        ).pack(side="left")
+        
+        time_var = tk.StringVar(value=self.config.get("notify_time", "09:00"))
+        tk.Entry(time_frame, textvariable=time_var, width=10).pack(side="right")
+        
+        # چند روز زودتر
+        days_frame = tk.Frame(settings_window, bg=self.theme_colors["bg"])
+        days_frame.pack(fill="x", padx=20, pady=10)
+        
+        tk.Label(
+            days_frame,
+            text="چند روز قبل از مناسبت:",
+            font=("Segoe UI", 11),
+            fg=self.theme_colors["text"],
+            bg=self.theme_colors["bg"]
+        ).pack(side="left")
+        
+        days_var = tk.StringVar(value=str(self.config.get("notify_days_before", 0)))
+        ttk.Combobox(
+            days_frame,
+            textvariable=days_var,
+            values=["0", "1", "2", "3", "7"],
+            state="readonly",
+            width=8
+        ).pack(side="right")
+        
+        save_btn = ModernButton(
+            settings_window,
+            text="ذخیره تنظیمات",
+            style="success",
+            command=lambda: self.save_notification_settings(
+                notify_var.get(), time_var.get(), days_var.get(), settings_window
+            )
+        )
+        save_btn.pack(pady=20)
+    
+    def save_notification_settings(self, enabled, notify_time, days_before, window):
+        """ذخیره تنظیمات اعلان و زمان‌بندی دوباره یادآورها"""
+        try:
+            hour, minute = map(int, notify_time.split(":"))
+            if not (0 <= hour < 24 and 0 <= minute < 60):
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("خطا", "ساعت یادآوری باید به صورت HH:MM باشد.")
+            return
+        
+        self.config["notifications"] = enabled
+        self.config["notify_time"] = f"{hour:02d}:{minute:02d}"
+        self.config["notify_days_before"] = int(days_before)
+        self.schedule_event_reminders()
+        
+        window.destroy()
+        self.status_label.config(text=f"{len(self.reminders)} یادآور زمان‌بندی شد")
     
     def show_event_details(self, event):
         """نمایش جزئیات مناسبت"""
+        if event.get("id") in self.journal.events:
+            self.show_event_editor(event)
+            return
+        
         details = f"""
         مناسبت: {event.get('title', 'نامشخص')}
         تاریخ: {event.get('date', 'نامشخص')}
@@ -2192,6 +3182,119 @@ class MainWindow:
         
         messagebox.showinfo("جزئیات مناسبت", details)
     
+    def show_event_editor(self, event=None):
+        """پنجره افزودن یا ویرایش مناسبت کاربر"""
+        editor = tk.Toplevel(self.window)
+        editor.title("ویرایش مناسبت" if event else "افزودن مناسبت")
+        editor.geometry("400x330")
+        editor.configure(bg=self.theme_colors["bg"])
+        
+        if event:
+            calendar_type = event.get("calendar", self.current_calendar)
+            date_value = event["date"]
+        else:
+            calendar_type = self.current_calendar
+            from_gregorian = self._calendar_converters(calendar_type)[0]
+            y, m, d = from_gregorian(self.selected_date.year, self.selected_date.month, self.selected_date.day)
+            date_value = f"{y}/{m}/{d}"
+        
+        title_var = tk.StringVar(value=event["title"] if event else "")
+        date_var = tk.StringVar(value=date_value)
+        remind_var = tk.BooleanVar(value=bool(event and event.get("reminder")))
+        remind_time_var = tk.StringVar(value=(event or {}).get("reminder") or self.config.get("notify_time", "09:00"))
+        
+        fields = [
+            ("عنوان:", title_var, 25),
+            ("تاریخ (سال/ماه/روز):", date_var, 15),
+            ("ساعت یادآوری:", remind_time_var, 8),
+        ]
+        
+        for label, var, width in fields:
+            row = tk.Frame(editor, bg=self.theme_colors["bg"])
+            row.pack(fill="x", padx=20, pady=8)
+            tk.Label(
+                row,
+                text=label,
+                font=("Segoe UI", 11),
+                fg=self.theme_colors["text"],
+                bg=self.theme_colors["bg"]
+            ).pack(side="left")
+            tk.Entry(row, textvariable=var, width=width).pack(side="right")
+        
+        tk.Checkbutton(
+            editor,
+            text="یادآوری در روز مناسبت",
+            variable=remind_var,
+            font=("Segoe UI", 11),
+            fg=self.theme_colors["text"],
+            bg=self.theme_colors["bg"],
+            selectcolor=self.theme_colors["secondary"]
+        ).pack(anchor="w", padx=20, pady=5)
+        
+        buttons = tk.Frame(editor, bg=self.theme_colors["bg"])
+        buttons.pack(pady=15)
+        
+        ModernButton(
+            buttons,
+            text="ذخیره",
+            style="success",
+            command=lambda: self.save_user_event(
+                event["id"] if event else None, calendar_type, title_var.get(), date_var.get(),
+                remind_time_var.get() if remind_var.get() else None, editor
+            )
+        ).pack(side="left", padx=5)
+        
+        if event:
+            ModernButton(
+                buttons,
+                text="حذف",
+                style="danger",
+                command=lambda: self.delete_user_event(event["id"], editor)
+            ).pack(side="left", padx=5)
+    
+    def save_user_event(self, event_id, calendar_type, title, date_str, reminder, window):
+        """ذخیره مناسبت کاربر با یک سطر در دفترچه"""
+        title = title.strip()
+        try:
+            y, m, d = map(int, date_str.strip().split("/"))
+            date_str = f"{y}/{m}/{d}"
+            self.to_gregorian_date(calendar_type, date_str)
+            if reminder:
+                hour, minute = map(int, reminder.split(":"))
+                reminder = f"{hour:02d}:{minute:02d}"
+        except ValueError:
+            messagebox.showerror("خطا", "تاریخ یا ساعت وارد شده معتبر نیست.")
+            return
+        
+        if not title:
+            messagebox.showerror("خطا", "عنوان مناسبت را وارد کنید.")
+            return
+        
+        fields = {"title": title, "date": date_str, "reminder": reminder}
+        if event_id:
+            self.journal.update(event_id, **fields)
+        else:
+            event_id = self.journal.add(dict(fields, calendar=calendar_type, type="personal"))
+        
+        self.schedule_user_reminder(self.journal.events[event_id])
+        window.destroy()
+        self.load_events()
+    
+    def delete_user_event(self, event_id, window):
+        """حذف مناسبت کاربر"""
+        if not messagebox.askyesno("حذف", "این مناسبت حذف شود؟"):
+            return
+        
+        self.journal.delete(event_id)
+        self.reminders.cancel(f"user:{event_id}")
+        window.destroy()
+        self.load_events()
+    
+    def compact_journal(self):
+        """بررسی دوره‌ای و فشرده‌سازی دفترچه در پس‌زمینه"""
+        self.journal.compact_async()
+        self.window.after(JOURNAL_COMPACT_INTERVAL_MS, self.compact_journal)
+    
     def show_help(self):
         """نمایش راهنما"""
         help_text = """
@@ -2319,19 +3422,16 @@ class MainWindow:
     
     def save_data(self):
         """ذخیره داده‌ها"""
-        try:
-            with open("calendar_data.json", "w", encoding="utf-8") as f:
-                data = {
-                    "config": self.config,
-                    "events": self.events,
-                    "last_sync": datetime.now().isoformat()
-                }
-                json.dump(data, f, indent=4, ensure_ascii=False)
-            
-            self.status_label.config(text="داده‌ها با موفقیت ذخیره شد")
-            messagebox.showinfo("ذخیره", "داده‌های برنامه با موفقیت ذخیره شدند.")
-        except Exception as e:
-            messagebox.showerror("خطا", f"خطا در ذخیره داده‌ها: {e}")
+        # مناسبت‌های کاربر هنگام هر تغییر در دفترچه نوشته می‌شوند؛ فقط تنظیمات ذخیره می‌شود
+        self.config["last_sync"] = datetime.now().isoformat()
+        error = self.app.save_config()
+        if error:
+            self.status_label.config(text="خطا در ذخیره داده‌ها")
+            messagebox.showerror("خطا", f"خطا در ذخیره داده‌ها: {error}")
+            return
+        
+        self.status_label.config(text="داده‌ها با موفقیت ذخیره شد")
+        messagebox.showinfo("ذخیره", "داده‌های برنامه با موفقیت ذخیره شدند.")
     
     def print_calendar(self):
         """چاپ تقویم"""
@@ -2439,6 +3539,8 @@ class GlobalCalendarApp:
         self.developer = "Hessamedien"
         self.instagram_url = "https://instagram.com/hessamedien"
         self.config_file = "config.json"
+        self.cache_file = str(Path(self.config_file).with_name("events_cache.sqlite3"))
+        self.journal_file = str(Path(self.config_file).with_name("user_events.jsonl"))
         self.config = self.load_config()
         self.root = None
         self.loading_screen = None
@@ -2454,6 +3556,8 @@ class GlobalCalendarApp:
             "show_events": True,
             "show_sunrise_sunset": True,
             "notifications": True,
+            "notify_time": "09:00",
+            "notify_days_before": 0,
             "auto_update": True,
             "latitude": 35.6892,
             "longitude": 51.3890,
@@ -2475,12 +3579,14 @@ class GlobalCalendarApp:
         return default_config
     
     def save_config(self):
-        """ذخیره تنظیمات"""
+        """ذخیره تنظیمات؛ در صورت خطا پیام خطا و در غیر این صورت None برمی‌گرداند"""
         try:
             with open(self.config_file, 'w', encoding='utf-8') as f:
                 json.dump(self.config, f, indent=4, ensure_ascii=False)
-        except Exception as e:
+        except (OSError, TypeError, ValueError) as e:
             print(f"خطا در ذخیره تنظیمات: {e}")
+            return str(e)
+        return None
     
     def run_wizard(self):
         """اجرای ویزارد"""
@@ -2495,18 +3601,18 @@ class GlobalCalendarApp:
         self.loading_screen = LoadingScreen()
         self.loading_screen.show()
         
-        # شبیه‌سازی لودینگ
-        def simulate_loading():
-            for i in range(101):
-                if self.loading_screen:
-                    self.loading_screen.update_progress(i)
-                    time.sleep(0.03)
-            
-            if self.loading_screen:
+        # شبیه‌سازی لودینگ با after روی نخ رابط کاربری؛ Tkinter امن در برابر نخ نیست
+        window = self.loading_screen.window
+        
+        def step(value):
+            if value > 100:
                 self.loading_screen.close()
+                return
+            self.loading_screen.update_progress(value)
+            window.after(30, step, value + 1)
         
-        threading.Thread(target=simulate_loading, daemon=True).start()
-        time.sleep(3.5)  # نمایش حداقل 3.5 ثانیه
+        step(0)
+        window.wait_window()  # حلقه رویداد تا بسته شدن صفحه لودینگ (حدود ۳ ثانیه)
     
     def show_credits(self):
         """نمایش اطلاعات سازنده"""
@@ -2554,6 +3660,8 @@ class GlobalCalendarApp:
             if response is not None:
                 if response:  # بله، ذخیره و خروج
                     self.save_config()
+                self.main_window.calendar_api.close()
+                self.main_window.journal.close()
                 self.main_window.window.destroy()
                 sys.exit()
         else:
@@ -2608,8 +3716,43 @@ class GlobalCalendarApp:
 # تابع اصلی
 # ============================================================================
 
+def benchmark_holiday_parsing(paths, repeat=5):
+    """مقایسه زمان و حافظه تجزیه کامل صفحه با تجزیه هدفمند جدول مناسبت‌ها"""
+    files = []
+    for path in paths:
+        path = Path(path)
+        files.extend(sorted(path.glob("*.html")) if path.is_dir() else [path])
+    
+    def full_parse(content):
+        soup = BeautifulSoup(content.decode("utf-8", errors="replace"), 'html.parser')
+        return soup.find('table', {'id': 'holidays-table'})
+    
+    def targeted_parse(content):
+        return CalendarAPI.parse_holidays_table(content, "utf-8")
+    
+    for file_path in files:
+        content = file_path.read_bytes()
+        print(f"{file_path.name} ({len(content) // 1024} KB)")
+        
+        for name, parse in (("full", full_parse), ("targeted", targeted_parse)):
+            start = time.perf_counter()
+            for _ in range(repeat):
+                parse(content)
+            elapsed = (time.perf_counter() - start) / repeat * 1000
+            
+            tracemalloc.start()
+            parse(content)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            
+            print(f"  {name:<9} {elapsed:8.2f} ms  peak {peak / 1024:8.0f} KB")
+
 def main():
     """تابع اصلی"""
+    if len(sys.argv) > 1 and sys.argv[1] == "--benchmark-parse":
+        benchmark_holiday_parsing(sys.argv[2:])
+        return
+    
     app = GlobalCalendarApp()
     app.run()
 
@@ -16,9 +16,9 @@ import threading
 import webbrowser
 import datetime
 import calendar as py_calendar
-from datetime import datetime, timedelta, date
+from datetime import datetime, timedelta, date, timezone
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional, Set
+from typing import Dict, List, Tuple, Optional, Set, FrozenSet
 import tkinter as tk
 from tkinter import ttk, messagebox, font, filedialog, simpledialog, colorchooser
 from tkinter import PhotoImage
@@ -34,9 +34,24 @@ import winsound
 import socket
 from urllib.request import urlopen
 import urllib.error
-from dataclasses import dataclass
-from enum import Enum
+from dataclasses import dataclass, replace
+from enum import Enum, IntEnum
 import itertools
+from collections import OrderedDict
+import re
+import unicodedata
+import heapq
+import hashlib
+import mmap
+import weakref
+import queue
+import struct
+from bisect import bisect_left, insort
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 # ============================================================================
 # Enums and Data Classes
@@ -67,6 +82,118 @@ class ThemeMode(Enum):
     PURPLE = "purple"
     AUTO = "auto"
 
+class EventType(IntEnum):
+    """Compact event category code"""
+    NATIONAL = 0
+    RELIGIOUS = 1
+    INTERNATIONAL = 2
+    HOLIDAY = 3
+    OBSERVANCE = 4
+    
+    @property
+    def label(self) -> str:
+        return self.name.lower()
+    
+    @classmethod
+    def from_label(cls, label: str) -> "EventType":
+        return cls.__members__.get(str(label).upper(), cls.INTERNATIONAL)
+
+# Event categories that count as days off; observances (fasting months, eves)
+# are marked on the calendar but are ordinary working days
+HOLIDAY_TYPES = frozenset({EventType.NATIONAL, EventType.RELIGIOUS, EventType.HOLIDAY})
+
+# One shared int object per year, so thousands of events do not each hold a copy.
+# Bounded: years past the limit (only odd imported data gets there) are stored unshared.
+_SHARED_YEARS: Dict[int, int] = {}
+_SHARED_YEARS_MAX = 4096
+
+class Event:
+    """Immutable calendar event record
+    
+    Dates are stored as integers in the event's own calendar (the sortable
+    day ordinal is computed from them), the category as an EventType code
+    and the title as an interned string, so repeated holidays share their text.
+    """
+    
+    __slots__ = ("year", "month", "day", "span", "title", "kind", "calendar")
+    
+    def __init__(self, year: int, month: int, day: int, title: str,
+                 kind: EventType = EventType.NATIONAL,
+                 calendar: str = CalendarType.GREGORIAN.value, span: int = 1):
+        set_field = object.__setattr__
+        year = int(year)
+        if len(_SHARED_YEARS) < _SHARED_YEARS_MAX:
+            year = _SHARED_YEARS.setdefault(year, year)
+        else:
+            year = _SHARED_YEARS.get(year, year)
+        set_field(self, "year", year)
+        set_field(self, "month", int(month))
+        set_field(self, "day", int(day))
+        set_field(self, "span", max(1, int(span)))
+        set_field(self, "title", sys.intern(str(title)))
+        set_field(self, "kind", EventType(kind))
+        set_field(self, "calendar", sys.intern(str(calendar)))
+    
+    @staticmethod
+    def make_ordinal(year: int, month: int, day: int) -> int:
+        """Sortable day number within a single calendar"""
+        return (int(year) * 13 + int(month)) * 32 + int(day)
+    
+    @classmethod
+    def from_dict(cls, data: Dict, calendar: str) -> "Event":
+        """Build a record from a {"date": "Y/M/D[-D]", "title", "type"} dict"""
+        year, month, days = str(data["date"]).split("/")
+        first, _, last = days.partition("-")
+        span = int(last) - int(first) + 1 if last else 1
+        return cls(int(year), int(month), int(first), data.get("title", ""),
+                   EventType.from_label(data.get("type", "international")), calendar, span)
+    
+    def to_dict(self) -> Dict:
+        return {"date": self.date, "title": self.title, "type": self.type, "calendar": self.calendar}
+    
+    @property
+    def ordinal(self) -> int:
+        return self.make_ordinal(self.year, self.month, self.day)
+    
+    @property
+    def date(self) -> str:
+        if self.span > 1:
+            return f"{self.year}/{self.month}/{self.day}-{self.day + self.span - 1}"
+        return f"{self.year}/{self.month}/{self.day}"
+    
+    @property
+    def type(self) -> str:
+        return self.kind.label
+    
+    def occurs_on(self, year: int, month: int, day: int) -> bool:
+        """Check whether the event covers the given date in its own calendar"""
+        return (year == self.year and month == self.month and
+                self.day <= day < self.day + self.span)
+    
+    def _key(self) -> Tuple:
+        return (self.calendar, self.year, self.month, self.day, self.span, self.title, self.kind)
+    
+    def __eq__(self, other):
+        if not isinstance(other, Event):
+            return NotImplemented
+        return self._key() == other._key()
+    
+    def __hash__(self):
+        return hash(self._key())
+    
+    def __setattr__(self, name, value):
+        raise AttributeError("Event records are immutable")
+    
+    def __delattr__(self, name):
+        raise AttributeError("Event records are immutable")
+    
+    def __reduce__(self):
+        return (Event, (self.year, self.month, self.day, self.title,
+                        self.kind, self.calendar, self.span))
+    
+    def __repr__(self):
+        return f"Event({self.calendar} {self.date} {self.title!r} {self.type})"
+
 @dataclass
 class CalendarConfig:
     """Configuration for a single calendar"""
@@ -95,6 +222,41 @@ class DisplayConfig:
         if self.secondary_calendars is None:
             self.secondary_calendars = [CalendarType.PERSIAN, CalendarType.ISLAMIC]
 
+MONTH_NAMES = {
+    CalendarType.GREGORIAN: ["January", "February", "March", "April", "May", "June",
+                           "July", "August", "September", "October", "November", "December"],
+    CalendarType.PERSIAN: ["Farvardin", "Ordibehesht", "Khordad", "Tir", "Mordad", "Shahrivar",
+                         "Mehr", "Aban", "Azar", "Dey", "Bahman", "Esfand"],
+    CalendarType.ISLAMIC: ["Muharram", "Safar", "Rabi' al-Awwal", "Rabi' al-Thani", 
+                         "Jumada al-Awwal", "Jumada al-Thani", "Rajab", "Sha'ban",
+                         "Ramadan", "Shawwal", "Dhu al-Qi'dah", "Dhu al-Hijjah"]
+}
+
+@dataclass(frozen=True)
+class CellState:
+    """Visible state of one calendar grid cell"""
+    text: str
+    bg: str
+    fg: str
+    secondary: Tuple[str, ...]  # corner labels: top-left, top-right, bottom-left, bottom-right
+    ordinal: int = 0            # Gregorian day ordinal of the cell, 0 for empty cells
+
+@dataclass(frozen=True)
+class MonthModel:
+    """What the calendar grid shows for one month, independent of any widget"""
+    year: int
+    month: int
+    title: str
+    week_numbers: Tuple[str, ...]
+    cells: Tuple[CellState, ...]  # 42 cells, row by row, Sunday first
+
+@dataclass(frozen=True)
+class YearModel:
+    """Twelve month models plus per-day event counts for the year view"""
+    year: int
+    months: Tuple[MonthModel, ...]
+    density: Dict[int, Tuple[int, int]]  # Gregorian ordinal -> (events, holidays)
+
 # ============================================================================
 # Helper Classes
 # ============================================================================
@@ -183,7 +345,7 @@ class MultiCalendarConverter:
                 return jd.year, jd.month, jd.day
             
             elif cal_type == CalendarType.ISLAMIC:
-                hijri = hijri_converter.Hijri.fromgregorian(year, month, day)
+                hijri = hijri_converter.Gregorian(year, month, day).to_hijri()
                 return hijri.year, hijri.month, hijri.day
             
             elif cal_type == CalendarType.CHINESE:
@@ -255,47 +417,1526 @@ class MultiCalendarConverter:
             CalendarType.KOREAN: "Korean"
         }
 
-class CalendarEventManager:
-    """Manager for calendar events and holidays"""
+@dataclass(frozen=True)
+class HolidayRule:
+    """Base holiday rule: an identifier, the calendar it lives in and a title"""
+    rule_id: str
+    calendar: CalendarType
+    title: str
+
+@dataclass(frozen=True)
+class FixedDateRule(HolidayRule):
+    """Holiday on a fixed month/day of its calendar"""
+    month: int = 1
+    day: int = 1
+    kind: EventType = EventType.NATIONAL
+
+@dataclass(frozen=True)
+class NthWeekdayRule(HolidayRule):
+    """Holiday on the Nth weekday of a month (nth=-1 for the last one, Monday=0)"""
+    month: int = 1
+    weekday: int = 0
+    nth: int = 1
+    kind: EventType = EventType.NATIONAL
+
+@dataclass(frozen=True)
+class RelativeRule(HolidayRule):
+    """Holiday a number of days before or after another rule"""
+    base: str = ""
+    offset: int = 0
+    kind: EventType = EventType.NATIONAL
+
+@dataclass(frozen=True)
+class DateRangeRule(HolidayRule):
+    """Holiday spanning several days of one month (last_day=-1 for month end)"""
+    month: int = 1
+    first_day: int = 1
+    last_day: int = -1
+    kind: EventType = EventType.NATIONAL
+
+class HolidayRuleEngine:
+    """Compiles holiday rules once and expands them for any year on demand"""
+    
+    def __init__(self, rules: List[HolidayRule], converter: MultiCalendarConverter = None):
+        self.converter = converter or MultiCalendarConverter()
+        self.rules = list(rules)
+        self._fixed, self._dynamic = self._compile(self.rules)
+        self._memo: Dict[Tuple[str, int], Tuple[Event, ...]] = {}
+    
+    def _compile(self, rules: List[HolidayRule]):
+        """Split rules into constant per-year templates and date resolvers
+        
+        Dynamic entries also record the calendar of the rule a relative chain
+        starts from and how many days the chain can shift it, so expand() can
+        find occurrences pushed into the requested year from a neighbouring one.
+        """
+        by_id = {rule.rule_id: rule for rule in rules}
+        fixed: Dict[str, List[Tuple]] = {}
+        dynamic: Dict[str, List[Tuple]] = {}
+        resolvers = {}
+        origins: Dict[str, Tuple[CalendarType, int]] = {}  # rule id -> (source calendar, reach in days)
+        
+        def resolver_for(rule: HolidayRule, seen: Tuple[str, ...] = ()):
+            if rule.rule_id in resolvers:
+                return resolvers[rule.rule_id]
+            if rule.rule_id in seen:
+                raise ValueError(f"Circular holiday rule: {' -> '.join(seen + (rule.rule_id,))}")
+            
+            cal = rule.calendar
+            if isinstance(rule, FixedDateRule):
+                month, day = rule.month, rule.day
+                resolver = lambda year: (year, month, day, 1)
+            elif isinstance(rule, DateRangeRule):
+                resolver = lambda year: self._resolve_range(cal, year, rule)
+            elif isinstance(rule, NthWeekdayRule):
+                resolver = lambda year: self._resolve_nth_weekday(cal, year, rule)
+            elif isinstance(rule, RelativeRule):
+                if rule.base not in by_id:
+                    raise ValueError(f"Holiday rule {rule.rule_id!r} refers to unknown rule {rule.base!r}")
+                base_rule = by_id[rule.base]
+                base_resolver = resolver_for(base_rule, seen + (rule.rule_id,))
+                resolver = lambda year: self._shift(base_rule.calendar, base_resolver(year), rule.offset, cal)
+                source, reach = origins[base_rule.rule_id]
+                origins[rule.rule_id] = (source, reach + abs(rule.offset))
+            else:
+                raise TypeError(f"Unsupported holiday rule: {rule!r}")
+            
+            origins.setdefault(rule.rule_id, (cal, 0))
+            resolvers[rule.rule_id] = resolver
+            return resolver
+        
+        for rule in rules:
+            resolver = resolver_for(rule)
+            if isinstance(rule, FixedDateRule):
+                fixed.setdefault(rule.calendar.value, []).append(
+                    (rule.month, rule.day, rule.title, rule.kind)
+                )
+            else:
+                source, reach = origins[rule.rule_id]
+                dynamic.setdefault(rule.calendar.value, []).append(
+                    (resolver, rule.title, rule.kind, source, reach)
+                )
+        
+        return fixed, dynamic
+    
+    def expand(self, calendar: CalendarType, year: int) -> List[Event]:
+        """Expand all rules of a calendar for one year"""
+        key = (calendar.value, year)
+        events = self._memo.get(key)
+        
+        if events is None:
+            cal = calendar.value
+            result = [Event(year, month, day, title, kind, cal)
+                      for month, day, title, kind in self._fixed.get(cal, ())]
+            
+            for resolver, title, kind, source, reach in self._dynamic.get(cal, ()):
+                for source_year in self._source_years(calendar, year, source, reach):
+                    try:
+                        resolved = resolver(source_year)
+                    except (ValueError, KeyError, OverflowError):
+                        continue  # date outside what the calendar conversion supports
+                    # Relative rules can land in a neighbouring year; keep only this year's
+                    if resolved is not None and resolved[0] == year:
+                        r_year, r_month, r_day, span = resolved
+                        result.append(Event(r_year, r_month, r_day, title, kind, cal, span))
+            
+            result.sort(key=lambda e: e.ordinal)
+            events = self._memo[key] = tuple(result)
+        
+        return list(events)
+    
+    def expand_range(self, calendar: CalendarType, start_year: int, end_year: int) -> List[Event]:
+        """Expand all rules of a calendar for an inclusive range of years"""
+        events = []
+        for year in range(start_year, end_year + 1):
+            events.extend(self.expand(calendar, year))
+        return events
+    
+    def _source_years(self, calendar: CalendarType, year: int, source: CalendarType, reach: int):
+        """Years of the source calendar whose rules can resolve into year of calendar"""
+        if reach == 0 and source == calendar:
+            return (year,)
+        try:
+            first = self._to_ordinal(calendar, year, 1, 1) - reach
+            last = self._to_ordinal(calendar, year + 1, 1, 1) - 1 + reach
+            years = [
+                self.converter._from_gregorian(day.year, day.month, day.day, source)[0]
+                for day in (date.fromordinal(first), date.fromordinal(last))
+            ]
+        except (ValueError, KeyError, OverflowError):
+            return (year,)
+        return range(min(years), max(years) + 1)
+    
+    @staticmethod
+    def month_length(calendar: CalendarType, year: int, month: int) -> int:
+        """Number of days in a month of the given calendar"""
+        if calendar == CalendarType.PERSIAN:
+            if month == 12:
+                return 30 if jdatetime.date(year, 1, 1).isleap() else 29
+            return jdatetime.j_days_in_month[month - 1]
+        elif calendar == CalendarType.ISLAMIC:
+            return hijri_converter.Hijri(year, month, 1).month_length()
+        return py_calendar.monthrange(year, month)[1]
+    
+    def _to_ordinal(self, calendar: CalendarType, year: int, month: int, day: int) -> int:
+        return date(*self.converter._to_gregorian(year, month, day, calendar)).toordinal()
+    
+    def _resolve_range(self, calendar: CalendarType, year: int, rule: DateRangeRule):
+        last_day = rule.last_day
+        if last_day < 0:
+            last_day = self.month_length(calendar, year, rule.month) + last_day + 1
+        return year, rule.month, rule.first_day, last_day - rule.first_day + 1
+    
+    def _resolve_nth_weekday(self, calendar: CalendarType, year: int, rule: NthWeekdayRule):
+        first_weekday = date.fromordinal(self._to_ordinal(calendar, year, rule.month, 1)).weekday()
+        length = self.month_length(calendar, year, rule.month)
+        
+        if rule.nth > 0:
+            day = 1 + (rule.weekday - first_weekday) % 7 + (rule.nth - 1) * 7
+        else:
+            last_weekday = (first_weekday + length - 1) % 7
+            day = length - (last_weekday - rule.weekday) % 7 + (rule.nth + 1) * 7
+        
+        if 1 <= day <= length:
+            return year, rule.month, day, 1
+        return None
+    
+    def _shift(self, base_calendar: CalendarType, resolved, offset: int, calendar: CalendarType):
+        if resolved is None:
+            return None
+        year, month, day, span = resolved
+        ordinal = self._to_ordinal(base_calendar, year, month, day) + offset
+        target = date.fromordinal(ordinal)
+        year, month, day = self.converter._from_gregorian(target.year, target.month, target.day, calendar)
+        return year, month, day, 1
+
+# Built-in holiday definitions for every calendar
+DEFAULT_HOLIDAY_RULES: List[HolidayRule] = [
+    # Persian (Solar Hijri)
+    FixedDateRule("nowruz", CalendarType.PERSIAN, "Nowruz (Persian New Year)", 1, 1),
+    DateRangeRule("nowruz_holidays", CalendarType.PERSIAN, "Nowruz Holiday", 1, 2, 4),
+    FixedDateRule("republic_day", CalendarType.PERSIAN, "Islamic Republic Day", 1, 12),
+    RelativeRule("nature_day", CalendarType.PERSIAN, "Nature Day", "nowruz", 12),
+    FixedDateRule("khomeini_demise", CalendarType.PERSIAN, "Demise of Imam Khomeini", 3, 14, EventType.RELIGIOUS),
+    FixedDateRule("khordad_15", CalendarType.PERSIAN, "Khordad 15 Uprising", 3, 15),
+    FixedDateRule("revolution_day", CalendarType.PERSIAN, "Islamic Revolution Day", 11, 22),
+    
+    # Gregorian
+    FixedDateRule("new_year", CalendarType.GREGORIAN, "New Year's Day", 1, 1, EventType.INTERNATIONAL),
+    FixedDateRule("christmas", CalendarType.GREGORIAN, "Christmas Day", 12, 25, EventType.INTERNATIONAL),
+    FixedDateRule("new_years_eve", CalendarType.GREGORIAN, "New Year's Eve", 12, 31, EventType.OBSERVANCE),
+    
+    # Islamic (Lunar Hijri)
+    FixedDateRule("islamic_new_year", CalendarType.ISLAMIC, "Islamic New Year", 1, 1, EventType.RELIGIOUS),
+    FixedDateRule("ashura", CalendarType.ISLAMIC, "Day of Ashura", 1, 10, EventType.RELIGIOUS),
+    FixedDateRule("mawlid", CalendarType.ISLAMIC, "Prophet's Birthday", 3, 12, EventType.RELIGIOUS),
+    FixedDateRule("isra_miraj", CalendarType.ISLAMIC, "Isra and Mi'raj", 7, 27, EventType.RELIGIOUS),
+    DateRangeRule("ramadan", CalendarType.ISLAMIC, "Ramadan", 9, 1, -1, EventType.OBSERVANCE),
+    FixedDateRule("eid_al_fitr", CalendarType.ISLAMIC, "Eid al-Fitr", 10, 1, EventType.RELIGIOUS),
+    FixedDateRule("eid_al_adha", CalendarType.ISLAMIC, "Eid al-Adha", 12, 10, EventType.RELIGIOUS),
+    
+    # Chinese
+    FixedDateRule("chinese_new_year", CalendarType.CHINESE, "Chinese New Year", 1, 1),
+    FixedDateRule("lantern_festival", CalendarType.CHINESE, "Lantern Festival", 1, 15),
+    FixedDateRule("qingming", CalendarType.CHINESE, "Qingming Festival", 4, 5),
+    FixedDateRule("dragon_boat", CalendarType.CHINESE, "Dragon Boat Festival", 5, 5),
+    FixedDateRule("mid_autumn", CalendarType.CHINESE, "Mid-Autumn Festival", 8, 15),
+    
+    # Hindi
+    FixedDateRule("hindi_new_year", CalendarType.HINDI, "Hindi New Year", 1, 1),
+    FixedDateRule("makar_sankranti", CalendarType.HINDI, "Makar Sankranti", 1, 14, EventType.RELIGIOUS),
+    FixedDateRule("maha_shivaratri", CalendarType.HINDI, "Maha Shivaratri", 2, 24, EventType.RELIGIOUS),
+    FixedDateRule("holi", CalendarType.HINDI, "Holi", 3, 8, EventType.RELIGIOUS),
+    FixedDateRule("independence_day", CalendarType.HINDI, "Independence Day", 8, 15),
+    FixedDateRule("gandhi_jayanti", CalendarType.HINDI, "Gandhi Jayanti", 10, 2),
+    FixedDateRule("diwali", CalendarType.HINDI, "Diwali", 10, 24, EventType.RELIGIOUS),
+]
+
+def holiday_rules_digest(rules: List[HolidayRule]) -> bytes:
+    """Fingerprint of a rule set, stored in bundles expanded from it"""
+    return hashlib.sha256("\n".join(map(repr, rules)).encode("utf-8")).digest()[:16]
+
+def _parse_ymd(value: str) -> Tuple[int, int, int]:
+    year, month, day = value.split("/")
+    return int(year), int(month), int(day)
+
+@dataclass(frozen=True)
+class RecurrenceRule:
+    """A recurring event defined in its own calendar
+    
+    YEARLY repeats the start month/day, MONTHLY the start day of month (both in
+    any calendar) and WEEKLY the given weekdays (Gregorian only, Monday=0).
+    """
+    rule_id: str
+    calendar: CalendarType
+    title: str
+    freq: str
+    start: Tuple[int, int, int]
+    interval: int = 1
+    weekdays: Tuple[int, ...] = ()
+    until: Optional[Tuple[int, int, int]] = None
+    count: Optional[int] = None
+    kind: EventType = EventType.INTERNATIONAL
+    span: int = 1
+    source: str = "user"
+    
+    FREQUENCIES = ("YEARLY", "MONTHLY", "WEEKLY")
+    
+    def __post_init__(self):
+        if self.freq not in self.FREQUENCIES:
+            raise ValueError(f"Unsupported recurrence frequency: {self.freq}")
+        if self.freq == "WEEKLY" and self.calendar != CalendarType.GREGORIAN:
+            raise ValueError("Weekly recurrences are only supported in the Gregorian calendar")
+        if self.interval < 1:
+            raise ValueError("Recurrence interval must be positive")
+        year, month, day = self.start
+        try:
+            valid = 1 <= month <= 12 and 1 <= day <= HolidayRuleEngine.month_length(self.calendar, year, month)
+        except (IndexError, OverflowError):
+            valid = False
+        if not valid:
+            raise ValueError(f"Invalid start date in the {self.calendar.value} calendar: {year}/{month}/{day}")
+        if self.freq == "WEEKLY":
+            weekdays = self.weekdays or (date(*self.start).weekday(),)
+            object.__setattr__(self, "weekdays", tuple(sorted(set(weekdays))))
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> "RecurrenceRule":
+        return cls(
+            rule_id=data["id"],
+            calendar=CalendarType(data["calendar"]),
+            title=data["title"],
+            freq=data["freq"],
+            start=_parse_ymd(data["start"]),
+            interval=int(data.get("interval", 1)),
+            weekdays=tuple(data.get("weekdays", ())),
+            until=_parse_ymd(data["until"]) if data.get("until") else None,
+            count=data.get("count"),
+            kind=EventType.from_label(data.get("type", "international")),
+            span=int(data.get("span", 1)),
+            source=data.get("source", "user"),
+        )
+    
+    def to_dict(self) -> Dict:
+        return {
+            "id": self.rule_id,
+            "calendar": self.calendar.value,
+            "title": self.title,
+            "freq": self.freq,
+            "start": "/".join(map(str, self.start)),
+            "interval": self.interval,
+            "weekdays": list(self.weekdays),
+            "until": "/".join(map(str, self.until)) if self.until else None,
+            "count": self.count,
+            "type": self.kind.label,
+            "span": self.span,
+            "source": self.source,
+        }
+
+class RecurringEventStore:
+    """Recurring events kept as rules and expanded lazily one year at a time
+    
+    Expansions are memoized per (calendar, year) in a bounded LRU, so memory
+    follows the number of rules rather than the number of occurrences.
+    """
+    
+    MEMO_SIZE = 32
+    
+    def __init__(self, engine: HolidayRuleEngine):
+        self.engine = engine
+        self.rules: Dict[str, RecurrenceRule] = {}
+        self._memo: "OrderedDict[Tuple[str, int], Tuple[Event, ...]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return len(self.rules)
+    
+    def add(self, rule: RecurrenceRule):
+        """Add or replace a rule; raises ValueError when its dates cannot be expanded"""
+        try:
+            rule = self._normalize_count(rule)
+        except (IndexError, OverflowError) as e:
+            raise ValueError(f"Cannot expand recurring event {rule.title!r}: {e}") from e
+        with self._lock:
+            old = self.rules.get(rule.rule_id)
+            self.rules[rule.rule_id] = rule
+            self._invalidate(rule.calendar.value)
+            if old is not None:
+                self._invalidate(old.calendar.value)
+    
+    def remove(self, rule_id: str):
+        """Remove a rule"""
+        with self._lock:
+            rule = self.rules.pop(rule_id, None)
+            if rule is not None:
+                self._invalidate(rule.calendar.value)
+    
+    def _normalize_count(self, rule: RecurrenceRule) -> RecurrenceRule:
+        """Turn COUNT into UNTIL when some months lack the start day
+        
+        Skipped months (e.g. the 31st) do not use up the count, so the closed
+        form used by expand only holds when every month has the day.
+        """
+        if rule.count is None or rule.freq == "WEEKLY" or rule.start[2] <= 28:
+            return rule
+        
+        start_year, start_month, start_day = rule.start
+        months = 12 if rule.freq == "YEARLY" else 1
+        found = 0
+        step = 0
+        while found < rule.count:
+            year, month = divmod(start_month - 1 + step * rule.interval * months, 12)
+            year += start_year
+            occurrence = (year, month + 1, start_day)
+            if rule.until and occurrence > rule.until:
+                return rule
+            if start_day <= self.engine.month_length(rule.calendar, year, month + 1):
+                found += 1
+            step += 1
+        return replace(rule, until=occurrence, count=None)
+    
+    def _invalidate(self, calendar: str):
+        for key in [key for key in self._memo if key[0] == calendar]:
+            del self._memo[key]
+    
+    def load(self, data: List[Dict]):
+        """Load rules saved with to_config"""
+        for item in data:
+            try:
+                self.add(RecurrenceRule.from_dict(item))
+            except (KeyError, ValueError, TypeError) as e:
+                print(f"Skipping invalid recurring event {item!r}: {e}")
+    
+    def to_config(self) -> List[Dict]:
+        """User-created rules as JSON-serializable dicts"""
+        return [rule.to_dict() for rule in self.rules.values() if rule.source == "user"]
+    
+    def expand(self, calendar: CalendarType, year: int) -> List[Event]:
+        """Occurrences of all rules of a calendar in one year"""
+        key = (calendar.value, year)
+        with self._lock:
+            events = self._memo.get(key)
+            if events is not None:
+                self._memo.move_to_end(key)
+                return list(events)
+            rules = [rule for rule in self.rules.values() if rule.calendar == calendar]
+        
+        result = []
+        for rule in rules:
+            try:
+                occurrences = self._occurrences(rule, year)
+            except (ValueError, OverflowError, IndexError):
+                continue
+            for occ_year, occ_month, occ_day in occurrences:
+                result.append(Event(occ_year, occ_month, occ_day, rule.title, rule.kind,
+                                    calendar.value, rule.span))
+        result.sort(key=lambda e: e.ordinal)
+        
+        with self._lock:
+            self._memo[key] = tuple(result)
+            if len(self._memo) > self.MEMO_SIZE:
+                self._memo.popitem(last=False)
+        return result
+    
+    def expand_range(self, calendar: CalendarType, start_year: int, end_year: int) -> List[Event]:
+        """Occurrences for an inclusive range of years"""
+        events = []
+        for year in range(start_year, end_year + 1):
+            events.extend(self.expand(calendar, year))
+        return events
+    
+    def _occurrences(self, rule: RecurrenceRule, year: int) -> List[Tuple[int, int, int]]:
+        """Dates of one rule within a year, computed without walking earlier years"""
+        start_year, start_month, start_day = rule.start
+        if year < start_year:
+            return []
+        
+        if rule.freq == "WEEKLY":
+            return self._weekly_occurrences(rule, year)
+        
+        if rule.freq == "YEARLY":
+            candidates = [(year - start_year, start_month)]
+        else:
+            candidates = [((year - start_year) * 12 + month - start_month, month) for month in range(1, 13)]
+        
+        result = []
+        for steps, month in candidates:
+            if steps < 0 or steps % rule.interval:
+                continue
+            if rule.count is not None and steps // rule.interval >= rule.count:
+                break
+            occurrence = (year, month, start_day)
+            if rule.until and occurrence > rule.until:
+                break
+            if start_day <= self.engine.month_length(rule.calendar, year, month):
+                result.append(occurrence)
+        return result
+    
+    @staticmethod
+    def _weekly_occurrences(rule: RecurrenceRule, year: int) -> List[Tuple[int, int, int]]:
+        start = date(*rule.start)
+        first = max(date(year, 1, 1), start)
+        last = date(year, 12, 31)
+        if rule.until:
+            last = min(last, date(*rule.until))
+        if first > last:
+            return []
+        
+        origin = start - timedelta(days=start.weekday())   # Monday of the first week
+        weekdays = rule.weekdays
+        first_week_count = sum(1 for wd in weekdays if wd >= start.weekday())
+        
+        week = (first - origin).days // 7
+        week += -week % rule.interval
+        last_week = (last - origin).days // 7
+        
+        result = []
+        while week <= last_week:
+            period = week // rule.interval
+            for position, weekday in enumerate(weekdays):
+                day = origin + timedelta(days=week * 7 + weekday)
+                if day < first:
+                    continue
+                if day > last:
+                    return result
+                if rule.count is not None:
+                    if period == 0:
+                        index = position - (len(weekdays) - first_week_count)
+                    else:
+                        index = first_week_count + (period - 1) * len(weekdays) + position
+                    if index >= rule.count:
+                        return result
+                result.append((day.year, day.month, day.day))
+            week += rule.interval
+        return result
+
+HOLIDAY_BUNDLE_FILE = "global_calendar_holidays.gcix"
+
+_EVENT_TYPES = {kind.value: kind for kind in EventType}
+
+_CALENDAR_CODES = {cal.value: code for code, cal in enumerate(CalendarType)}
+_CALENDAR_BY_CODE = [cal.value for cal in CalendarType]
+
+class BaseEventIndex:
+    """Immutable holiday index in a read-only memory-mapped file
+    
+    Layout (little endian):
+      header    magic "GCIX", version, calendar count, record count,
+                records offset, strings offset, digest of the source rules
+      coverage  first/last year per calendar code (int16 pairs, -1/-2 = none)
+      records   fixed-size rows sorted by (calendar, year, month, day)
+      strings   UTF-8 titles, each stored once
+    
+    Every process opening the same file shares its pages, and records are only
+    decoded into Event objects for the years that are queried.
+    """
+    
+    MAGIC = b"GCIX"
+    VERSION = 3
+    HEADER = struct.Struct("<4sHHIII16s")
+    COVERAGE = struct.Struct("<hh")
+    RECORD = struct.Struct("<BBBBBxhIH")   # calendar, month, day, kind, span, year, title offset, length
+    RECORD_KEY = struct.Struct("<B5xh6x")  # calendar and year of a record
+    MEMO_SIZE = 64
+    
+    def __init__(self, path: str, rules_digest: Optional[bytes] = None):
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        (magic, version, calendars, self._count, self._records, self._strings,
+         self.rules_digest) = self.HEADER.unpack_from(self._map, 0)
+        if magic != self.MAGIC or version != self.VERSION:
+            self._map.close()
+            raise ValueError(f"Not a holiday index (version {self.VERSION}): {path}")
+        if rules_digest is not None and rules_digest != self.rules_digest:
+            self._map.close()
+            raise ValueError(f"Holiday index was built from different holiday rules: {path}")
+        
+        self._coverage = {}
+        for code in range(min(calendars, len(_CALENDAR_BY_CODE))):
+            first, last = self.COVERAGE.unpack_from(self._map, self.HEADER.size + code * self.COVERAGE.size)
+            if first <= last:
+                self._coverage[_CALENDAR_BY_CODE[code]] = (first, last)
+        
+        self._memo: "OrderedDict[Tuple[str, int], Tuple[Event, ...]]" = OrderedDict()
+        self._titles: Dict[int, str] = {}   # decoded string table entries by offset
+        self._directory: Optional[Dict[Tuple[int, int], Tuple[int, int]]] = None
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    @classmethod
+    def open(cls, path: Optional[str],
+             rules: Optional[List[HolidayRule]] = None) -> Optional["BaseEventIndex"]:
+        """Open an index file built from the given rules (the defaults when
+        omitted), None when it is missing or stale"""
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            return cls(path, holiday_rules_digest(DEFAULT_HOLIDAY_RULES if rules is None else rules))
+        except (OSError, ValueError) as e:
+            print(f"Error opening holiday index: {e}")
+            return None
+    
+    @classmethod
+    def build(cls, path: str, events, rules_digest: bytes = b"") -> int:
+        """Write events to an index file, returns the number of records"""
+        strings = bytearray()
+        offsets: Dict[str, int] = {}
+        rows = []
+        coverage: Dict[int, List[int]] = {}
+        
+        for event in events:
+            code = _CALENDAR_CODES[event.calendar]
+            # Cut to the 16-bit length field on a character boundary
+            title = event.title.encode("utf-8")[:0xFFFF].decode("utf-8", "ignore").encode("utf-8")
+            offset = offsets.get(event.title)
+            if offset is None:
+                offset = offsets[event.title] = len(strings)
+                strings += title
+            rows.append((code, event.year, event.month, event.day, int(event.kind), min(event.span, 255),
+                         offset, len(title)))
+            years = coverage.setdefault(code, [event.year, event.year])
+            years[0] = min(years[0], event.year)
+            years[1] = max(years[1], event.year)
+        
+        rows.sort()
+        calendars = len(_CALENDAR_BY_CODE)
+        records_offset = cls.HEADER.size + calendars * cls.COVERAGE.size
+        strings_offset = records_offset + len(rows) * cls.RECORD.size
+        
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(cls.HEADER.pack(cls.MAGIC, cls.VERSION, calendars, len(rows), records_offset, strings_offset,
+                                    rules_digest))
+            for code in range(calendars):
+                f.write(cls.COVERAGE.pack(*coverage.get(code, (-1, -2))))
+            for code, year, month, day, kind, span, offset, length in rows:
+                f.write(cls.RECORD.pack(code, month, day, kind, span, year, offset, length))
+            f.write(strings)
+        os.replace(tmp_path, path)
+        return len(rows)
+    
+    @classmethod
+    def build_from_rules(cls, path: str, engine: HolidayRuleEngine,
+                         ranges: Dict[CalendarType, Tuple[int, int]]) -> int:
+        """Expand holiday rules for per-calendar year ranges into an index file"""
+        return cls.build(path, itertools.chain.from_iterable(
+            engine.expand_range(cal, first, last) for cal, (first, last) in ranges.items()
+        ), holiday_rules_digest(engine.rules))
+    
+    def covers(self, calendar: str, year: int) -> bool:
+        """Whether the index was built with this calendar year"""
+        years = self._coverage.get(calendar)
+        return years is not None and years[0] <= year <= years[1]
+    
+    def _year_slices(self) -> Dict[Tuple[int, int], Tuple[int, int]]:
+        """Record range of every (calendar code, year), built by one pass on first use"""
+        if self._directory is None:
+            directory = {}
+            records = memoryview(self._map)[self._records:self._records + self._count * self.RECORD.size]
+            for index, key in enumerate(self.RECORD_KEY.iter_unpack(records)):
+                start, _ = directory.get(key, (index, index))
+                directory[key] = (start, index + 1)
+            records.release()
+            self._directory = directory
+        return self._directory
+    
+    def events_for(self, calendar: str, year: int) -> List[Event]:
+        """All records of one calendar year, decoded on first use"""
+        key = (calendar, year)
+        with self._lock:
+            events = self._memo.get(key)
+            if events is not None:
+                self._memo.move_to_end(key)
+                return list(events)
+        
+        start, end = self._year_slices().get((_CALENDAR_CODES[calendar], year), (0, 0))
+        size = self.RECORD.size
+        rows = self._map[self._records + start * size:self._records + end * size]
+        titles = self._titles
+        result = []
+        for _, month, day, kind, span, _, offset, length in self.RECORD.iter_unpack(rows):
+            title = titles.get(offset)
+            if title is None:
+                title = titles[offset] = self._map[self._strings + offset:self._strings + offset + length].decode("utf-8")
+            result.append(Event(year, month, day, title, _EVENT_TYPES[kind], calendar, span))
+        
+        with self._lock:
+            self._memo[key] = tuple(result)
+            if len(self._memo) > self.MEMO_SIZE:
+                self._memo.popitem(last=False)
+        return result
+    
+    def close(self):
+        self._map.close()
+
+class EventOverlay:
+    """Per-user changes on top of a shared base: added and hidden events"""
     
     def __init__(self):
+        self.added: Dict[Tuple[str, int], List[Event]] = {}
+        self.hidden: Set[Event] = set()
+    
+    def add(self, event: Event):
+        self.added.setdefault((event.calendar, event.year), []).append(event)
+    
+    def hide(self, event: Event):
+        """Hide a base (or any other) event for this user"""
+        self.hidden.add(event)
+    
+    def unhide(self, event: Event):
+        self.hidden.discard(event)
+    
+    def remove(self, event: Event):
+        """Remove an added event, or hide it when it comes from the base"""
+        events = self.added.get((event.calendar, event.year))
+        if events and event in events:
+            events.remove(event)
+        else:
+            self.hide(event)
+    
+    def added_for(self, calendar: str, year: int) -> List[Event]:
+        return self.added.get((calendar, year), [])
+    
+    def visible(self, events) -> List[Event]:
+        """Filter out hidden events"""
+        if not self.hidden:
+            return list(events)
+        return [event for event in events if event not in self.hidden]
+
+# Persian/Arabic letter variants folded to one form, digits folded to ASCII
+_SEARCH_FOLD = str.maketrans({
+    "ي": "ی", "ى": "ی", "ئ": "ی", "ك": "ک", "ة": "ه", "ۀ": "ه",
+    "\u06d5": "ه",   # NFKD splits ۀ into this letter and a hamza mark
+    "أ": "ا", "إ": "ا", "آ": "ا", "ٱ": "ا", "ؤ": "و",
+    "\u0640": None,   # tatweel
+    "\u200c": None,   # zero-width non-joiner
+    "\u200d": None,   # zero-width joiner
+    **{chr(0x06F0 + i): str(i) for i in range(10)},
+    **{chr(0x0660 + i): str(i) for i in range(10)},
+})
+_SEARCH_TOKEN = re.compile(r"\w+")
+# Latin and Arabic-script combining marks left over after NFKD decomposition
+_SEARCH_MARKS = re.compile(
+    "[\u0300-\u036f\u0610-\u061a\u064b-\u065f\u0670\u06d6-\u06dc\u06df-\u06e4\u06e7\u06e8\u06ea-\u06ed]"
+)
+
+@lru_cache(maxsize=8192)
+def normalize_search_text(text: str) -> str:
+    """Normalize text for searching: case, letter variants and diacritics"""
+    text = _SEARCH_MARKS.sub("", unicodedata.normalize("NFKD", text.casefold()))
+    return text.translate(_SEARCH_FOLD)
+
+def tokenize_search_text(text: str) -> List[str]:
+    """Split text into normalized search tokens"""
+    return _SEARCH_TOKEN.findall(normalize_search_text(text))
+
+class EventSearchIndex:
+    """In-memory inverted index over event titles with prefix matching
+    
+    With a ``key`` function (such as EventDeduplicator.key) events sharing a
+    key are indexed once; the others are kept as that entry's duplicates.
+    """
+    
+    def __init__(self, key=None):
+        self._key = key
+        self._events: List[Event] = []
+        self._ids: Dict[object, int] = {}
+        self._duplicates: Dict[int, List[Event]] = {}
+        self._titles: List[str] = []
+        self._postings: Dict[str, Set[int]] = {}
+        self._tokens: List[str] = []   # sorted vocabulary for prefix lookups
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return len(self._events)
+    
+    def add_events(self, events: List[Event]) -> int:
+        """Index events not seen before, returns the number added"""
+        added = 0
+        with self._lock:
+            for event in events:
+                key = self._key(event) if self._key else event
+                doc_id = self._ids.get(key)
+                if doc_id is not None:
+                    duplicates = self._duplicates.get(doc_id, ())
+                    if event != self._events[doc_id] and event not in duplicates:
+                        # Merged entries stay findable under every source title
+                        self._duplicates.setdefault(doc_id, []).append(event)
+                        self._add_tokens(doc_id, normalize_search_text(event.title))
+                    continue
+                
+                doc_id = len(self._events)
+                self._events.append(event)
+                self._ids[key] = doc_id
+                title = normalize_search_text(event.title)
+                self._titles.append(title)
+                self._add_tokens(doc_id, title)
+                added += 1
+        return added
+    
+    def _add_tokens(self, doc_id: int, title: str):
+        for token in set(_SEARCH_TOKEN.findall(title)):
+            posting = self._postings.get(token)
+            if posting is None:
+                posting = self._postings[token] = set()
+                insort(self._tokens, token)
+            posting.add(doc_id)
+    
+    def sources(self, event: Event) -> List[Event]:
+        """The indexed event and the duplicates merged into it"""
+        with self._lock:
+            doc_id = self._ids.get(self._key(event) if self._key else event)
+            if doc_id is None:
+                return [event]
+            return [self._events[doc_id]] + self._duplicates.get(doc_id, [])
+    
+    def _expand_prefix(self, prefix: str) -> List[str]:
+        """Vocabulary tokens starting with prefix"""
+        start = bisect_left(self._tokens, prefix)
+        matches = []
+        for token in itertools.islice(self._tokens, start, None):
+            if not token.startswith(prefix):
+                break
+            matches.append(token)
+        return matches
+    
+    def search(self, query: str, limit: int = 20, calendars: Optional[Set[str]] = None,
+               near: Optional[Dict[str, int]] = None) -> List[Event]:
+        """Find events whose titles contain every query term (as word prefixes)
+        
+        Equally ranked events are ordered by distance from the per-calendar
+        year in ``near`` when given, otherwise chronologically.
+        """
+        terms = tokenize_search_text(query)
+        if not terms:
+            return []
+        
+        with self._lock:
+            scores: Dict[int, int] = {}
+            for position, term in enumerate(terms):
+                matched: Dict[int, int] = {}
+                for token in self._expand_prefix(term):
+                    weight = 3 if token == term else 1
+                    for doc_id in self._postings[token]:
+                        if matched.get(doc_id, 0) < weight:
+                            matched[doc_id] = weight
+                
+                if position == 0:
+                    scores = matched
+                else:
+                    scores = {doc_id: score + matched[doc_id]
+                              for doc_id, score in scores.items() if doc_id in matched}
+                if not scores:
+                    return []
+            
+            phrase = normalize_search_text(query).strip()
+            ranked = []
+            for doc_id, score in scores.items():
+                event = self._events[doc_id]
+                if calendars and event.calendar not in calendars and not any(
+                        duplicate.calendar in calendars for duplicate in self._duplicates.get(doc_id, ())):
+                    continue
+                title = self._titles[doc_id]
+                if title.startswith(phrase):
+                    score += 2
+                year = near.get(event.calendar) if near else None
+                distance = abs(event.year - year) if year is not None else 0
+                # Higher score first, then shorter titles, then nearest dates
+                ranked.append((-score, len(title), distance, event.ordinal, doc_id))
+            
+            return [self._events[item[-1]] for item in heapq.nsmallest(limit, ranked)]
+
+# Known spellings of the same occasion, keyed by a canonical title
+TITLE_ALIASES: Dict[str, Tuple[str, ...]] = {
+    "nowruz": ("Nowruz", "Nowruz (Persian New Year)", "Norooz", "Persian New Year", "نوروز", "عید نوروز"),
+    "nature day": ("Nature Day", "Sizdah Bedar", "روز طبیعت", "سیزده بدر"),
+    "islamic republic day": ("Islamic Republic Day", "روز جمهوری اسلامی"),
+    "islamic revolution day": ("Islamic Revolution Day", "Anniversary of Islamic Revolution",
+                               "پیروزی انقلاب اسلامی"),
+    "ashura": ("Ashura", "Day of Ashura", "عاشورا", "عاشورای حسینی"),
+    "mawlid": ("Prophet's Birthday", "Mawlid", "Mawlid an-Nabi", "میلاد پیامبر اکرم"),
+    "eid al fitr": ("Eid al-Fitr", "Eid-e Fetr", "عید فطر", "عید سعید فطر"),
+    "eid al adha": ("Eid al-Adha", "Eid-e Ghorban", "Eid-e Qorban", "عید قربان", "عید سعید قربان"),
+    "new year": ("New Year's Day", "New Year", "سال نو میلادی"),
+    "christmas": ("Christmas", "Christmas Day", "کریسمس"),
+}
+
+def title_key(title: str) -> str:
+    """Normalized title used to recognize the same occasion across sources"""
+    return " ".join(tokenize_search_text(title))
+
+def _alias_keys(aliases: Dict[str, Tuple[str, ...]]) -> Dict[str, str]:
+    """Map normalized title variants to canonical titles"""
+    return {title_key(variant): canonical for canonical, variants in aliases.items() for variant in variants}
+
+# Compiled once and shared by every deduplicator using the default aliases
+_DEFAULT_ALIAS_KEYS = _alias_keys(TITLE_ALIASES)
+
+@dataclass(frozen=True)
+class MergedEvent:
+    """One occasion with every source event it was merged from
+    
+    ``sources`` pairs a source name (calendar, feed or file) with the original
+    event; ``event`` is the first of them and is used for display.
+    """
+    __slots__ = ("event", "gregorian_ordinal", "sources")
+    event: Event
+    gregorian_ordinal: int
+    sources: Tuple[Tuple[str, Event], ...]
+    
+    @property
+    def calendars(self) -> List[str]:
+        return list(dict.fromkeys(event.calendar for _, event in self.sources))
+    
+    @property
+    def source_names(self) -> List[str]:
+        return list(dict.fromkeys(name for name, _ in self.sources))
+    
+    @property
+    def is_holiday(self) -> bool:
+        return any(event.kind in HOLIDAY_TYPES for _, event in self.sources)
+
+class EventDeduplicator:
+    """Merge events that describe the same occasion on the same day
+    
+    The hash key is the start date projected to a Gregorian day ordinal plus
+    the canonical title (aliases resolved, case, letter variants and
+    punctuation folded), so "Eid al-Fitr" from the Islamic calendar and
+    "عید فطر" from a Persian feed collapse into one entry.
+    """
+    
+    ORDINAL_CACHE_SIZE = 4096
+    
+    def __init__(self, converter: Optional["MultiCalendarConverter"] = None,
+                 aliases: Optional[Dict[str, Tuple[str, ...]]] = None):
+        self.converter = converter or MultiCalendarConverter()
+        self._aliases = _DEFAULT_ALIAS_KEYS if aliases is None else _alias_keys(aliases)
+        self._ordinals: "OrderedDict[Tuple[str, int, int, int], Optional[int]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def gregorian_ordinal(self, event: Event) -> Optional[int]:
+        """Gregorian day ordinal of the event start, None when it cannot be converted"""
+        date_key = (event.calendar, event.year, event.month, event.day)
+        with self._lock:
+            if date_key in self._ordinals:
+                self._ordinals.move_to_end(date_key)
+                return self._ordinals[date_key]
+        
+        try:
+            year, month, day = self.converter.convert_date(
+                event.year, event.month, event.day, CalendarType(event.calendar), CalendarType.GREGORIAN
+            )
+            ordinal = date(year, month, day).toordinal()
+        except (ValueError, TypeError):
+            ordinal = None
+        
+        with self._lock:
+            self._ordinals[date_key] = ordinal
+            if len(self._ordinals) > self.ORDINAL_CACHE_SIZE:
+                self._ordinals.popitem(last=False)
+        return ordinal
+    
+    def canonical_title(self, title: str) -> str:
+        key = title_key(title)
+        return self._aliases.get(key, key)
+    
+    def key(self, event: Event) -> Tuple:
+        """Hash key shared by duplicates of an event"""
+        ordinal = self.gregorian_ordinal(event)
+        if ordinal is None:
+            return (event.calendar, event.ordinal, self.canonical_title(event.title))
+        return (ordinal, self.canonical_title(event.title))
+    
+    def unique(self, events, seen: Optional[Set[Tuple]] = None):
+        """Lazily yield the first event of every key"""
+        seen = set() if seen is None else seen
+        for event in events:
+            key = self.key(event)
+            if key not in seen:
+                seen.add(key)
+                yield event
+    
+    def merge(self, sources) -> List[MergedEvent]:
+        """Merge (source name, events) pairs, keeping first-seen order and provenance"""
+        groups: Dict[Tuple, List[Tuple[str, Event]]] = {}
+        for name, events in sources:
+            for event in events:
+                group = groups.setdefault(self.key(event), [])
+                if (name, event) not in group:
+                    group.append((name, event))
+        
+        return [
+            MergedEvent(group[0][1], self.gregorian_ordinal(group[0][1]) or 0, tuple(group))
+            for group in groups.values()
+        ]
+
+ICS_RECURRENCE_YEARS = 10   # Open-ended RRULEs are expanded this many years ahead
+ICS_MAX_OCCURRENCES = 5000  # Upper bound of occurrences generated per recurring VEVENT
+ICS_FOLD_OCTETS = 75
+
+_ICS_WEEKDAYS = {"MO": 0, "TU": 1, "WE": 2, "TH": 3, "FR": 4, "SA": 5, "SU": 6}
+
+def parse_rrule(value: str) -> Dict[str, str]:
+    """Parse an RRULE value such as FREQ=YEARLY;COUNT=5 into a dict"""
+    rule = {}
+    for part in value.split(";"):
+        if "=" in part:
+            key, _, val = part.partition("=")
+            rule[key.strip().upper()] = val.strip().upper()
+    return rule
+
+def _parse_ics_date(value: str) -> date:
+    """Date part of an ICS DATE or DATE-TIME value"""
+    return date(int(value[0:4]), int(value[4:6]), int(value[6:8]))
+
+class ICSReader:
+    """Streaming iCalendar reader yielding events one VEVENT at a time
+    
+    The file is read line by line, folded lines are joined as they arrive and
+    only the properties of the current VEVENT are held in memory. Recurring
+    VEVENTs are yielded as RecurrenceRule objects when the RRULE maps onto one
+    and expanded within a bounded window otherwise.
+    """
+    
+    def __init__(self, path: str, progress=None, progress_every: int = 500):
+        self.path = path
+        self.progress = progress
+        self.progress_every = progress_every
+        self.converter = MultiCalendarConverter()
+        self.skipped = 0
+    
+    def _unfolded_lines(self):
+        """Yield logical content lines with continuation lines joined"""
+        total = os.path.getsize(self.path)
+        done = 0
+        pending = None
+        
+        # Folds may split a multibyte character, so bytes are joined before decoding
+        with open(self.path, "rb") as f:
+            for raw in f:
+                done += len(raw)
+                line = raw.rstrip(b"\r\n")
+                if line[:1] in (b" ", b"\t") and pending is not None:
+                    pending += line[1:]
+                    continue
+                if pending is not None:
+                    yield pending.decode("utf-8", "replace"), done, total
+                pending = line
+        
+        if pending is not None:
+            yield pending.decode("utf-8", "replace"), total, total
+    
+    @staticmethod
+    def _split_property(line: str) -> Tuple[str, Dict[str, str], str]:
+        name_part, _, value = line.partition(":")
+        name, *params = name_part.split(";")
+        parameters = {}
+        for param in params:
+            key, _, val = param.partition("=")
+            parameters[key.upper()] = val
+        return name.upper(), parameters, value
+    
+    @staticmethod
+    def unescape(value: str) -> str:
+        return re.sub(r"\\([\\;,nN])",
+                      lambda m: "\n" if m.group(1) in "nN" else m.group(1), value)
+    
+    def __iter__(self):
+        current = None
+        count = 0
+        total = os.path.getsize(self.path)
+        
+        for line, done, _ in self._unfolded_lines():
+            if not line:
+                continue
+            name, params, value = self._split_property(line)
+            
+            if name == "BEGIN" and value.upper() == "VEVENT":
+                current = {}
+            elif name == "END" and value.upper() == "VEVENT":
+                if current is not None:
+                    try:
+                        yield from self._events_from(current)
+                    except (KeyError, ValueError) as e:
+                        self.skipped += 1
+                        print(f"Skipping invalid VEVENT: {e}")
+                current = None
+                count += 1
+                if self.progress and count % self.progress_every == 0:
+                    self.progress(done, total)
+            elif current is not None and name not in current:
+                current[name] = (params, value)
+        
+        if self.progress:
+            self.progress(total, total)
+    
+    def _events_from(self, props: Dict[str, Tuple[Dict[str, str], str]]):
+        """Events described by one VEVENT (several when it has an RRULE)"""
+        title = self.unescape(props.get("SUMMARY", ({}, ""))[1]).strip() or "(untitled)"
+        kind = EventType.from_label(props.get("CATEGORIES", ({}, "international"))[1].split(",")[0])
+        start = _parse_ics_date(props["DTSTART"][1])
+        
+        span = 1
+        if "DTEND" in props and len(props["DTEND"][1]) == 8:
+            # All-day DTEND is exclusive; multi-day spans are kept within the month
+            last_day = py_calendar.monthrange(start.year, start.month)[1]
+            span = max(1, min((_parse_ics_date(props["DTEND"][1]) - start).days, last_day - start.day + 1))
+        
+        # Events exported by this application keep their original calendar date
+        if "X-GLOBAL-CALENDAR" in props and "X-GLOBAL-DATE" in props and "RRULE" not in props:
+            calendar = CalendarType(props["X-GLOBAL-CALENDAR"][1].lower())
+            year, month, day = map(int, props["X-GLOBAL-DATE"][1].split("/"))
+            yield Event(year, month, day, title, kind, calendar.value, span)
+            return
+        
+        if "RRULE" in props:
+            rrule = parse_rrule(props["RRULE"][1])
+            uid = props.get("UID", ({}, ""))[1] or f"{start.isoformat()}|{title}"
+            recurrence = self._recurrence_rule(uid, title, kind, span, start, rrule)
+            if recurrence is not None:
+                yield recurrence
+                return
+            occurrences = self._recurrences(start, rrule)
+        else:
+            occurrences = (start,)
+        
+        for day in occurrences:
+            yield Event(day.year, day.month, day.day, title, kind, CalendarType.GREGORIAN.value, span)
+    
+    @staticmethod
+    def _recurrence_rule(uid: str, title: str, kind: EventType, span: int,
+                         start: date, rrule: Dict[str, str]) -> Optional[RecurrenceRule]:
+        """Stored rule equivalent to an RRULE, or None when it must be expanded"""
+        freq = rrule.get("FREQ", "YEARLY")
+        interval = int(rrule.get("INTERVAL", "1"))
+        weekdays = ()
+        
+        if freq == "DAILY":
+            # Every N*7 days is a weekly rule; every day is a weekly rule on all weekdays
+            if interval == 1:
+                freq, weekdays = "WEEKLY", tuple(range(7))
+            elif interval % 7 == 0:
+                freq, interval = "WEEKLY", interval // 7
+            else:
+                return None
+        
+        by_parts = [key for key in rrule if key.startswith("BY")]
+        if freq == "WEEKLY" and by_parts == ["BYDAY"]:
+            days = rrule["BYDAY"].split(",")
+            if any(day not in _ICS_WEEKDAYS for day in days):
+                return None
+            weekdays = tuple(_ICS_WEEKDAYS[day] for day in days)
+        elif by_parts:
+            return None
+        
+        until = _parse_ics_date(rrule["UNTIL"]) if "UNTIL" in rrule else None
+        try:
+            return RecurrenceRule(
+                rule_id=hashlib.sha1(uid.encode("utf-8")).hexdigest()[:16],
+                calendar=CalendarType.GREGORIAN,
+                title=title,
+                freq=freq,
+                start=(start.year, start.month, start.day),
+                interval=interval,
+                weekdays=weekdays,
+                until=(until.year, until.month, until.day) if until else None,
+                count=int(rrule["COUNT"]) if "COUNT" in rrule else None,
+                kind=kind,
+                span=span,
+                source="ics",
+            )
+        except ValueError:
+            return None
+    
+    @staticmethod
+    def _recurrences(start: date, rule: Dict[str, str]):
+        """Occurrence dates of a Gregorian RRULE, bounded in time and count"""
+        freq = rule.get("FREQ", "YEARLY")
+        interval = max(1, int(rule.get("INTERVAL", "1")))
+        count = min(int(rule.get("COUNT", ICS_MAX_OCCURRENCES)), ICS_MAX_OCCURRENCES)
+        until = date(datetime.now().year + ICS_RECURRENCE_YEARS, 12, 31)
+        if "UNTIL" in rule:
+            until = min(until, _parse_ics_date(rule["UNTIL"]))
+        
+        produced = 0
+        step = 0
+        while produced < count:
+            if freq == "DAILY":
+                candidates = [start + timedelta(days=step * interval)]
+            elif freq == "WEEKLY":
+                # Weeks start on Monday; days of the first week before DTSTART are skipped
+                week_start = start - timedelta(days=start.weekday()) + timedelta(weeks=step * interval)
+                weekdays = [_ICS_WEEKDAYS[d[-2:]] for d in rule.get("BYDAY", "").split(",") if d[-2:] in _ICS_WEEKDAYS]
+                candidates = sorted(
+                    day for day in (week_start + timedelta(days=wd) for wd in set(weekdays or [start.weekday()]))
+                    if day >= start
+                )
+            else:
+                months = step * interval * (12 if freq == "YEARLY" else 1)
+                year, month = divmod(start.month - 1 + months, 12)
+                year += start.year
+                # Months without the start day (e.g. the 31st) are skipped, as in RFC 5545
+                candidates = [date(year, month + 1, start.day)] if start.day <= py_calendar.monthrange(year, month + 1)[1] else []
+                if date(year, month + 1, 1) > until:
+                    return
+            
+            for day in candidates:
+                if day > until or produced >= count:
+                    return
+                produced += 1
+                yield day
+            step += 1
+
+class ICSWriter:
+    """Generator-based iCalendar writer; lines are produced as events arrive"""
+    
+    def __init__(self, converter: MultiCalendarConverter = None, product: str = "-//Hessamedien//Global Calendar//EN"):
+        self.converter = converter or MultiCalendarConverter()
+        self.product = product
+    
+    @staticmethod
+    def escape(value: str) -> str:
+        return (value.replace("\\", "\\\\").replace(";", "\\;")
+                .replace(",", "\\,").replace("\n", "\\n"))
+    
+    @staticmethod
+    def fold(line: str) -> str:
+        """Fold a content line at 75 octets without splitting UTF-8 sequences"""
+        data = line.encode("utf-8")
+        if len(data) <= ICS_FOLD_OCTETS:
+            return line + "\r\n"
+        
+        chunks = []
+        limit = ICS_FOLD_OCTETS
+        while data:
+            cut = min(limit, len(data))
+            while cut < len(data) and (data[cut] & 0xC0) == 0x80:
+                cut -= 1
+            chunks.append(data[:cut].decode("utf-8"))
+            data = data[cut:]
+            limit = ICS_FOLD_OCTETS - 1  # Continuation lines start with a space
+        return "\r\n ".join(chunks) + "\r\n"
+    
+    def lines(self, events):
+        """Yield folded ICS lines for an iterable of events"""
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        yield "BEGIN:VCALENDAR\r\n"
+        yield "VERSION:2.0\r\n"
+        yield self.fold(f"PRODID:{self.product}")
+        
+        for event in events:
+            try:
+                start = date(*self.converter._to_gregorian(
+                    event.year, event.month, event.day, CalendarType(event.calendar)
+                ))
+            except (ValueError, OverflowError):
+                continue
+            end = start + timedelta(days=event.span)
+            uid = hashlib.sha1(f"{event.calendar}|{event.date}|{event.title}".encode("utf-8")).hexdigest()[:16]
+            
+            yield "BEGIN:VEVENT\r\n"
+            yield f"UID:{uid}@global-calendar\r\n"
+            yield f"DTSTAMP:{stamp}\r\n"
+            yield f"DTSTART;VALUE=DATE:{start.strftime('%Y%m%d')}\r\n"
+            yield f"DTEND;VALUE=DATE:{end.strftime('%Y%m%d')}\r\n"
+            yield self.fold(f"SUMMARY:{self.escape(event.title)}")
+            yield f"CATEGORIES:{event.kind.label.upper()}\r\n"
+            yield f"X-GLOBAL-CALENDAR:{event.calendar}\r\n"
+            yield f"X-GLOBAL-DATE:{event.year}/{event.month}/{event.day}\r\n"
+            yield "END:VEVENT\r\n"
+        
+        yield "END:VCALENDAR\r\n"
+    
+    def write(self, path: str, events) -> int:
+        """Stream events into a file, returns the number of characters written"""
+        written = 0
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            for line in self.lines(events):
+                f.write(line)
+                written += len(line)
+        return written
+
+class CalendarEventManager:
+    """Manager for calendar events and holidays
+    
+    Holidays come from a shared, immutable BaseEventIndex when one is given
+    (otherwise from the events loaded through CalendarAPI); everything this
+    user adds or hides lives in a thin EventOverlay merged in at query time.
+    
+    Listeners added with add_listener are called with the Gregorian day
+    ordinals whose events changed (None when any day may have changed),
+    on whichever thread made the change.
+    """
+    
+    def __init__(self, base: Optional[BaseEventIndex] = None, api_client: Optional["CalendarAPI"] = None):
         self.events = {}
         self.holidays = {}
-        self.api_client = CalendarAPI()
+        self.api_client = api_client or CalendarAPI()
+        self.base = base
+        self.overlay = EventOverlay()
+        self.dedup = EventDeduplicator(self.api_client.rules.converter)
+        self.search_index = EventSearchIndex(key=self.dedup.key)
+        self.business_calendars = {}
+        self.recurring = RecurringEventStore(self.api_client.rules)
+        self.loaded_years = {}
+        self._listeners = []
+        self._density: Dict[Tuple, Dict[int, Tuple[int, int]]] = {}
+        self._density_version = 0
+        self._density_lock = threading.Lock()
     
-    def load_events(self, year: int, calendars: List[CalendarType]):
-        """Load events for multiple calendars"""
+    def add_listener(self, callback):
+        """Call callback(ordinals) whenever events of some days change"""
+        self._listeners.append(callback)
+    
+    def _changed(self, events: Optional[List[Event]]):
+        """Drop cached densities of the affected years and notify listeners"""
+        ordinals = None
+        if events is not None:
+            ordinals = frozenset(filter(None, map(self.dedup.gregorian_ordinal, events)))
+            if not ordinals:
+                return
+        
+        with self._density_lock:
+            self._density_version += 1
+            if ordinals is None:
+                self._density.clear()
+            else:
+                years = {date.fromordinal(ordinal).year for ordinal in ordinals}
+                for key in [key for key in self._density if key[1] in years]:
+                    del self._density[key]
+        
+        for callback in self._listeners:
+            callback(ordinals)
+    
+    def load_events(self, day: date, calendars: List[CalendarType]):
+        """Load the year containing a Gregorian day in each calendar, notifying
+        listeners after each one"""
+        converter = self.api_client.rules.converter
         for cal in calendars:
+            previous = self.events.get(cal.value, [])
             try:
+                year = converter.convert_date(day.year, day.month, day.day, CalendarType.GREGORIAN, cal)[0]
                 events = self.api_client.get_events(year, cal.value)
                 self.events[cal.value] = events
+                self.loaded_years[cal.value] = year
+                self.search_index.add_events(events)
                 
                 # Extract holidays
-                holidays = [e for e in events if e.get('type') in ['national', 'religious', 'holiday']]
+                holidays = [e for e in events if e.kind in HOLIDAY_TYPES]
                 self.holidays[cal.value] = holidays
             except Exception as e:
                 print(f"Error loading events for {cal.value}: {e}")
                 self.events[cal.value] = []
                 self.holidays[cal.value] = []
+                self.loaded_years.pop(cal.value, None)
+            self._changed(previous + self.events[cal.value])
     
-    def get_events_for_date(self, date_key: str, calendar_type: str) -> List[Dict]:
+    def index_years(self, calendar: CalendarType, start_year: int, end_year: int):
+        """Add generated holidays for a range of years to the search index"""
+        self.search_index.add_events(
+            self.api_client.rules.expand_range(calendar, start_year, end_year)
+        )
+        self.search_index.add_events(self.recurring.expand_range(calendar, start_year, end_year))
+    
+    def add_imported(self, events: List[Event]):
+        """Store imported events in the user overlay and index them"""
+        for event in events:
+            self.overlay.add(event)
+        self.search_index.add_events(events)
+        self._changed(events)
+    
+    def add_recurring(self, rule: RecurrenceRule):
+        """Store a recurring event; its occurrences may fall on any day"""
+        self.recurring.add(rule)
+        self._changed(None)
+    
+    def hide_event(self, event: Event):
+        """Hide an event for this user without touching the shared base"""
+        self.overlay.remove(event)
+        self._changed([event])
+    
+    def import_ics(self, path: str, progress=None, batch_size: int = 500) -> int:
+        """Import an iCalendar file incrementally, returns the number of events"""
+        reader = ICSReader(path, progress)
+        batch = []
+        imported = 0
+        
+        for event in reader:
+            if isinstance(event, RecurrenceRule):
+                self.add_recurring(event)
+                imported += 1
+                continue
+            batch.append(event)
+            if len(batch) >= batch_size:
+                self.add_imported(batch)
+                imported += len(batch)
+                batch = []
+        
+        if batch:
+            self.add_imported(batch)
+            imported += len(batch)
+        return imported
+    
+    def iter_events(self, calendars: List[CalendarType], start_year: int, end_year: int):
+        """Lazily yield holidays and imported events within a Gregorian year range"""
+        converter = self.api_client.rules.converter
+        for cal in calendars:
+            first = converter.convert_date(start_year, 1, 1, CalendarType.GREGORIAN, cal)[0]
+            last = converter.convert_date(end_year, 12, 31, CalendarType.GREGORIAN, cal)[0]
+            
+            for year in range(first, last + 1):
+                holidays = self._base_events(cal.value, year)
+                events = itertools.chain(
+                    self.overlay.visible(holidays),
+                    self.overlay.added_for(cal.value, year),
+                    self.overlay.visible(self.recurring.expand(cal, year))
+                )
+                for event in events:
+                    gregorian_year = converter._to_gregorian(event.year, event.month, event.day, cal)[0]
+                    if start_year <= gregorian_year <= end_year:
+                        yield event
+    
+    def merged_year(self, calendars: List[CalendarType], year: int) -> List[MergedEvent]:
+        """Events of a Gregorian year in every given calendar, duplicates merged"""
+        return self.dedup.merge(
+            (cal.value, list(self.iter_events([cal], year, year))) for cal in calendars
+        )
+    
+    def event_density(self, calendars: List[CalendarType], year: int) -> Dict[int, Tuple[int, int]]:
+        """(events, holidays) per Gregorian day ordinal of a year, duplicates counted once
+        
+        Cached until a change notification touches the year; a result computed
+        while such a change happened is returned but not cached.
+        """
+        key = (tuple(calendars), year)
+        density = self._density.get(key)
+        if density is not None:
+            return density
+        
+        version = self._density_version
+        density = {}
+        for merged in self.merged_year(calendars, year):
+            events, holidays = density.get(merged.gregorian_ordinal, (0, 0))
+            density[merged.gregorian_ordinal] = (events + 1, holidays + merged.is_holiday)
+        with self._density_lock:
+            if version == self._density_version:
+                self._density[key] = density
+        return density
+    
+    def export_ics(self, path: str, calendars: List[CalendarType], start_year: int, end_year: int) -> int:
+        """Write events of a Gregorian year range to an iCalendar file, duplicates merged"""
+        return ICSWriter(self.api_client.rules.converter).write(
+            path, self.dedup.unique(self.iter_events(calendars, start_year, end_year))
+        )
+    
+    def business_calendar(self, region: str = "IR") -> "BusinessDayCalculator":
+        """Business-day calculator for a region, sharing this manager's holiday source"""
+        calculator = self.business_calendars.get(region)
+        if calculator is None:
+            calculator = self.business_calendars[region] = BusinessDayCalculator(region, self.api_client)
+        return calculator
+    
+    def search_events(self, query: str, limit: int = 20, calendars: Optional[Set[str]] = None,
+                      near: Optional[Dict[str, int]] = None) -> List[Event]:
+        """Search indexed events by title"""
+        return self.search_index.search(query, limit, calendars, near)
+    
+    @staticmethod
+    def _parse_date_key(date_key: str) -> Tuple[int, int, int]:
+        year, month, day = date_key.split("/")
+        return int(year), int(month), int(day)
+    
+    def get_events_for_date(self, date_key: str, calendar_type: str) -> List[Event]:
         """Get events for a specific date"""
-        events = self.events.get(calendar_type, [])
-        return [e for e in events if e.get('date') == date_key]
+        year, month, day = self._parse_date_key(date_key)
+        events = itertools.chain(
+            self._base_events(calendar_type, year),
+            self.overlay.added_for(calendar_type, year),
+            self.recurring.expand(CalendarType(calendar_type), year)
+        )
+        return self.overlay.visible(e for e in events if e.occurs_on(year, month, day))
+    
+    def _base_events(self, calendar_type: str, year: int) -> List[Event]:
+        """Shared holidays of a year: the mapped base index when it covers the year,
+        then the events loaded through CalendarAPI, then the holiday rules"""
+        if self.base is not None and self.base.covers(calendar_type, year):
+            return self.base.events_for(calendar_type, year)
+        if self.loaded_years.get(calendar_type) == year:
+            return self.events.get(calendar_type, [])
+        return self.api_client.rules.expand(CalendarType(calendar_type), year)
+    
+    def get_merged_events(self, day: date, calendars: List[CalendarType]) -> List[MergedEvent]:
+        """Events of a Gregorian day in every given calendar, duplicates merged"""
+        converter = self.dedup.converter
+        sources = []
+        for cal in calendars:
+            year, month, dom = converter.convert_date(day.year, day.month, day.day, CalendarType.GREGORIAN, cal)
+            sources.append((cal.value, self.get_events_for_date(f"{year}/{month}/{dom}", cal.value)))
+        return self.dedup.merge(sources)
     
-    def get_holidays_for_date(self, date_key: str, calendar_type: str) -> List[Dict]:
+    def get_holidays_for_date(self, date_key: str, calendar_type: str) -> List[Event]:
         """Get holidays for a specific date"""
-        holidays = self.holidays.get(calendar_type, [])
-        return [h for h in holidays if h.get('date') == date_key]
+        year, month, day = self._parse_date_key(date_key)
+        if self.base is not None and self.base.covers(calendar_type, year):
+            holidays = [e for e in self.base.events_for(calendar_type, year) if e.kind in HOLIDAY_TYPES]
+        else:
+            holidays = self.holidays.get(calendar_type, [])
+        return self.overlay.visible(h for h in holidays if h.occurs_on(year, month, day))
+
+class AgendaSource:
+    """Upcoming events of several calendars over a Gregorian date span, one year per page
+    
+    Pages are produced on demand from CalendarEventManager.iter_events,
+    merged across calendars and sorted by date, so a decade-long agenda
+    only expands the years the user has actually scrolled to.
+    """
+    
+    def __init__(self, event_manager: CalendarEventManager, calendars: List[CalendarType],
+                 start: date, end: date):
+        self.event_manager = event_manager
+        self.calendars = calendars
+        self.start = start.toordinal()
+        self.end = end.toordinal()
+        self._next_year = start.year
+        self._last_year = end.year
+    
+    @property
+    def exhausted(self) -> bool:
+        return self._next_year > self._last_year
+    
+    def next_page(self) -> List[MergedEvent]:
+        """Merged events of the next Gregorian year in the span, in date order"""
+        if self.exhausted:
+            return []
+        year = self._next_year
+        self._next_year += 1
+        
+        page = [
+            merged for merged in self.event_manager.merged_year(self.calendars, year)
+            if self.start <= merged.gregorian_ordinal <= self.end
+        ]
+        page.sort(key=lambda merged: (merged.gregorian_ordinal, merged.event.title))
+        return page
 
 class CalendarAPI:
-    """API client for fetching calendar events"""
+    """API client for fetching calendar events
     
-    def __init__(self):
+    Default holidays are sliced from the prebuilt offline bundle (see
+    build_holiday_bundle) for the years it covers and expanded from the
+    holiday rules otherwise.
+    """
+    
+    def __init__(self, bundle: Optional[BaseEventIndex] = None):
         self.base_url = "https://www.timeanddate.com"
         self.cache = {}
+        self.rules = HolidayRuleEngine(DEFAULT_HOLIDAY_RULES)
+        self.bundle = bundle
     
-    def get_events(self, year: int, calendar_type: str) -> List[Dict]:
+    def get_events(self, year: int, calendar_type: str) -> List[Event]:
         """Get events for a specific year and calendar type"""
         cache_key = f"{calendar_type}_{year}"
         
@@ -303,15 +1944,42 @@ class CalendarAPI:
             return self.cache[cache_key]
         
         try:
-            events = self._fetch_events(year, calendar_type)
+            events = self._to_records(self._fetch_events(year, calendar_type), calendar_type)
             self.cache[cache_key] = events
             return events
         except Exception as e:
             print(f"Error fetching events: {e}")
-            return self._get_default_events(year, calendar_type)
+            return self._to_records(self._get_default_events(year, calendar_type), calendar_type)
+    
+    @staticmethod
+    def _to_records(events: List[Dict], calendar_type: str) -> List[Event]:
+        """Convert raw event dicts into immutable Event records"""
+        records = []
+        for event in events:
+            try:
+                records.append(event if isinstance(event, Event) else Event.from_dict(event, calendar_type))
+            except (KeyError, ValueError) as e:
+                print(f"Skipping malformed event {event!r}: {e}")
+        return records
     
     def _fetch_events(self, year: int, calendar_type: str) -> List[Dict]:
         """Fetch events from online sources"""
+        # Default events: sliced from the offline bundle, else expanded from rules
+        events = self._get_bundled_events(year, calendar_type)
+        if events is None:
+            events = self._get_rule_events(year, calendar_type)
+        
+        # Try to fetch additional events from online
+        try:
+            online_events = self._fetch_online_events(year, calendar_type)
+            events.extend(online_events)
+        except:
+            pass
+        
+        return events
+    
+    def _get_rule_events(self, year: int, calendar_type: str) -> List[Event]:
+        """Expand default events from the holiday rules"""
         events = []
         
         # Add default events based on calendar type
@@ -326,13 +1994,6 @@ class CalendarAPI:
         elif calendar_type == CalendarType.HINDI.value:
             events = self._get_hindi_events(year)
         
-        # Try to fetch additional events from online
-        try:
-            online_events = self._fetch_online_events(year, calendar_type)
-            events.extend(online_events)
-        except:
-            pass
-        
         return events
     
     def _fetch_online_events(self, year: int, calendar_type: str) -> List[Dict]:
@@ -343,77 +2004,204 @@ class CalendarAPI:
         # For now, return empty list
         return events
     
-    def _get_persian_events(self, year: int) -> List[Dict]:
+    def _get_persian_events(self, year: int) -> List[Event]:
         """Get Persian calendar events"""
-        events = [
-            {"date": f"{year}/1/1", "title": "Nowruz (Persian New Year)", "type": "national"},
-            {"date": f"{year}/1/2", "title": "Nowruz Holiday", "type": "national"},
-            {"date": f"{year}/1/3", "title": "Nowruz Holiday", "type": "national"},
-            {"date": f"{year}/1/4", "title": "Nowruz Holiday", "type": "national"},
-            {"date": f"{year}/1/12", "title": "Islamic Republic Day", "type": "national"},
-            {"date": f"{year}/1/13", "title": "Nature Day", "type": "national"},
-            {"date": f"{year}/3/14", "title": "Demise of Imam Khomeini", "type": "religious"},
-            {"date": f"{year}/3/15", "title": "Khordad 15 Uprising", "type": "national"},
-            {"date": f"{year}/11/22", "title": "Islamic Revolution Day", "type": "national"},
-        ]
-        return events
+        return self.rules.expand(CalendarType.PERSIAN, year)
     
-    def _get_gregorian_events(self, year: int) -> List[Dict]:
+    def _get_gregorian_events(self, year: int) -> List[Event]:
         """Get Gregorian calendar events"""
-        events = [
-            {"date": f"{year}/1/1", "title": "New Year's Day", "type": "international"},
-            {"date": f"{year}/12/25", "title": "Christmas Day", "type": "international"},
-            {"date": f"{year}/12/31", "title": "New Year's Eve", "type": "international"},
-        ]
-        return events
+        return self.rules.expand(CalendarType.GREGORIAN, year)
     
-    def _get_islamic_events(self, year: int) -> List[Dict]:
+    def _get_islamic_events(self, year: int) -> List[Event]:
         """Get Islamic calendar events"""
-        events = [
-            {"date": f"{year}/1/1", "title": "Islamic New Year", "type": "religious"},
-            {"date": f"{year}/1/10", "title": "Day of Ashura", "type": "religious"},
-            {"date": f"{year}/3/12", "title": "Prophet's Birthday", "type": "religious"},
-            {"date": f"{year}/7/27", "title": "Isra and Mi'raj", "type": "religious"},
-            {"date": f"{year}/9/1-30", "title": "Ramadan", "type": "religious"},
-            {"date": f"{year}/10/1", "title": "Eid al-Fitr", "type": "religious"},
-            {"date": f"{year}/12/10", "title": "Eid al-Adha", "type": "religious"},
-        ]
-        return events
+        return self.rules.expand(CalendarType.ISLAMIC, year)
     
-    def _get_chinese_events(self, year: int) -> List[Dict]:
+    def _get_chinese_events(self, year: int) -> List[Event]:
         """Get Chinese calendar events"""
-        events = [
-            {"date": f"{year}/1/1", "title": "Chinese New Year", "type": "national"},
-            {"date": f"{year}/1/15", "title": "Lantern Festival", "type": "national"},
-            {"date": f"{year}/4/5", "title": "Qingming Festival", "type": "national"},
-            {"date": f"{year}/5/5", "title": "Dragon Boat Festival", "type": "national"},
-            {"date": f"{year}/8/15", "title": "Mid-Autumn Festival", "type": "national"},
-        ]
-        return events
+        return self.rules.expand(CalendarType.CHINESE, year)
     
-    def _get_hindi_events(self, year: int) -> List[Dict]:
+    def _get_hindi_events(self, year: int) -> List[Event]:
         """Get Hindi calendar events"""
-        events = [
-            {"date": f"{year}/1/1", "title": "Hindi New Year", "type": "national"},
-            {"date": f"{year}/1/14", "title": "Makar Sankranti", "type": "religious"},
-            {"date": f"{year}/2/24", "title": "Maha Shivaratri", "type": "religious"},
-            {"date": f"{year}/3/8", "title": "Holi", "type": "religious"},
-            {"date": f"{year}/8/15", "title": "Independence Day", "type": "national"},
-            {"date": f"{year}/10/2", "title": "Gandhi Jayanti", "type": "national"},
-            {"date": f"{year}/10/24", "title": "Diwali", "type": "religious"},
-        ]
-        return events
+        return self.rules.expand(CalendarType.HINDI, year)
     
-    def _get_default_events(self, year: int, calendar_type: str) -> List[Dict]:
+    def _get_bundled_events(self, year: int, calendar_type: str) -> Optional[List[Event]]:
+        """Events of a year from the offline bundle, None when it does not cover the year"""
+        if self.bundle is not None and self.bundle.covers(calendar_type, year):
+            return self.bundle.events_for(calendar_type, year)
+        return None
+    
+    def _get_default_events(self, year: int, calendar_type: str) -> List[Event]:
         """Get default events when API fails"""
-        if calendar_type == CalendarType.PERSIAN.value:
-            return self._get_persian_events(year)
-        elif calendar_type == CalendarType.GREGORIAN.value:
-            return self._get_gregorian_events(year)
-        elif calendar_type == CalendarType.ISLAMIC.value:
-            return self._get_islamic_events(year)
+        events = self._get_bundled_events(year, calendar_type)
+        if events is None:
+            events = self._get_rule_events(year, calendar_type)
+        return events
+
+@dataclass(frozen=True)
+class BusinessRegion:
+    """Weekend days (Monday=0) and holiday sources of a business region"""
+    name: str
+    weekend: FrozenSet[int]
+    calendars: Tuple[CalendarType, ...]
+    kinds: FrozenSet[EventType] = HOLIDAY_TYPES
+
+BUSINESS_REGIONS: Dict[str, BusinessRegion] = {
+    "IR": BusinessRegion("Iran", frozenset({4}), (CalendarType.PERSIAN, CalendarType.ISLAMIC)),
+    "INTL": BusinessRegion("International", frozenset({5, 6}), (CalendarType.GREGORIAN,),
+                           HOLIDAY_TYPES | {EventType.INTERNATIONAL}),
+}
+
+if hasattr(int, "bit_count"):
+    _popcount = int.bit_count
+else:
+    def _popcount(value: int) -> int:
+        return bin(value).count("1")
+
+class BusinessDayCalculator:
+    """Business-day arithmetic on per-year bitsets of non-working days
+    
+    Bit i of a year's mask is day i of the Gregorian year (January 1 = bit 0).
+    Counting uses popcount over the working-day bits; adding days bisects a
+    per-year cumulative count, built with NumPy when available.
+    """
+    
+    def __init__(self, region: str = "IR", api_client: "CalendarAPI" = None,
+                 converter: MultiCalendarConverter = None):
+        if region not in BUSINESS_REGIONS:
+            raise ValueError(f"Unknown business region: {region}")
+        self.region = BUSINESS_REGIONS[region]
+        self.api_client = api_client or CalendarAPI()
+        self.converter = converter or MultiCalendarConverter()
+        self._masks: Dict[int, int] = {}
+        self._working: Dict[int, int] = {}
+        self._cumulative: Dict[int, List[int]] = {}
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _year_length(year: int) -> int:
+        return 366 if py_calendar.isleap(year) else 365
+    
+    def year_mask(self, year: int) -> int:
+        """Bitset of non-working days (weekends and holidays) in a year"""
+        mask = self._masks.get(year)
+        if mask is None:
+            with self._lock:
+                mask = self._masks.get(year)
+                if mask is None:
+                    mask = self._build_mask(year)
+                    self._working[year] = ((1 << self._year_length(year)) - 1) ^ mask
+                    self._masks[year] = mask
+        return mask
+    
+    def _build_mask(self, year: int) -> int:
+        length = self._year_length(year)
+        first_weekday = date(year, 1, 1).weekday()
+        
+        mask = 0
+        for weekday in self.region.weekend:
+            for index in range((weekday - first_weekday) % 7, length, 7):
+                mask |= 1 << index
+        
+        for index in self._holiday_indexes(year):
+            mask |= 1 << index
+        return mask
+    
+    def _holiday_indexes(self, year: int) -> Set[int]:
+        """Day indexes of the region's holidays falling in a Gregorian year"""
+        start = date(year, 1, 1).toordinal()
+        length = self._year_length(year)
+        indexes = set()
+        
+        for cal in self.region.calendars:
+            first = self.converter.convert_date(year, 1, 1, CalendarType.GREGORIAN, cal)[0]
+            last = self.converter.convert_date(year, 12, 31, CalendarType.GREGORIAN, cal)[0]
+            
+            for cal_year in range(first, last + 1):
+                for event in self.api_client.get_events(cal_year, cal.value):
+                    if event.kind not in self.region.kinds:
+                        continue
+                    try:
+                        gregorian = self.converter._to_gregorian(event.year, event.month, event.day, cal)
+                    except (ValueError, KeyError, OverflowError):
+                        continue
+                    # A span is consecutive days in any calendar
+                    day_index = date(*gregorian).toordinal() - start
+                    for index in range(day_index, day_index + event.span):
+                        if 0 <= index < length:
+                            indexes.add(index)
+        return indexes
+    
+    def _working_bits(self, year: int) -> int:
+        self.year_mask(year)
+        return self._working[year]
+    
+    def _cumulative_counts(self, year: int):
+        """Running count of working days up to and including each day of a year"""
+        counts = self._cumulative.get(year)
+        if counts is None:
+            working = self._working_bits(year)
+            length = self._year_length(year)
+            if np is not None:
+                bits = np.frombuffer(working.to_bytes((length + 7) // 8, "little"), dtype=np.uint8)
+                counts = np.cumsum(np.unpackbits(bits, bitorder="little")[:length]).tolist()
+            else:
+                counts = list(itertools.accumulate((working >> index) & 1 for index in range(length)))
+            self._cumulative[year] = counts
+        return counts
+    
+    def invalidate(self, year: Optional[int] = None):
+        """Drop cached bitsets, e.g. after holidays were updated"""
+        with self._lock:
+            for cache in (self._masks, self._working, self._cumulative):
+                if year is None:
+                    cache.clear()
+                else:
+                    cache.pop(year, None)
+    
+    def is_business_day(self, day: date) -> bool:
+        """Whether a date is neither a weekend day nor a holiday"""
+        index = day.toordinal() - date(day.year, 1, 1).toordinal()
+        return not (self.year_mask(day.year) >> index) & 1
+    
+    def business_days_between(self, start: date, end: date) -> int:
+        """Number of business days in [start, end), negative if end precedes start"""
+        if end < start:
+            return -self.business_days_between(end, start)
+        
+        count = 0
+        for year in range(start.year, end.year + 1):
+            low = start.toordinal() - date(year, 1, 1).toordinal() if year == start.year else 0
+            high = (end.toordinal() - date(year, 1, 1).toordinal() if year == end.year
+                    else self._year_length(year))
+            if high > low:
+                count += _popcount((self._working_bits(year) >> low) & ((1 << (high - low)) - 1))
+        return count
+    
+    def add_business_days(self, start: date, days: int) -> date:
+        """Date that is the given number of business days after (or before) start"""
+        if days == 0:
+            return start
+        
+        year = start.year
+        index = start.toordinal() - date(year, 1, 1).toordinal()
+        counts = self._cumulative_counts(year)
+        
+        if days > 0:
+            target = counts[index] + days
+            while target > counts[-1]:
+                target -= counts[-1]
+                year += 1
+                counts = self._cumulative_counts(year)
         else:
-            return []
+            # Working days strictly before start, then walk back whole years
+            before = counts[index - 1] if index > 0 else 0
+            target = before + days + 1
+            while target < 1:
+                year -= 1
+                counts = self._cumulative_counts(year)
+                target += counts[-1]
+        
+        return date.fromordinal(date(year, 1, 1).toordinal() + bisect_left(counts, target))
 
 # ============================================================================
 # UI Components
@@ -1467,6 +3255,724 @@ class LoadingScreen:
         if self.window:
             self.window.destroy()
 
+class UIDispatcher:
+    """Run callbacks posted from worker threads on the Tk main thread
+    
+    Workers call post() (or use a wrap()ped function), which only touches a
+    thread-safe queue. The main thread drains the queue every tick, running
+    callbacks until the per-tick time budget is used up; whatever is left
+    waits for the next tick, so bursts of background work cannot freeze
+    the UI. Ticks come faster while work is queued and slow down when idle.
+    """
+    
+    TICK_MS = 16
+    IDLE_TICK_MS = 50
+    BUDGET_MS = 8
+    
+    def __init__(self, widget: tk.Misc, budget_ms: float = BUDGET_MS):
+        self.widget = widget
+        self.budget = budget_ms / 1000
+        self._queue: "queue.Queue[Tuple]" = queue.Queue()
+        self._tick_id = None
+        self.start()
+    
+    def post(self, callback, *args, **kwargs):
+        """Queue a callback for the main thread; safe from any thread"""
+        self._queue.put((callback, args, kwargs))
+    
+    def wrap(self, callback):
+        """A function that posts callback with its arguments instead of running it"""
+        return lambda *args, **kwargs: self.post(callback, *args, **kwargs)
+    
+    def start(self):
+        if self._tick_id is None:
+            self._tick_id = self.widget.after(self.TICK_MS, self._tick)
+    
+    def stop(self):
+        if self._tick_id is not None:
+            self.widget.after_cancel(self._tick_id)
+            self._tick_id = None
+    
+    def pending(self) -> int:
+        return self._queue.qsize()
+    
+    def drain(self, budget: Optional[float] = None) -> int:
+        """Run queued callbacks until the queue is empty or the budget is spent"""
+        deadline = time.perf_counter() + (self.budget if budget is None else budget)
+        ran = 0
+        while True:
+            try:
+                callback, args, kwargs = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                callback(*args, **kwargs)
+            except Exception as e:
+                print(f"Error in UI callback {getattr(callback, '__name__', callback)}: {e}")
+            ran += 1
+            if time.perf_counter() >= deadline:
+                break
+        return ran
+    
+    def _tick(self):
+        self.drain()
+        delay = self.TICK_MS if not self._queue.empty() else self.IDLE_TICK_MS
+        try:
+            self._tick_id = self.widget.after(delay, self._tick)
+        except tk.TclError:
+            self._tick_id = None  # window destroyed
+
+class MonthModelWorker:
+    """Build month (or year) models on a worker thread and hand them to the main thread
+    
+    request() queues a build; the worker skips requests that were already
+    superseded and posts finished models through the UIDispatcher. Only the
+    model of the newest request is applied, so months the user has
+    navigated away from are dropped.
+    """
+    
+    def __init__(self, dispatcher: UIDispatcher, build, apply):
+        self.dispatcher = dispatcher
+        self.build = build
+        self.apply = apply
+        self._requests: "queue.Queue[Tuple[int, Tuple]]" = queue.Queue()
+        self._generation = 0
+        self.dropped = 0
+        threading.Thread(target=self._work, daemon=True).start()
+    
+    def request(self, *args):
+        """Ask for a model; any earlier pending request becomes stale"""
+        self._generation += 1
+        self._requests.put((self._generation, args))
+    
+    def _work(self):
+        while True:
+            generation, args = self._requests.get()
+            if generation != self._generation:
+                continue  # superseded while queued
+            try:
+                model = self.build(*args)
+            except Exception as e:
+                print(f"Error building month model: {e}")
+                continue
+            self.dispatcher.post(self._deliver, generation, model)
+    
+    def _deliver(self, generation: int, model):
+        """Main thread: apply the model unless a newer one was requested"""
+        if generation == self._generation:
+            self.apply(model)
+        else:
+            self.dropped += 1
+
+class MonthModelCache:
+    """Bounded LRU of built month models, shared by the month and year views
+    
+    Models are keyed by the app's render signature (calendars, display
+    options, colors, today) plus year and month, so a settings change simply
+    misses instead of needing explicit invalidation. Safe to use from the
+    month worker and the main thread at once.
+    """
+    
+    SIZE = 36
+    
+    def __init__(self, build, signature, size: int = SIZE):
+        self.build = build
+        self.signature = signature
+        self.size = size
+        self._models: "OrderedDict[Tuple, MonthModel]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, year: int, month: int) -> MonthModel:
+        key = (self.signature(), year, month)
+        with self._lock:
+            model = self._models.get(key)
+            if model is not None:
+                self._models.move_to_end(key)
+                self.hits += 1
+                return model
+        
+        model = self.build(year, month)
+        with self._lock:
+            self._models[key] = model
+            while len(self._models) > self.size:
+                self._models.popitem(last=False)
+            self.misses += 1
+        return model
+    
+    def clear(self):
+        with self._lock:
+            self._models.clear()
+
+class EventRowPool:
+    """Reusable event rows on a scrolling canvas; only visible rows are bound
+    
+    Rows are created by make_row(parent) and placed as canvas windows at
+    fixed row heights, so the scroll region is computed from the item count
+    instead of laid-out widgets. Only as many rows exist as fit in the
+    viewport; scrolling rebinds the rows that moved out of view to the
+    items that moved in (row.item holds the bound item). Showing another
+    day's events reconfigures existing rows and creates no widgets unless
+    the viewport grew. Lists loaded in pages pass on_near_end, called when
+    the view comes within a screen of the last item, and append with extend().
+    """
+    
+    ROW_HEIGHT = 40
+    
+    def __init__(self, canvas: tk.Canvas, scrollbar: tk.Scrollbar, make_row, bind_row,
+                 row_height: int = ROW_HEIGHT, on_near_end=None):
+        self.canvas = canvas
+        self.scrollbar = scrollbar
+        self.make_row = make_row
+        self.bind_row = bind_row
+        self.row_height = row_height
+        self.on_near_end = on_near_end
+        self.items: List = []
+        self._rows: List[tk.Widget] = []
+        self._windows: List[int] = []
+        self._bound: List[Optional[int]] = []  # item index bound to each row
+        self._first = None
+        self.created = 0
+        self.binds = 0
+        
+        self._empty = canvas.create_text(8, 10, anchor="nw", text="", state="hidden")
+        canvas.configure(yscrollcommand=self._on_yview, yscrollincrement=row_height)
+        scrollbar.configure(command=canvas.yview)
+        canvas.bind("<Configure>", self._on_resize, add="+")
+    
+    def set_items(self, items: List, empty_text: str = "", empty_color: str = "black"):
+        """Show a new list from the top, rebinding every visible row"""
+        self.items = items
+        self._bound = [None] * len(self._rows)
+        self._first = None
+        self.canvas.itemconfigure(
+            self._empty, text=empty_text, fill=empty_color,
+            state="hidden" if items else "normal"
+        )
+        self.canvas.configure(scrollregion=(0, 0, 0, len(items) * self.row_height))
+        self.canvas.yview_moveto(0)
+        self._refresh()
+    
+    def extend(self, items: List):
+        """Append items below the current ones, keeping the scroll position"""
+        if not items:
+            return
+        self.items.extend(items)
+        self.canvas.itemconfigure(self._empty, state="hidden")
+        self.canvas.configure(scrollregion=(0, 0, 0, len(self.items) * self.row_height))
+        self._refresh()
+    
+    def _visible(self) -> Tuple[int, int]:
+        first = max(0, int(self.canvas.canvasy(0)) // self.row_height)
+        count = max(1, self.canvas.winfo_height() // self.row_height + 2)
+        return first, max(0, min(count, len(self.items) - first))
+    
+    def _refresh(self):
+        first, count = self._visible()
+        
+        if count > len(self._rows):
+            width = self.canvas.winfo_width()
+            while len(self._rows) < count:
+                row = self.make_row(self.canvas)
+                self._rows.append(row)
+                self._windows.append(self.canvas.create_window(
+                    0, 0, window=row, anchor="nw", width=width, height=self.row_height
+                ))
+                self.created += 1
+            self._bound = [None] * len(self._rows)  # slot mapping changes with the pool size
+        
+        size = len(self._rows)
+        visible = range(first, first + count)
+        used = set()
+        for index in visible:
+            slot = index % size
+            used.add(slot)
+            if self._bound[slot] != index:
+                row = self._rows[slot]
+                row.item = self.items[index]
+                self.bind_row(row, self.items[index])
+                self.canvas.coords(self._windows[slot], 0, index * self.row_height)
+                self._bound[slot] = index
+                self.binds += 1
+            self.canvas.itemconfigure(self._windows[slot], state="normal")
+        
+        for slot in range(size):
+            if slot not in used:
+                self.canvas.itemconfigure(self._windows[slot], state="hidden")
+                self._bound[slot] = None
+        self._first = first
+        
+        if self.on_near_end is not None and first + 2 * max(count, size) >= len(self.items):
+            self.on_near_end()
+    
+    def _on_yview(self, first, last):
+        self.scrollbar.set(first, last)
+        if self.canvas.canvasy(0) // self.row_height != self._first:
+            self._refresh()
+    
+    def _on_resize(self, event):
+        for window in self._windows:
+            self.canvas.itemconfigure(window, width=event.width)
+        self._refresh()
+
+class NavigationCoalescer:
+    """Collapse bursts of navigation into a single grid render
+    
+    Every step calls preview() at once, which only updates the header
+    label. The full render is deferred until no step has arrived for
+    SETTLE_MS, so holding an arrow key never queues one render per month.
+    MAX_WAIT_MS bounds the deferral so a long hold still refreshes the grid
+    now and then; since the month worker drops superseded builds, those
+    refreshes cannot pile up either.
+    """
+    
+    SETTLE_MS = 60
+    MAX_WAIT_MS = 400
+    
+    def __init__(self, widget: tk.Misc, preview, render):
+        self.widget = widget
+        self.preview = preview
+        self.render = render
+        self._after_id = None
+        self._first_step = None
+        self.steps = 0
+        self.renders = 0
+    
+    def step(self):
+        """Record one navigation step; the render follows once input settles"""
+        self.steps += 1
+        self.preview()
+        
+        now = time.perf_counter()
+        if self._first_step is None:
+            self._first_step = now
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+        waited_ms = (now - self._first_step) * 1000
+        delay = max(0, min(self.SETTLE_MS, int(self.MAX_WAIT_MS - waited_ms)))
+        self._after_id = self.widget.after(delay, self.flush)
+    
+    def flush(self):
+        """Render now and forget any pending deferred render"""
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+        self._after_id = None
+        self._first_step = None
+        self.renders += 1
+        self.render()
+
+class StyleRegistry:
+    """Which widget options use which theme color role, for recoloring in place
+    
+    Roles are the keys of the theme color table ("bg", "fg", "accent", ...).
+    Widgets are registered explicitly or by scanning a widget tree and
+    matching each color option against the current theme, which is
+    unambiguous because every role has its own value within a theme.
+    Fixed-color ModernButtons are skipped. Entries are weak references, so
+    destroyed widgets drop out instead of being kept alive.
+    """
+    
+    COLOR_OPTIONS = ("bg", "fg", "activebackground", "activeforeground",
+                     "highlightbackground", "highlightcolor", "selectcolor", "insertbackground")
+    
+    def __init__(self):
+        self._roles: "weakref.WeakKeyDictionary[tk.Misc, Dict[str, str]]" = weakref.WeakKeyDictionary()
+    
+    def __len__(self) -> int:
+        return len(self._roles)
+    
+    def register(self, widget: tk.Misc, **roles: str):
+        """Record roles explicitly, e.g. register(label, bg="secondary", fg="text")"""
+        self._roles.setdefault(widget, {}).update(roles)
+    
+    def register_tree(self, root: tk.Misc, colors: Dict[str, str]):
+        """Record the roles of every not yet registered widget under root"""
+        roles_by_value = {value: role for role, value in colors.items()}
+        stack = [root]
+        while stack:
+            widget = stack.pop()
+            stack.extend(widget.winfo_children())
+            if widget in self._roles or isinstance(widget, ModernButton):
+                continue
+            
+            roles = {}
+            for option in self.COLOR_OPTIONS:
+                try:
+                    role = roles_by_value.get(str(widget.cget(option)))
+                except tk.TclError:
+                    continue  # option not supported (ttk widgets, canvases...)
+                if role:
+                    roles[option] = role
+            if roles:
+                self._roles[widget] = roles
+    
+    def apply(self, colors: Dict[str, str]) -> int:
+        """Recolor all registered widgets, returns how many were updated"""
+        updated = 0
+        for widget, roles in list(self._roles.items()):
+            try:
+                widget.configure(**{option: colors[role] for option, role in roles.items()})
+                updated += 1
+            except tk.TclError:
+                del self._roles[widget]  # destroyed
+        return updated
+
+class GridRenderer:
+    """Apply month models to the widget grid, sending Tk only what changed
+    
+    The last value applied to every widget option is remembered, so moving
+    between months with a similar layout configures only the cells whose
+    text or colors differ. ``calls`` is the number of .config() calls made
+    by the last render. Cell borders double as event badges, updated on their
+    own by render_badges when events arrive.
+    """
+    
+    HOLIDAY_COLOR = "#dc3545"
+    
+    def __init__(self, day_frames: List[List[tk.Frame]], day_labels: List[List[Tuple]],
+                 week_labels: List[tk.Label]):
+        offset = len(day_frames[0]) - 7 if day_frames else 0  # week number column
+        self.cells = [
+            (frame, *labels)
+            for frames, row_labels in zip(day_frames, day_labels)
+            for frame, labels in zip(frames[offset:], row_labels)
+        ]
+        self.week_labels = week_labels
+        self._applied: Dict[tk.Misc, Dict[str, object]] = {}
+        self.calls = 0
+    
+    def _configure(self, widget, **options):
+        applied = self._applied.setdefault(widget, {})
+        changed = {key: value for key, value in options.items() if applied.get(key) != value}
+        if changed:
+            self._send(widget, changed)
+            applied.update(changed)
+            self.calls += 1
+    
+    def _send(self, widget: tk.Misc, options: Dict[str, object]):
+        widget.config(**options)
+    
+    def invalidate(self):
+        """Forget applied state, e.g. after widgets were changed elsewhere"""
+        self._applied.clear()
+    
+    def recolor(self, colors: Dict[str, str]):
+        """Prepare for a theme change; the next render re-sends every option"""
+        self.invalidate()
+    
+    @classmethod
+    def badge_color(cls, events: int, holidays: int, colors: Dict[str, str]) -> str:
+        """Cell border color marking days with holidays or other events"""
+        if holidays:
+            return cls.HOLIDAY_COLOR
+        return colors["accent"] if events else colors["highlight"]
+    
+    def render_badges(self, badges: Dict[int, Tuple[int, int]], colors: Dict[str, str]) -> int:
+        """Mark cells (by index) with their (events, holidays) counts, returns Tk calls made"""
+        self.calls = 0
+        for index, (events, holidays) in badges.items():
+            self._configure(self.cells[index][0], highlightbackground=self.badge_color(events, holidays, colors))
+        return self.calls
+    
+    def render(self, model: MonthModel) -> int:
+        """Apply a month model, returns the number of Tk calls made"""
+        self.calls = 0
+        for label, text in zip(self.week_labels, model.week_numbers):
+            self._configure(label, text=text)
+        
+        for (frame, main_label, secondary_labels), cell in zip(self.cells, model.cells):
+            self._configure(frame, bg=cell.bg)
+            self._configure(main_label, text=cell.text, bg=cell.bg, fg=cell.fg)
+            for label, text in zip(secondary_labels, cell.secondary):
+                self._configure(label, text=text)
+        return self.calls
+
+class CanvasGridRenderer(GridRenderer):
+    """Draw the month grid on a single Canvas instead of ~300 widgets
+    
+    Every cell is a tagged rectangle with a main text item and four corner
+    text items; clicks are mapped to (week, day) from the pointer position
+    instead of per-widget bindings. Renders go through the same change
+    tracking as GridRenderer, using itemconfigure on canvas items.
+    """
+    
+    WEEK_COLUMN = 80
+    PADDING = 2
+    CORNERS = ("nw", "ne", "sw", "se")
+    
+    def __init__(self, canvas: tk.Canvas, colors: Dict[str, str], config: Dict, on_click):
+        self.canvas = canvas
+        self.on_click = on_click
+        self.week_column = self.WEEK_COLUMN if config.get("show_week_numbers", True) else 0
+        date_font = ("Segoe UI", config.get("date_size", 14))
+        secondary_font = ("Segoe UI", config.get("secondary_date_size", 9))
+        corners = 4 if config.get("show_multiple_dates", True) else 0
+        
+        cells = []
+        for index in range(42):
+            tag = f"cell{index}"
+            rect = canvas.create_rectangle(0, 0, 0, 0, fill=colors["secondary"],
+                                           outline=colors["highlight"], tags=("cell", tag))
+            main = canvas.create_text(0, 0, text="", anchor="nw", font=date_font,
+                                      fill=colors["fg"], tags=("date", tag))
+            secondary = [
+                canvas.create_text(0, 0, text="", anchor=anchor, font=secondary_font,
+                                   fill=colors["text"], tags=("secondary", tag))
+                for anchor in self.CORNERS[:corners]
+            ]
+            cells.append((rect, main, secondary))
+        
+        week_labels = []
+        if self.week_column:
+            week_labels = [
+                canvas.create_text(0, 0, text="", font=("Segoe UI", 10), fill=colors["text"], tags="week")
+                for _ in range(6)
+            ]
+        
+        self.cells = cells
+        self.week_labels = week_labels
+        self.calls = 0
+        
+        # Items start with known options, so the first render only sends what differs
+        self._applied = {}
+        for rect, main, secondary in cells:
+            self._applied[rect] = {"fill": colors["secondary"], "outline": colors["highlight"]}
+            self._applied[main] = {"text": "", "fill": colors["fg"]}
+            for item in secondary:
+                self._applied[item] = {"text": ""}
+        for item in week_labels:
+            self._applied[item] = {"text": ""}
+        
+        canvas.bind("<Configure>", self._layout)
+        canvas.bind("<Button-1>", self._click)
+    
+    def _send(self, item: int, options: Dict[str, object]):
+        self.canvas.itemconfigure(item, **options)
+    
+    def recolor(self, colors: Dict[str, str]):
+        """Recolor the items whose colors do not come from the month model"""
+        self.canvas.itemconfigure("cell", outline=colors["highlight"])
+        self.canvas.itemconfigure("secondary", fill=colors["text"])
+        self.canvas.itemconfigure("week", fill=colors["text"])
+        self.invalidate()
+    
+    def render_badges(self, badges: Dict[int, Tuple[int, int]], colors: Dict[str, str]) -> int:
+        """Mark cells (by index) with their (events, holidays) counts on the cell outline"""
+        self.calls = 0
+        for index, (events, holidays) in badges.items():
+            self._configure(self.cells[index][0], outline=self.badge_color(events, holidays, colors))
+        return self.calls
+    
+    def render(self, model: MonthModel) -> int:
+        """Apply a month model, returns the number of Tk calls made"""
+        self.calls = 0
+        for item, text in zip(self.week_labels, model.week_numbers):
+            self._configure(item, text=text)
+        
+        for (rect, main, secondary), cell in zip(self.cells, model.cells):
+            self._configure(rect, fill=cell.bg)
+            self._configure(main, text=cell.text, fill=cell.fg)
+            for item, text in zip(secondary, cell.secondary):
+                self._configure(item, text=text)
+        return self.calls
+    
+    def _cell_size(self) -> Tuple[float, float]:
+        width = max(self.canvas.winfo_width() - self.week_column, 7)
+        height = max(self.canvas.winfo_height(), 6)
+        return width / 7, height / 6
+    
+    def _layout(self, event=None):
+        """Position all items for the current canvas size"""
+        cell_width, cell_height = self._cell_size()
+        pad = self.PADDING
+        
+        for index, (rect, main, secondary) in enumerate(self.cells):
+            week, day = divmod(index, 7)
+            x0 = self.week_column + day * cell_width + pad
+            y0 = week * cell_height + pad
+            x1 = x0 + cell_width - 2 * pad
+            y1 = y0 + cell_height - 2 * pad
+            self.canvas.coords(rect, x0, y0, x1, y1)
+            self.canvas.coords(main, x0 + 10, y0 + 10)
+            corners = ((x0 + 5, y0 + 5), (x1 - 5, y0 + 5), (x0 + 5, y1 - 5), (x1 - 5, y1 - 5))
+            for item, (x, y) in zip(secondary, corners):
+                self.canvas.coords(item, x, y)
+        
+        for week, item in enumerate(self.week_labels):
+            self.canvas.coords(item, self.week_column / 2, (week + 0.5) * cell_height)
+    
+    def _click(self, event):
+        """Hit-test a click to a (week, day) cell"""
+        if event.x < self.week_column:
+            return
+        cell_width, cell_height = self._cell_size()
+        day = int((event.x - self.week_column) // cell_width)
+        week = int(event.y // cell_height)
+        if 0 <= day < 7 and 0 <= week < 6:
+            self.on_click(week, day)
+
+def blend_colors(base: str, tint: str, amount: float) -> str:
+    """Mix two #rrggbb colors, amount 0 gives base and 1 gives tint"""
+    base_rgb = [int(base[i:i + 2], 16) for i in (1, 3, 5)]
+    tint_rgb = [int(tint[i:i + 2], 16) for i in (1, 3, 5)]
+    return "#" + "".join(f"{round(b + (t - b) * amount):02x}" for b, t in zip(base_rgb, tint_rgb))
+
+class YearViewRenderer(GridRenderer):
+    """Draw twelve months on one Canvas, days shaded by event density
+    
+    All 12 x 42 day cells and their numbers are created once; renders go
+    through GridRenderer's change tracking, so moving between years only
+    touches the cells that differ. Hovering a day shows a tooltip drawn on
+    the same canvas, clicking one calls on_click with its day ordinal.
+    """
+    
+    COLUMNS = 4
+    TITLE_HEIGHT = 20
+    MARGIN = 8
+    
+    def __init__(self, canvas: tk.Canvas, colors: Dict[str, str], on_click, describe=None):
+        self.canvas = canvas
+        self.on_click = on_click
+        self.describe = describe
+        self.colors = colors
+        self.model: Optional[YearModel] = None
+        self.calls = 0
+        self._applied = {}
+        
+        self.titles = []
+        self.cells = []
+        for month in range(12):
+            self.titles.append(canvas.create_text(0, 0, text="", anchor="n", font=("Segoe UI", 10, "bold"),
+                                                  fill=colors["accent"], tags="title"))
+            for index in range(42):
+                rect = canvas.create_rectangle(0, 0, 0, 0, fill=colors["bg"], outline="", tags="yearcell")
+                text = canvas.create_text(0, 0, text="", font=("Segoe UI", 8), fill=colors["fg"], tags="yeardate")
+                self.cells.append((rect, text))
+                self._applied[rect] = {"fill": colors["bg"]}
+                self._applied[text] = {"text": "", "fill": colors["fg"]}
+        
+        self._tip_box = canvas.create_rectangle(0, 0, 0, 0, fill=colors["secondary"],
+                                                outline=colors["accent"], state="hidden")
+        self._tip_text = canvas.create_text(0, 0, text="", anchor="nw", font=("Segoe UI", 9),
+                                            fill=colors["fg"], state="hidden")
+        self._tip_ordinal = None
+        self._shades = {}
+        
+        canvas.bind("<Configure>", self._layout)
+        canvas.bind("<Button-1>", self._click)
+        canvas.bind("<Motion>", self._hover)
+        canvas.bind("<Leave>", lambda e: self._hide_tip())
+    
+    def _send(self, item: int, options: Dict[str, object]):
+        self.canvas.itemconfigure(item, **options)
+    
+    def recolor(self, colors: Dict[str, str]):
+        self.colors = colors
+        self._shades.clear()
+        self.canvas.itemconfigure("title", fill=colors["accent"])
+        self.canvas.itemconfigure(self._tip_box, fill=colors["secondary"], outline=colors["accent"])
+        self.canvas.itemconfigure(self._tip_text, fill=colors["fg"])
+        self.invalidate()
+    
+    def shade(self, bg: str, events: int, holidays: int) -> str:
+        """Cell color for a day: holidays tint red, other events tint accent"""
+        if not events or bg == self.colors["accent"]:  # empty day or today
+            return bg
+        key = (bg, min(events, 3), holidays > 0)
+        if key not in self._shades:
+            tint = self.HOLIDAY_COLOR if holidays else self.colors["accent"]
+            self._shades[key] = blend_colors(bg, tint, 0.2 + 0.15 * min(events, 3))
+        return self._shades[key]
+    
+    def render(self, model: YearModel) -> int:
+        """Apply a year model, returns the number of Tk calls made"""
+        self.calls = 0
+        self.model = model
+        self._hide_tip()
+        for title, month in zip(self.titles, model.months):
+            self._configure(title, text=month.title)
+        
+        cells = (cell for month in model.months for cell in month.cells)
+        for (rect, text), cell in zip(self.cells, cells):
+            events, holidays = model.density.get(cell.ordinal, (0, 0)) if cell.ordinal else (0, 0)
+            self._configure(rect, fill=self.shade(cell.bg, events, holidays))
+            self._configure(text, text=cell.text, fill=cell.fg)
+        return self.calls
+    
+    def _geometry(self) -> Tuple[float, float, float, float]:
+        """Month block width and height, day cell width and height"""
+        rows = 12 // self.COLUMNS
+        block_width = max(self.canvas.winfo_width(), self.COLUMNS * 7) / self.COLUMNS
+        block_height = max(self.canvas.winfo_height(), rows * 6) / rows
+        cell_width = (block_width - 2 * self.MARGIN) / 7
+        cell_height = (block_height - self.TITLE_HEIGHT - 2 * self.MARGIN) / 6
+        return block_width, block_height, cell_width, cell_height
+    
+    def _layout(self, event=None):
+        block_width, block_height, cell_width, cell_height = self._geometry()
+        for month in range(12):
+            row, column = divmod(month, self.COLUMNS)
+            left = column * block_width + self.MARGIN
+            top = row * block_height + self.MARGIN
+            self.canvas.coords(self.titles[month], left + 3.5 * cell_width, top)
+            for index in range(42):
+                week, day = divmod(index, 7)
+                rect, text = self.cells[month * 42 + index]
+                x0 = left + day * cell_width
+                y0 = top + self.TITLE_HEIGHT + week * cell_height
+                self.canvas.coords(rect, x0 + 1, y0 + 1, x0 + cell_width - 1, y0 + cell_height - 1)
+                self.canvas.coords(text, x0 + cell_width / 2, y0 + cell_height / 2)
+        self._hide_tip()
+    
+    def _cell_at(self, x: float, y: float) -> Optional[CellState]:
+        """Hit-test a point to the day cell under it"""
+        if self.model is None:
+            return None
+        block_width, block_height, cell_width, cell_height = self._geometry()
+        column, row = int(x // block_width), int(y // block_height)
+        if not (0 <= column < self.COLUMNS and 0 <= row < 12 // self.COLUMNS):
+            return None
+        day = int((x - column * block_width - self.MARGIN) // cell_width)
+        week = int((y - row * block_height - self.MARGIN - self.TITLE_HEIGHT) // cell_height)
+        if not (0 <= day < 7 and 0 <= week < 6):
+            return None
+        cell = self.model.months[row * self.COLUMNS + column].cells[week * 7 + day]
+        return cell if cell.ordinal else None
+    
+    def _click(self, event):
+        cell = self._cell_at(event.x, event.y)
+        if cell is not None:
+            self.on_click(cell.ordinal)
+    
+    def _hover(self, event):
+        if self.describe is None:
+            return
+        cell = self._cell_at(event.x, event.y)
+        if cell is None:
+            self._hide_tip()
+            return
+        if cell.ordinal != self._tip_ordinal:
+            self._tip_ordinal = cell.ordinal
+            self.canvas.itemconfigure(self._tip_text, text=self.describe(cell, self.model), state="normal")
+        
+        # Keep the tooltip inside the canvas
+        x0, y0, x1, y1 = self.canvas.bbox(self._tip_text)
+        width, height = x1 - x0, y1 - y0
+        x = min(event.x + 14, self.canvas.winfo_width() - width - 8)
+        y = min(event.y + 14, self.canvas.winfo_height() - height - 8)
+        self.canvas.coords(self._tip_text, x, y)
+        self.canvas.coords(self._tip_box, x - 4, y - 3, x + width + 4, y + height + 3)
+        self.canvas.itemconfigure(self._tip_box, state="normal")
+        self.canvas.tag_raise(self._tip_box)
+        self.canvas.tag_raise(self._tip_text)
+    
+    def _hide_tip(self):
+        if self._tip_ordinal is not None:
+            self._tip_ordinal = None
+            self.canvas.itemconfigure(self._tip_box, state="hidden")
+            self.canvas.itemconfigure(self._tip_text, state="hidden")
+
 # ============================================================================
 # Main Calendar Application
 # ============================================================================
@@ -1481,7 +3987,9 @@ class MultiCalendarApp:
         
         # Initialize components
         self.converter = MultiCalendarConverter()
-        self.event_manager = CalendarEventManager()
+        base = BaseEventIndex.open(config.get("base_index"))
+        self.event_manager = CalendarEventManager(base=base, api_client=CalendarAPI(bundle=base))
+        self.event_manager.recurring.load(config.get("recurring_events", []))
         self.calendar_names = self.converter.get_calendar_names()
         
         # Current date and display settings
@@ -1506,6 +4014,19 @@ class MultiCalendarApp:
         # UI Components
         self.day_frames = []  # For storing day frames
         self.day_labels = []  # For storing day labels
+        self.grid_renderer = None
+        self.render_stats_label = None
+        self.side_frame = None
+        self.styles = StyleRegistry()
+        self.ui = UIDispatcher(self.root)
+        self.month_models = MonthModelCache(self.build_month_model, self.month_model_signature)
+        self.month_worker = MonthModelWorker(self.ui, self.build_month_view, self.apply_month_model)
+        self.month_model = None
+        self.event_manager.add_listener(self.ui.wrap(self.on_events_changed))
+        self.year_worker = MonthModelWorker(self.ui, self.build_year_model, self.apply_year_model)
+        self.year_canvas = None
+        self.year_renderer = None
+        self.navigation = NavigationCoalescer(self.root, self.preview_month_title, self.update_calendar)
         
         # Build UI
         self.setup_ui()
@@ -1566,15 +4087,15 @@ class MultiCalendarApp:
         self.colors = theme_colors.get(self.theme, theme_colors[ThemeMode.LIGHT])
         self.root.configure(bg=self.colors["bg"])
     
+    WINDOW_SIZES = {
+        DisplayMode.COMPACT: "1000x700",
+        DisplayMode.MINIMAL: "800x600",
+    }
+    
     def setup_ui(self):
         """Setup user interface"""
         # Window size based on display mode
-        if self.display_mode == DisplayMode.COMPACT:
-            self.root.geometry("1000x700")
-        elif self.display_mode == DisplayMode.MINIMAL:
-            self.root.geometry("800x600")
-        else:
-            self.root.geometry("1200x800")
+        self.root.geometry(self.WINDOW_SIZES.get(self.display_mode, "1200x800"))
         
         # Menu bar
         self.setup_menu()
@@ -1590,6 +4111,9 @@ class MultiCalendarApp:
         
         # Bind keyboard shortcuts
         self.setup_shortcuts()
+        
+        # Remember color roles so theme changes can recolor in place
+        self.styles.register_tree(self.root, self.colors)
     
     def setup_menu(self):
         """Setup menu bar"""
@@ -1602,6 +4126,9 @@ class MultiCalendarApp:
         file_menu.add_command(label="Save Settings", command=self.save_settings)
         file_menu.add_command(label="Export Calendar", command=self.export_calendar)
         file_menu.add_separator()
+        file_menu.add_command(label="Import iCalendar...", command=self.import_ics)
+        file_menu.add_command(label="Export iCalendar...", command=self.export_ics)
+        file_menu.add_separator()
         file_menu.add_command(label="Exit", command=self.exit_app)
         
         # View menu
@@ -1612,10 +4139,11 @@ class MultiCalendarApp:
         display_menu = tk.Menu(view_menu, tearoff=0, bg=self.colors["bg"], fg=self.colors["fg"])
         view_menu.add_cascade(label="Display Mode", menu=display_menu)
         
+        self.display_mode_choice = tk.StringVar(value=self.display_mode.value)
         for mode in DisplayMode:
             display_menu.add_radiobutton(
                 label=mode.value.title(),
-                variable=tk.StringVar(value=self.display_mode.value),
+                variable=self.display_mode_choice,
                 value=mode.value,
                 command=lambda m=mode: self.change_display_mode(m)
             )
@@ -1624,10 +4152,11 @@ class MultiCalendarApp:
         theme_menu = tk.Menu(view_menu, tearoff=0, bg=self.colors["bg"], fg=self.colors["fg"])
         view_menu.add_cascade(label="Theme", menu=theme_menu)
         
+        self.theme_choice = tk.StringVar(value=self.config.get("theme", self.theme.value))
         for theme in ThemeMode:
             theme_menu.add_radiobutton(
                 label=theme.value.title(),
-                variable=tk.StringVar(value=self.theme.value),
+                variable=self.theme_choice,
                 value=theme.value,
                 command=lambda t=theme: self.change_theme(t)
             )
@@ -1647,6 +4176,21 @@ class MultiCalendarApp:
             command=self.toggle_multiple_dates
         )
         
+        self.canvas_grid_choice = tk.BooleanVar(value=self.uses_canvas_grid())
+        view_menu.add_checkbutton(
+            label="Canvas Grid (This Display Mode)",
+            variable=self.canvas_grid_choice,
+            command=self.toggle_canvas_grid
+        )
+        
+        self.year_view_choice = tk.BooleanVar(value=self.year_view_visible())
+        view_menu.add_checkbutton(
+            label="Year at a Glance",
+            variable=self.year_view_choice,
+            command=self.toggle_year_view,
+            accelerator="Ctrl+Y"
+        )
+        
         # Calendars menu
         calendars_menu = tk.Menu(menubar, tearoff=0, bg=self.colors["bg"], fg=self.colors["fg"])
         menubar.add_cascade(label="Calendars", menu=calendars_menu)
@@ -1681,6 +4225,9 @@ class MultiCalendarApp:
         # Tools menu
         tools_menu = tk.Menu(menubar, tearoff=0, bg=self.colors["bg"], fg=self.colors["fg"])
         menubar.add_cascade(label="Tools", menu=tools_menu)
+        tools_menu.add_command(label="Search Events", command=self.show_event_search)
+        tools_menu.add_command(label="Agenda", command=self.show_agenda)
+        tools_menu.add_command(label="Add Recurring Event", command=self.show_recurring_event_dialog)
         tools_menu.add_command(label="Date Converter", command=self.show_date_converter)
         tools_menu.add_command(label="Calendar Settings", command=self.show_calendar_settings)
         tools_menu.add_command(label="Update Events", command=self.update_events)
@@ -1783,6 +4330,7 @@ class MultiCalendarApp:
         """Setup main calendar content"""
         main_frame = tk.Frame(self.root, bg=self.colors["bg"])
         main_frame.pack(fill="both", expand=True, padx=10, pady=10)
+        self.main_frame = main_frame
         
         # Weekday headers
         self.setup_weekday_headers(main_frame)
@@ -1798,6 +4346,7 @@ class MultiCalendarApp:
         """Setup weekday headers"""
         weekday_frame = tk.Frame(parent, bg=self.colors["bg"])
         weekday_frame.pack(fill="x", pady=(0, 5))
+        self.weekday_frame = weekday_frame
         
         # Week number column (if enabled)
         if self.config.get("show_week_numbers", True):
@@ -1833,11 +4382,26 @@ class MultiCalendarApp:
             self.calendar_frame.destroy()
         
         self.calendar_frame = tk.Frame(parent, bg=self.colors["bg"])
-        self.calendar_frame.pack(fill="both", expand=True)
+        if self.side_frame is not None and self.side_frame.winfo_manager():
+            # Rebuilt grid keeps its place ahead of the side panel
+            self.calendar_frame.pack(fill="both", expand=True, before=self.side_frame)
+        else:
+            self.calendar_frame.pack(fill="both", expand=True)
+        
+        # Single-canvas grid for display modes that opted into it
+        if self.uses_canvas_grid():
+            self.day_frames = []
+            self.day_labels = []
+            canvas = tk.Canvas(self.calendar_frame, bg=self.colors["bg"], highlightthickness=0)
+            canvas.pack(fill="both", expand=True)
+            self.grid_renderer = CanvasGridRenderer(canvas, self.colors, self.config, self.on_day_click)
+            self.update_calendar()
+            return
         
         # Create 6 rows for weeks
         self.day_frames = []
         self.day_labels = []
+        week_number_labels = []
         
         for week in range(6):
             week_row = []
@@ -1858,6 +4422,7 @@ class MultiCalendarApp:
                 )
                 week_label.pack(expand=True)
                 week_row.append(week_frame)
+                week_number_labels.append(week_label)
             
             # Day cells
             for day in range(7):
@@ -1925,6 +4490,8 @@ class MultiCalendarApp:
             
             self.calendar_frame.rowconfigure(week, weight=1)
         
+        self.grid_renderer = GridRenderer(self.day_frames, self.day_labels, week_number_labels)
+        
         # Update calendar display
         self.update_calendar()
     
@@ -1933,6 +4500,7 @@ class MultiCalendarApp:
         side_frame = tk.Frame(parent, bg=self.colors["secondary"], width=300)
         side_frame.pack(side="right", fill="y", padx=(10, 0))
         side_frame.pack_propagate(False)
+        self.side_frame = side_frame
         
         # Selected date info
         date_info_frame = tk.LabelFrame(
@@ -1968,24 +4536,17 @@ class MultiCalendarApp:
         )
         events_frame.pack(fill="both", expand=True, padx=10, pady=10)
         
-        # Scrollable events list
+        # Scrollable events list, rows are pooled and reused between days
         events_canvas = tk.Canvas(
             events_frame,
             bg=self.colors["secondary"],
             highlightthickness=0
         )
-        scrollbar = tk.Scrollbar(events_frame, orient="vertical", command=events_canvas.yview)
-        self.events_content = tk.Frame(events_canvas, bg=self.colors["secondary"])
-        
-        events_canvas.configure(yscrollcommand=scrollbar.set)
+        scrollbar = tk.Scrollbar(events_frame, orient="vertical")
         
         scrollbar.pack(side="right", fill="y")
         events_canvas.pack(side="left", fill="both", expand=True)
-        events_canvas.create_window((0, 0), window=self.events_content, anchor="nw")
-        
-        def configure_scrollregion(event):
-            events_canvas.configure(scrollregion=events_canvas.bbox("all"))
-        self.events_content.bind("<Configure>", configure_scrollregion)
+        self.event_rows = EventRowPool(events_canvas, scrollbar, self.make_event_row, self.bind_event_row)
     
     def setup_footer(self):
         """Setup footer with status and calendar info"""
@@ -2018,6 +4579,19 @@ class MultiCalendarApp:
         )
         calendars_label.pack(side="left", padx=20)
         
+        # Tk calls issued by the last grid render (diagnostics)
+        if self.config.get("show_render_stats", False):
+            self.render_stats_label = tk.Label(
+                footer_frame,
+                text=f"Tk calls: {self.grid_renderer.calls if self.grid_renderer else 0}",
+                font=("Segoe UI", 9),
+                fg=self.colors["text"],
+                bg=self.colors["secondary"]
+            )
+            self.render_stats_label.pack(side="left", padx=20)
+        else:
+            self.render_stats_label = None
+        
         # Developer info
         dev_label = tk.Label(
             footer_frame,
@@ -2039,38 +4613,26 @@ class MultiCalendarApp:
         self.root.bind("<Home>", lambda e: self.go_to_today())
         self.root.bind("<F1>", lambda e: self.show_user_guide())
         self.root.bind("<F5>", lambda e: self.update_events())
+        self.root.bind("<Control-f>", lambda e: self.show_event_search())
+        self.root.bind("<Control-y>", lambda e: self.toggle_year_view())
     
     def load_initial_data(self):
         """Load initial calendar data"""
         # Load events for current year and selected calendars
         all_calendars = [self.primary_calendar] + self.secondary_calendars
-        threading.Thread(
-            target=self.event_manager.load_events,
-            args=(self.current_date.year, all_calendars),
-            daemon=True
-        ).start()
+        
+        def load_task():
+            self.event_manager.load_events(self.current_date.date(), all_calendars)
+            self.ui.post(self.status_label.config, text="Events loaded")
+        
+        threading.Thread(target=load_task, daemon=True).start()
         
         # Update status
         self.status_label.config(text="Loading events...")
     
-    def update_calendar(self):
-        """Update calendar display"""
-        year = self.current_date.year
-        month = self.current_date.month
-        
-        # Update date label
-        month_names = {
-            CalendarType.GREGORIAN: ["January", "February", "March", "April", "May", "June",
-                                   "July", "August", "September", "October", "November", "December"],
-            CalendarType.PERSIAN: ["Farvardin", "Ordibehesht", "Khordad", "Tir", "Mordad", "Shahrivar",
-                                 "Mehr", "Aban", "Azar", "Dey", "Bahman", "Esfand"],
-            CalendarType.ISLAMIC: ["Muharram", "Safar", "Rabi' al-Awwal", "Rabi' al-Thani", 
-                                 "Jumada al-Awwal", "Jumada al-Thani", "Rajab", "Sha'ban",
-                                 "Ramadan", "Shawwal", "Dhu al-Qi'dah", "Dhu al-Hijjah"]
-        }
-        
-        month_name = month_names.get(self.primary_calendar, month_names[CalendarType.GREGORIAN])[month - 1]
-        self.date_label.config(text=f"{month_name} {year}")
+    def build_month_model(self, year: int, month: int) -> MonthModel:
+        """Compute the text and colors of every grid cell for a month (no Tk calls)"""
+        title = self.month_title(year, month)
         
         # Get calendar data for primary calendar
         if self.primary_calendar == CalendarType.PERSIAN:
@@ -2095,98 +4657,231 @@ class MultiCalendarApp:
         if self.primary_calendar != CalendarType.PERSIAN:
             first_weekday = (first_weekday + 1) % 7
         
+        # Day numbers are offsets from the first of the month: Persian months can outrun the Gregorian one
+        first_ordinal = date(year, month, 1).toordinal()
+        
         # Calculate week numbers
         week_numbers = []
         if self.config.get("show_week_numbers", True):
             for week in range(6):
                 day_num = week * 7 - first_weekday + 1
                 if 1 <= day_num <= days_in_month:
-                    date_obj = datetime(year, month, day_num)
-                    week_num = date_obj.isocalendar()[1]
-                    week_numbers.append(week_num)
+                    week_day = date.fromordinal(first_ordinal + day_num - 1)
+                    week_numbers.append(str(week_day.isocalendar()[1]))
                 else:
                     week_numbers.append("")
         
-        # Fill calendar grid
-        day_num = 1
-        today = datetime.now()
+        today = datetime.now()
+        if self.primary_calendar == CalendarType.PERSIAN:
+            persian_today = jdatetime.date.today()
+        show_secondary = self.config.get("show_multiple_dates", True)
+        empty = CellState("", self.colors["bg"], self.colors["fg"], ("",) * 4)
+        
+        cells = []
+        for index in range(42):
+            day = index % 7
+            day_num = index - first_weekday + 1
+            if not 1 <= day_num <= days_in_month:
+                cells.append(empty)
+                continue
+            
+            # Check if today
+            is_today = False
+            if self.primary_calendar == CalendarType.PERSIAN:
+                try:
+                    jd = jdatetime.date.fromgregorian(year=year, month=month, day=day_num)
+                    is_today = (jd.year == persian_today.year and 
+                               jd.month == persian_today.month and 
+                               jd.day == persian_today.day)
+                except:
+                    pass
+            else:
+                is_today = (year == today.year and 
+                           month == today.month and 
+                           day_num == today.day)
+            
+            if is_today:
+                bg, fg = self.colors["accent"], "white"
+            elif day == 6:  # Saturday
+                bg, fg = self.colors["highlight"], self.colors["fg"]
+            else:
+                bg, fg = self.colors["secondary"], self.colors["fg"]
+            
+            # Secondary dates for the corners (max 4)
+            secondary = ["", "", "", ""]
+            if show_secondary:
+                all_dates = self.converter.get_all_calendar_dates(
+                    year, month, day_num, self.primary_calendar, self.secondary_calendars
+                )
+                for i, (cal_type, date_tuple) in enumerate(list(all_dates.items())[1:5]):
+                    secondary[i] = str(date_tuple[2])
+            
+            cells.append(CellState(str(day_num), bg, fg, tuple(secondary), first_ordinal + day_num - 1))
+        
+        return MonthModel(year, month, title, tuple(week_numbers), tuple(cells))
+    
+    def month_title(self, year: int, month: int) -> str:
+        """Header text for a month; cheap enough to run on every navigation step"""
+        month_name = MONTH_NAMES.get(self.primary_calendar, MONTH_NAMES[CalendarType.GREGORIAN])[month - 1]
+        return f"{month_name} {year}"
+    
+    def preview_month_title(self):
+        """Show the month being navigated to before its grid is rendered"""
+        if self.year_view_visible():
+            self.date_label.config(text=str(self.current_date.year))
+        else:
+            self.date_label.config(text=self.month_title(self.current_date.year, self.current_date.month))
+    
+    def on_events_changed(self, ordinals: Optional[FrozenSet[int]]):
+        """Main thread: re-badge only the visible days whose events changed"""
+        model = self.month_model
+        if model is not None:
+            affected = self.month_badges(model, ordinals)
+            if affected:
+                calls = self.grid_renderer.render_badges(affected, self.colors)
+                if self.render_stats_label is not None:
+                    self.render_stats_label.config(text=f"Tk calls: {calls}")
+        
+        if self.year_view_visible():
+            year = self.current_date.year
+            if ordinals is None or any(date.fromordinal(ordinal).year == year for ordinal in ordinals):
+                self.year_worker.request(year)
+        
+        if ordinals is None or self.selected_date.date().toordinal() in ordinals:
+            self.update_events_display()
+    
+    def year_view_visible(self) -> bool:
+        return self.year_canvas is not None and bool(self.year_canvas.winfo_manager())
+    
+    def build_year_model(self, year: int) -> YearModel:
+        """Twelve cached month models and the year's event density (no Tk calls)"""
+        months = tuple(self.month_models.get(year, month) for month in range(1, 13))
+        density = self.event_manager.event_density([self.primary_calendar] + self.secondary_calendars, year)
+        return YearModel(year, months, density)
+    
+    def apply_year_model(self, model: YearModel):
+        """Draw a finished year model if the year view is still shown"""
+        if not self.year_view_visible():
+            return
+        self.date_label.config(text=str(model.year))
+        calls = self.year_renderer.render(model)
+        if self.render_stats_label is not None:
+            self.render_stats_label.config(text=f"Tk calls: {calls}")
+    
+    def describe_year_cell(self, cell: CellState, model: YearModel) -> str:
+        """Tooltip of a year view day: its date in every active calendar and its events"""
+        day = date.fromordinal(cell.ordinal)
+        lines = [day.strftime("%A %Y-%m-%d")]
+        all_dates = self.converter.get_all_calendar_dates(
+            day.year, day.month, day.day, CalendarType.GREGORIAN,
+            [self.primary_calendar] + self.secondary_calendars
+        )
+        for cal_type, (cal_year, cal_month, cal_day) in list(all_dates.items())[1:]:
+            cal_name = self.calendar_names.get(CalendarType(cal_type), cal_type)
+            lines.append(f"{cal_name}: {cal_year}/{cal_month:02d}/{cal_day:02d}")
         
-        for week in range(6):
-            # Update week number
-            if self.config.get("show_week_numbers", True) and week < len(week_numbers):
-                week_label = self.day_frames[week][0].winfo_children()[0]
-                week_label.config(text=str(week_numbers[week]))
-            
-            for day in range(7):
-                day_idx = day + (1 if self.config.get("show_week_numbers", True) else 0)
-                day_frame = self.day_frames[week][day_idx]
-                main_label, secondary_labels = self.day_labels[week][day]
-                
-                if week == 0 and day < first_weekday:
-                    # Days before month
-                    main_label.config(text="")
-                    day_frame.config(bg=self.colors["bg"])
-                    for label in secondary_labels:
-                        label.config(text="")
-                elif day_num <= days_in_month:
-                    # Day in month
-                    main_label.config(text=str(day_num))
-                    
-                    # Check if today
-                    is_today = False
-                    if self.primary_calendar == CalendarType.PERSIAN:
-                        try:
-                            persian_today = jdatetime.date.today()
-                            jd = jdatetime.date.fromgregorian(year=year, month=month, day=day_num)
-                            is_today = (jd.year == persian_today.year and 
-                                       jd.month == persian_today.month and 
-                                       jd.day == persian_today.day)
-                        except:
-                            pass
-                    else:
-                        is_today = (year == today.year and 
-                                   month == today.month and 
-                                   day_num == today.day)
-                    
-                    # Set colors
-                    if is_today:
-                        day_frame.config(bg=self.colors["accent"])
-                        main_label.config(bg=self.colors["accent"], fg="white")
-                    elif day == 6:  # Saturday
-                        day_frame.config(bg=self.colors["highlight"])
-                        main_label.config(bg=self.colors["highlight"], fg=self.colors["fg"])
-                    else:
-                        day_frame.config(bg=self.colors["secondary"])
-                        main_label.config(bg=self.colors["secondary"], fg=self.colors["fg"])
-                    
-                    # Show secondary dates
-                    if self.config.get("show_multiple_dates", True) and secondary_labels:
-                        # Get dates in all calendars
-                        all_dates = self.converter.get_all_calendar_dates(
-                            year, month, day_num, self.primary_calendar, self.secondary_calendars
-                        )
-                        
-                        # Display secondary dates in corners
-                        for i, (cal_type, date_tuple) in enumerate(list(all_dates.items())[1:5]):  # Max 4 secondary
-                            if i < len(secondary_labels):
-                                cal_year, cal_month, cal_day = date_tuple
-                                label_text = f"{cal_day}"
-                                secondary_labels[i].config(text=label_text)
-                    
-                    day_num += 1
-                else:
-                    # Days after month
-                    main_label.config(text="")
-                    day_frame.config(bg=self.colors["bg"])
-                    for label in secondary_labels:
-                        label.config(text="")
+        events, holidays = model.density.get(cell.ordinal, (0, 0))
+        if events:
+            lines.append(f"{events} event(s), {holidays} holiday(s)")
+        return "\n".join(lines)
+    
+    def toggle_year_view(self):
+        """Switch between the month grid and the year at a glance"""
+        if self.year_view_visible():
+            self.show_month_view()
+        else:
+            self.show_year_view()
+    
+    def show_year_view(self):
+        """Show the year canvas in place of the weekday headers and month grid"""
+        if self.year_canvas is None:
+            self.year_canvas = tk.Canvas(self.main_frame, bg=self.colors["bg"], highlightthickness=0)
+            self.styles.register(self.year_canvas, bg="bg")
+            describe = self.describe_year_cell if self.config.get("year_view_tooltips", True) else None
+            self.year_renderer = YearViewRenderer(self.year_canvas, self.colors, self.on_year_day_click, describe)
+        
+        self.year_canvas.pack(fill="both", expand=True, before=self.weekday_frame)
+        self.weekday_frame.pack_forget()
+        self.calendar_frame.pack_forget()
+        self.year_view_choice.set(True)
+        
+        self.date_label.config(text=str(self.current_date.year))
+        self.year_worker.request(self.current_date.year)
+    
+    def show_month_view(self):
+        """Bring back the month grid; its last render is still in place"""
+        if not self.year_view_visible():
+            return
+        self.weekday_frame.pack(fill="x", pady=(0, 5), before=self.year_canvas)
+        self.calendar_frame.pack(fill="both", expand=True, before=self.year_canvas)
+        self.year_canvas.pack_forget()
+        self.year_view_choice.set(False)
+        self.date_label.config(text=self.month_title(self.current_date.year, self.current_date.month))
+    
+    def on_year_day_click(self, ordinal: int):
+        """Open the month of a day clicked in the year view, with the day selected"""
+        day = date.fromordinal(ordinal)
+        self.current_date = datetime(day.year, day.month, 1)
+        self.selected_date = datetime(day.year, day.month, day.day)
+        self.show_month_view()
+        self.update_date_display()
+        self.update_date_info()
+    
+    def update_calendar(self):
+        """Update calendar display
+        
+        The month model is built off the main thread; apply_month_model runs
+        on the main thread once it is ready.
+        """
+        self.month_worker.request(self.current_date.year, self.current_date.month)
+        if self.year_view_visible():
+            self.year_worker.request(self.current_date.year)
+    
+    def month_model_signature(self) -> Tuple:
+        """Everything besides year and month that a month model depends on"""
+        return (
+            self.primary_calendar,
+            tuple(self.secondary_calendars),
+            self.config.get("show_week_numbers", True),
+            self.config.get("show_multiple_dates", True),
+            tuple(self.colors.values()),
+            date.today(),
+        )
+    
+    def build_month_view(self, year: int, month: int) -> MonthModel:
+        """Worker side of a month render: the cached model, with the year's badges warmed up"""
+        model = self.month_models.get(year, month)
+        self.event_manager.event_density([self.primary_calendar] + self.secondary_calendars, year)
+        return model
+    
+    def month_badges(self, model: MonthModel, ordinals: Optional[FrozenSet[int]] = None) -> Dict[int, Tuple[int, int]]:
+        """(events, holidays) of the month's cells, limited to the given days if any"""
+        density = self.event_manager.event_density([self.primary_calendar] + self.secondary_calendars, model.year)
+        return {
+            index: density.get(cell.ordinal, (0, 0))
+            for index, cell in enumerate(model.cells)
+            if ordinals is None or cell.ordinal in ordinals
+        }
+    
+    def apply_month_model(self, model: MonthModel):
+        """Apply a finished month model to the header, grid and side panel"""
+        # Update date label (the year view shows the year instead)
+        if not self.year_view_visible():
+            self.date_label.config(text=model.title)
+        
+        # Only options that differ from the last render reach Tk
+        self.month_model = model
+        calls = self.grid_renderer.render(model)
+        calls += self.grid_renderer.render_badges(self.month_badges(model), self.colors)
+        if self.render_stats_label is not None:
+            self.render_stats_label.config(text=f"Tk calls: {calls}")
         
         # Update selected date info
         self.update_date_info()
     
     def update_date_display(self):
-        """Update date display in header"""
-        self.update_calendar()
+        """Update date display in header, superseding any deferred navigation render"""
+        self.navigation.flush()
     
     def update_date_info(self):
         """Update selected date information"""
@@ -2237,59 +4932,47 @@ class MultiCalendarApp:
         if self.display_mode != DisplayMode.DETAILED:
             return
         
-        # Clear current events
-        for widget in self.events_content.winfo_children():
-            widget.destroy()
-        
-        # Get events for selected date in all calendars
-        date_str = f"{self.selected_date.year}/{self.selected_date.month}/{self.selected_date.day}"
-        
-        all_events = []
-        for cal in [self.primary_calendar] + self.secondary_calendars:
-            events = self.event_manager.get_events_for_date(date_str, cal.value)
-            for event in events:
-                event['calendar'] = self.calendar_names[cal]
-                all_events.append(event)
-        
-        if not all_events:
-            no_events = tk.Label(
-                self.events_content,
-                text="No events for this date",
-                font=("Segoe UI", 10),
-                fg=self.colors["text"],
-                bg=self.colors["secondary"]
-            )
-            no_events.pack(pady=10)
-            return
-        
-        # Display events
-        for event in all_events:
-            event_frame = tk.Frame(self.events_content, bg=self.colors["secondary"])
-            event_frame.pack(fill="x", padx=5, pady=2)
-            
-            # Event indicator
-            indicator_color = {
-                "national": "#0078d4",
-                "religious": "#28a745",
-                "international": "#ffc107",
-                "holiday": "#dc3545"
-            }.get(event.get("type", "international"), "#6c757d")
-            
-            indicator = tk.Frame(event_frame, bg=indicator_color, width=3, height=20)
-            indicator.pack(side="left", fill="y", padx=(0, 5))
-            
-            # Event info
-            info_text = f"{event['title']}\nCalendar: {event['calendar']}"
-            info_label = tk.Label(
-                event_frame,
-                text=info_text,
-                font=("Segoe UI", 9),
-                fg=self.colors["fg"],
-                bg=self.colors["secondary"],
-                anchor="w",
-                justify="left"
-            )
-            info_label.pack(side="left", fill="x", expand=True)
+        # Get events for selected date in all calendars, the same occasion shown once
+        all_events = self.event_manager.get_merged_events(
+            self.selected_date.date(), [self.primary_calendar] + self.secondary_calendars
+        )
+        self.event_rows.set_items(all_events, "No events for this date", self.colors["text"])
+    
+    def make_event_row(self, parent: tk.Misc) -> tk.Frame:
+        """Create one reusable side panel row: type indicator and event text"""
+        event_frame = tk.Frame(parent, bg=self.colors["secondary"])
+        event_frame.indicator = tk.Frame(event_frame, width=3)
+        event_frame.indicator.pack(side="left", fill="y", padx=(0, 5), pady=2)
+        event_frame.info = tk.Label(
+            event_frame,
+            font=("Segoe UI", 9),
+            anchor="w",
+            justify="left"
+        )
+        event_frame.info.pack(side="left", fill="x", expand=True)
+        return event_frame
+    
+    def bind_event_row(self, event_frame: tk.Frame, merged: MergedEvent):
+        """Show a merged event in a pooled row"""
+        event = merged.event
+        calendar_name = ", ".join(self.calendar_names[CalendarType(cal)] for cal in merged.calendars)
+        
+        # Event indicator
+        indicator_color = {
+            EventType.NATIONAL: "#0078d4",
+            EventType.RELIGIOUS: "#28a745",
+            EventType.INTERNATIONAL: "#ffc107",
+            EventType.HOLIDAY: "#dc3545",
+            EventType.OBSERVANCE: "#17a2b8"
+        }.get(event.kind, "#6c757d")
+        
+        event_frame.configure(bg=self.colors["secondary"])
+        event_frame.indicator.configure(bg=indicator_color)
+        event_frame.info.configure(
+            text=f"{event.title}\nCalendar: {calendar_name}",
+            fg=self.colors["fg"],
+            bg=self.colors["secondary"]
+        )
     
     def on_day_click(self, week: int, day: int):
         """Handle day click"""
@@ -2323,7 +5006,7 @@ class MultiCalendarApp:
         else:
             self.current_date = self.current_date.replace(month=self.current_date.month - 1)
         
-        self.update_date_display()
+        self.navigation.step()
     
     def next_month(self):
         """Go to next month"""
@@ -2332,17 +5015,17 @@ class MultiCalendarApp:
         else:
             self.current_date = self.current_date.replace(month=self.current_date.month + 1)
         
-        self.update_date_display()
+        self.navigation.step()
     
     def prev_year(self):
         """Go to previous year"""
         self.current_date = self.current_date.replace(year=self.current_date.year - 1)
-        self.update_date_display()
+        self.navigation.step()
     
     def next_year(self):
         """Go to next year"""
         self.current_date = self.current_date.replace(year=self.current_date.year + 1)
-        self.update_date_display()
+        self.navigation.step()
     
     def go_to_today(self):
         """Go to today's date"""
@@ -2351,29 +5034,51 @@ class MultiCalendarApp:
         self.update_date_display()
         self.status_label.config(text="Returned to today")
     
+    def uses_canvas_grid(self) -> bool:
+        """Whether the current display mode draws the grid on a canvas"""
+        return self.display_mode.value in self.config.get("canvas_grid_modes", [])
+    
     def change_display_mode(self, mode: DisplayMode):
-        """Change display mode"""
+        """Change display mode, touching only the panels the modes differ in"""
+        self.show_month_view()
         self.display_mode = mode
         self.config["display_mode"] = mode.value
+        self.display_mode_choice.set(mode.value)
+        self.canvas_grid_choice.set(self.uses_canvas_grid())
         
-        # Rebuild UI
-        for widget in self.root.winfo_children():
-            widget.destroy()
+        self.root.geometry(self.WINDOW_SIZES.get(mode, "1200x800"))
         
-        self.setup_ui()
+        # Swap the grid only when this mode uses the other renderer
+        if self.uses_canvas_grid() != isinstance(self.grid_renderer, CanvasGridRenderer):
+            self.setup_calendar_grid(self.main_frame)
+        
+        # Side panel is kept (hidden) outside the detailed view
+        if mode == DisplayMode.DETAILED:
+            if self.side_frame is None:
+                self.setup_side_panel(self.main_frame)
+            elif not self.side_frame.winfo_manager():
+                self.side_frame.pack(side="right", fill="y", padx=(10, 0))
+            self.update_date_info()
+            self.update_events_display()
+        elif self.side_frame is not None:
+            self.side_frame.pack_forget()
+        
+        self.styles.register_tree(self.root, self.colors)
         self.status_label.config(text=f"Display mode changed to {mode.value}")
     
     def change_theme(self, theme: ThemeMode):
-        """Change theme"""
+        """Change theme by recoloring the existing widgets"""
         self.theme = theme
         self.config["theme"] = theme.value
+        self.theme_choice.set(theme.value)
         self.setup_theme()
         
-        # Rebuild UI
-        for widget in self.root.winfo_children():
-            widget.destroy()
-        
-        self.setup_ui()
+        self.styles.apply(self.colors)
+        self.grid_renderer.recolor(self.colors)
+        if self.year_renderer is not None:
+            self.year_renderer.recolor(self.colors)
+        self.update_calendar()
+        self.update_events_display()
         self.status_label.config(text=f"Theme changed to {theme.value}")
     
     def change_primary_calendar(self, calendar: CalendarType):
@@ -2411,6 +5116,15 @@ class MultiCalendarApp:
             text=f"Week numbers {'enabled' if self.config['show_week_numbers'] else 'disabled'}"
         )
     
+    def toggle_canvas_grid(self):
+        """Switch the current display mode between the widget grid and the canvas grid"""
+        modes = self.config.setdefault("canvas_grid_modes", [])
+        if self.display_mode.value in modes:
+            modes.remove(self.display_mode.value)
+        else:
+            modes.append(self.display_mode.value)
+        self.change_display_mode(self.display_mode)
+    
     def toggle_multiple_dates(self):
         """Toggle multiple dates display"""
         self.config["show_multiple_dates"] = not self.config.get("show_multiple_dates", True)
@@ -2424,6 +5138,46 @@ class MultiCalendarApp:
         converter = DateConverterDialog(self.root, self.converter, self.calendar_names, self.colors)
         converter.show()
     
+    def show_event_search(self):
+        """Show event search dialog"""
+        search = EventSearchDialog(self.root, self.event_manager, self.converter,
+                                   self.calendar_names, self.colors, self.go_to_event, self.ui)
+        search.show()
+    
+    def show_agenda(self):
+        """Show the agenda of upcoming events in all active calendars"""
+        agenda = AgendaDialog(self.root, self.event_manager, self.calendar_names, self.colors,
+                              [self.primary_calendar] + self.secondary_calendars, self.ui, self.go_to_event)
+        agenda.show()
+    
+    def show_recurring_event_dialog(self):
+        """Show dialog for adding a recurring event"""
+        dialog = RecurringEventDialog(self.root, self.calendar_names, self.colors, self.primary_calendar)
+        rule = dialog.show()
+        if rule is None:
+            return
+        
+        self.event_manager.add_recurring(rule)
+        self.config["recurring_events"] = self.event_manager.recurring.to_config()
+        self.status_label.config(text=f"Recurring event added: {rule.title}")
+    
+    def go_to_event(self, event: Event):
+        """Navigate to the month of an event"""
+        try:
+            year, month, day = self.converter.convert_date(
+                event.year, event.month, event.day,
+                CalendarType(event.calendar), CalendarType.GREGORIAN
+            )
+        except Exception as e:
+            self.status_label.config(text=f"Cannot show event: {e}")
+            return
+        
+        self.current_date = datetime(year, month, 1)
+        self.selected_date = datetime(year, month, day)
+        self.update_date_display()
+        self.update_date_info()
+        self.status_label.config(text=f"{event.title}: {self.selected_date.strftime('%Y-%m-%d')}")
+    
     def show_calendar_settings(self):
         """Show calendar settings dialog"""
         settings = CalendarSettingsDialog(self.root, self.config, self.colors)
@@ -2447,11 +5201,10 @@ class MultiCalendarApp:
         all_calendars = [self.primary_calendar] + self.secondary_calendars
         
         def update_task():
-            self.status_label.config(text="Updating events...")
-            self.event_manager.load_events(self.current_date.year, all_calendars)
-            self.root.after(0, lambda: self.status_label.config(text="Events updated"))
-            self.root.after(0, self.update_events_display)
+            self.event_manager.load_events(self.current_date.date(), all_calendars)
+            self.ui.post(self.status_label.config, text="Events updated")
         
+        self.status_label.config(text="Updating events...")
         threading.Thread(target=update_task, daemon=True).start()
     
     def show_user_guide(self):
@@ -2564,6 +5317,51 @@ Website: https://instagram.com/hessamedien
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to export calendar: {str(e)}")
     
+    def import_ics(self):
+        """Import events from an iCalendar file in the background"""
+        file_path = filedialog.askopenfilename(
+            filetypes=[("iCalendar files", "*.ics"), ("All files", "*.*")]
+        )
+        if not file_path:
+            return
+        
+        def report(done, total):
+            percent = done * 100 // total if total else 100
+            self.ui.post(self.status_label.config, text=f"Importing... {percent}%")
+        
+        def import_task():
+            try:
+                count = self.event_manager.import_ics(file_path, progress=report)
+                self.ui.post(self.status_label.config, text=f"Imported {count} events")
+            except Exception as e:
+                self.ui.post(messagebox.showerror, "Error", f"Failed to import calendar: {e}")
+        
+        threading.Thread(target=import_task, daemon=True).start()
+    
+    def export_ics(self):
+        """Export holidays and imported events of the active calendars as iCalendar"""
+        years = simpledialog.askinteger(
+            "Export iCalendar", "Number of years to export:",
+            initialvalue=5, minvalue=1, maxvalue=100, parent=self.root
+        )
+        if not years:
+            return
+        
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".ics",
+            filetypes=[("iCalendar files", "*.ics"), ("All files", "*.*")]
+        )
+        if not file_path:
+            return
+        
+        calendars = [self.primary_calendar] + self.secondary_calendars
+        start_year = self.current_date.year
+        try:
+            self.event_manager.export_ics(file_path, calendars, start_year, start_year + years - 1)
+            self.status_label.config(text=f"Calendar exported to {file_path}")
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to export calendar: {str(e)}")
+    
     def exit_app(self):
         """Exit application"""
         self.save_settings()
@@ -2778,6 +5576,401 @@ class DateConverterDialog:
         except Exception as e:
             messagebox.showerror("Conversion Error", f"Invalid date format or conversion error: {str(e)}")
 
+class EventSearchDialog:
+    """Search-as-you-type dialog over indexed events"""
+    
+    SEARCH_YEARS = 50  # Years indexed before and after the current year
+    
+    def __init__(self, parent, event_manager, converter, calendar_names, colors, on_select=None,
+                 dispatcher: Optional[UIDispatcher] = None):
+        self.parent = parent
+        self.dispatcher = dispatcher
+        self.event_manager = event_manager
+        self.converter = converter
+        self.calendar_names = calendar_names
+        self.colors = colors
+        self.on_select = on_select
+        self.dialog = None
+        self.results = []
+        self.current_years = {}
+        self._pending = None
+    
+    def show(self):
+        """Show the dialog"""
+        self.dialog = tk.Toplevel(self.parent)
+        self.dialog.title("Search Events")
+        self.dialog.geometry("560x460")
+        self.dialog.configure(bg=self.colors["bg"])
+        self.dialog.transient(self.parent)
+        
+        self.create_content()
+        
+        # Index generated holidays across decades without blocking the dialog
+        threading.Thread(target=self.index_generated_events, daemon=True).start()
+    
+    def create_content(self):
+        """Create dialog content"""
+        self.query_var = tk.StringVar()
+        entry = tk.Entry(
+            self.dialog,
+            textvariable=self.query_var,
+            font=("Arial", 13),
+            bg=self.colors["secondary"],
+            fg=self.colors["fg"],
+            insertbackground=self.colors["fg"]
+        )
+        entry.pack(fill="x", padx=20, pady=(20, 10))
+        entry.bind("<KeyRelease>", self.schedule_search)
+        entry.bind("<Return>", lambda e: self.select_result())
+        entry.focus_set()
+        
+        list_frame = tk.Frame(self.dialog, bg=self.colors["bg"])
+        list_frame.pack(fill="both", expand=True, padx=20)
+        
+        scrollbar = tk.Scrollbar(list_frame)
+        scrollbar.pack(side="right", fill="y")
+        
+        self.result_list = tk.Listbox(
+            list_frame,
+            font=("Arial", 11),
+            bg=self.colors["secondary"],
+            fg=self.colors["fg"],
+            selectbackground=self.colors["accent"],
+            yscrollcommand=scrollbar.set,
+            activestyle="none"
+        )
+        self.result_list.pack(side="left", fill="both", expand=True)
+        scrollbar.config(command=self.result_list.yview)
+        self.result_list.bind("<Double-Button-1>", lambda e: self.select_result())
+        
+        self.info_label = tk.Label(
+            self.dialog,
+            text="Type to search event titles",
+            font=("Arial", 10),
+            bg=self.colors["bg"],
+            fg=self.colors["text"]
+        )
+        self.info_label.pack(fill="x", padx=20, pady=10)
+    
+    def index_generated_events(self):
+        """Index built-in holidays around the current year for every calendar"""
+        today = date.today()
+        for cal_type in self.calendar_names:
+            try:
+                year = self.converter.convert_date(
+                    today.year, today.month, today.day, CalendarType.GREGORIAN, cal_type
+                )[0]
+                self.current_years[cal_type.value] = year
+                self.event_manager.index_years(cal_type, year - self.SEARCH_YEARS, year + self.SEARCH_YEARS)
+            except Exception as e:
+                print(f"Error indexing {cal_type.value} events: {e}")
+        
+        if self.dispatcher is not None:
+            self.dispatcher.post(self.refresh_results)
+        else:
+            try:
+                self.dialog.after(0, self.refresh_results)
+            except tk.TclError:
+                pass  # Dialog already closed
+    
+    def refresh_results(self):
+        """Re-run the search once indexing has finished, if the dialog is still open"""
+        try:
+            if self.dialog is not None and self.dialog.winfo_exists():
+                self.run_search()
+        except tk.TclError:
+            pass  # Application closed
+    
+    def schedule_search(self, event=None):
+        """Debounce searches while the user is typing"""
+        if self._pending is not None:
+            self.dialog.after_cancel(self._pending)
+        self._pending = self.dialog.after(120, self.run_search)
+    
+    def run_search(self):
+        """Run the query and show ranked results"""
+        self._pending = None
+        query = self.query_var.get()
+        self.results = self.event_manager.search_events(query, limit=50, near=self.current_years)
+        
+        self.result_list.delete(0, tk.END)
+        for event in self.results:
+            cal_name = self.calendar_names.get(CalendarType(event.calendar), event.calendar)
+            self.result_list.insert(tk.END, f"{event.date}  {event.title}  ({cal_name})")
+        
+        if query.strip():
+            self.info_label.config(
+                text=f"{len(self.results)} result(s) from {len(self.event_manager.search_index)} indexed events"
+            )
+        else:
+            self.info_label.config(text="Type to search event titles")
+    
+    def select_result(self):
+        """Open the selected (or first) result"""
+        if not self.results:
+            return
+        selection = self.result_list.curselection()
+        event = self.results[selection[0] if selection else 0]
+        if self.on_select:
+            self.on_select(event)
+
+class AgendaDialog:
+    """Scrolling agenda of upcoming events across calendars
+    
+    Rows come from an EventRowPool, so only the visible rows exist however
+    long the span is; the next year of events is fetched on a worker thread
+    whenever the view gets within a screen of the end of what is loaded.
+    """
+    
+    SPANS = {
+        "Next 30 days": 30,
+        "Next year": 365,
+        "Next 10 years": 3652,
+        "Next 50 years": 18262,
+    }
+    
+    def __init__(self, parent, event_manager, calendar_names, colors, calendars,
+                 dispatcher: UIDispatcher, on_select=None):
+        self.parent = parent
+        self.event_manager = event_manager
+        self.calendar_names = calendar_names
+        self.colors = colors
+        self.calendars = calendars
+        self.dispatcher = dispatcher
+        self.on_select = on_select
+        self.dialog = None
+        self.source = None
+        self._loading = False
+    
+    def show(self):
+        """Show the dialog"""
+        self.dialog = tk.Toplevel(self.parent)
+        self.dialog.title("Agenda")
+        self.dialog.geometry("560x520")
+        self.dialog.configure(bg=self.colors["bg"])
+        self.dialog.transient(self.parent)
+        
+        self.create_content()
+        self.change_span()
+    
+    def create_content(self):
+        """Create dialog content"""
+        top_frame = tk.Frame(self.dialog, bg=self.colors["bg"])
+        top_frame.pack(fill="x", padx=20, pady=(20, 10))
+        
+        tk.Label(top_frame, text="Show:", font=("Arial", 11),
+                 bg=self.colors["bg"], fg=self.colors["fg"]).pack(side="left")
+        self.span_var = tk.StringVar(value="Next year")
+        span_combo = ttk.Combobox(top_frame, textvariable=self.span_var,
+                                  values=list(self.SPANS), state="readonly", width=16)
+        span_combo.pack(side="left", padx=10)
+        span_combo.bind("<<ComboboxSelected>>", lambda e: self.change_span())
+        
+        list_frame = tk.Frame(self.dialog, bg=self.colors["bg"])
+        list_frame.pack(fill="both", expand=True, padx=20)
+        
+        canvas = tk.Canvas(list_frame, bg=self.colors["secondary"], highlightthickness=0)
+        scrollbar = tk.Scrollbar(list_frame, orient="vertical")
+        scrollbar.pack(side="right", fill="y")
+        canvas.pack(side="left", fill="both", expand=True)
+        
+        self.rows = EventRowPool(canvas, scrollbar, self.make_row, self.bind_row,
+                                 row_height=28, on_near_end=self.load_more)
+        canvas.bind("<MouseWheel>", lambda e: canvas.yview_scroll(-1 if e.delta > 0 else 1, "units"))
+        
+        self.info_label = tk.Label(
+            self.dialog,
+            text="",
+            font=("Arial", 10),
+            bg=self.colors["bg"],
+            fg=self.colors["text"]
+        )
+        self.info_label.pack(fill="x", padx=20, pady=10)
+    
+    def make_row(self, parent: tk.Misc) -> tk.Frame:
+        """Create one recycled agenda row"""
+        row = tk.Frame(parent, bg=self.colors["secondary"], cursor="hand2")
+        row.indicator = tk.Frame(row, width=3)
+        row.indicator.pack(side="left", fill="y", padx=(0, 5), pady=2)
+        row.info = tk.Label(row, font=("Segoe UI", 9), anchor="w",
+                            bg=self.colors["secondary"], fg=self.colors["fg"])
+        row.info.pack(side="left", fill="x", expand=True)
+        for widget in (row, row.info):
+            widget.bind("<Double-Button-1>", lambda e, r=row: self.select(r.item))
+        return row
+    
+    def bind_row(self, row: tk.Frame, merged: MergedEvent):
+        """Show a merged event in a recycled row"""
+        calendar_name = ", ".join(self.calendar_names[CalendarType(cal)] for cal in merged.calendars)
+        day = date.fromordinal(merged.gregorian_ordinal)
+        row.indicator.configure(bg="#dc3545" if merged.is_holiday else self.colors["accent"])
+        row.info.configure(text=f"{day.isoformat()}  {merged.event.title}  ({calendar_name})")
+    
+    def change_span(self):
+        """Restart the agenda from today for the selected span"""
+        today = date.today()
+        end = today + timedelta(days=self.SPANS[self.span_var.get()])
+        self.source = AgendaSource(self.event_manager, self.calendars, today, end)
+        self._loading = False
+        self.rows.set_items([], "Loading...", self.colors["text"])
+    
+    def load_more(self):
+        """Fetch the next page off the main thread unless one is already on its way"""
+        if self._loading or self.source is None or self.source.exhausted:
+            return
+        self._loading = True
+        source = self.source
+        
+        def task():
+            try:
+                page = source.next_page()
+            except Exception as e:
+                print(f"Error loading agenda: {e}")
+                page = []
+            self.dispatcher.post(self.append_page, source, page)
+        
+        threading.Thread(target=task, daemon=True).start()
+    
+    def append_page(self, source: AgendaSource, page: List[MergedEvent]):
+        """Main thread: add a fetched page unless the span changed or the dialog closed"""
+        if source is not self.source:
+            return
+        try:
+            if not self.dialog.winfo_exists():
+                return
+        except tk.TclError:
+            return
+        
+        self._loading = False
+        self.rows.extend(page)
+        if not self.rows.items and source.exhausted:
+            self.rows.set_items([], "No upcoming events", self.colors["text"])
+        self.info_label.config(
+            text=f"{len(self.rows.items)} events loaded" + ("" if source.exhausted else ", scroll for more")
+        )
+        if not page:
+            self.load_more()  # a year without events: keep going
+    
+    def select(self, merged: Optional[MergedEvent]):
+        if merged is not None and self.on_select:
+            self.on_select(merged.event)
+
+class RecurringEventDialog:
+    """Dialog for creating a recurring event in any calendar"""
+    
+    WEEKDAY_NAMES = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+    
+    def __init__(self, parent, calendar_names, colors, calendar: CalendarType):
+        self.parent = parent
+        self.calendar_names = calendar_names
+        self.colors = colors
+        self.calendar = calendar
+        self.converter = MultiCalendarConverter()
+        self.dialog = None
+        self.result = None
+    
+    def show(self) -> Optional[RecurrenceRule]:
+        """Show the dialog and return the created rule"""
+        self.dialog = tk.Toplevel(self.parent)
+        self.dialog.title("Add Recurring Event")
+        self.dialog.geometry("460x400")
+        self.dialog.configure(bg=self.colors["bg"])
+        self.dialog.transient(self.parent)
+        self.dialog.grab_set()
+        
+        self.create_content()
+        self.parent.wait_window(self.dialog)
+        return self.result
+    
+    def _row(self, label: str) -> tk.Frame:
+        row = tk.Frame(self.dialog, bg=self.colors["bg"])
+        row.pack(fill="x", padx=20, pady=6)
+        tk.Label(
+            row,
+            text=label,
+            font=("Segoe UI", 10),
+            bg=self.colors["bg"],
+            fg=self.colors["fg"],
+            width=14,
+            anchor="w"
+        ).pack(side="left")
+        return row
+    
+    def create_content(self):
+        """Create dialog content"""
+        self.title_var = tk.StringVar()
+        tk.Entry(self._row("Title:"), textvariable=self.title_var, width=30).pack(side="left")
+        
+        self.names = {name: cal_type for cal_type, name in self.calendar_names.items()}
+        self.cal_var = tk.StringVar(value=self.calendar_names[self.calendar])
+        ttk.Combobox(
+            self._row("Calendar:"),
+            textvariable=self.cal_var,
+            values=list(self.names),
+            state="readonly",
+            width=27
+        ).pack(side="left")
+        
+        self.freq_var = tk.StringVar(value="YEARLY")
+        ttk.Combobox(
+            self._row("Repeats:"),
+            textvariable=self.freq_var,
+            values=list(RecurrenceRule.FREQUENCIES),
+            state="readonly",
+            width=27
+        ).pack(side="left")
+        
+        today = date.today()
+        start = self.converter.convert_date(today.year, today.month, today.day,
+                                            CalendarType.GREGORIAN, self.calendar)
+        self.start_var = tk.StringVar(value=f"{start[0]}/{start[1]}/{start[2]}")
+        tk.Entry(self._row("First date (Y/M/D):"), textvariable=self.start_var, width=30).pack(side="left")
+        
+        self.interval_var = tk.IntVar(value=1)
+        tk.Spinbox(self._row("Every:"), from_=1, to=99, textvariable=self.interval_var, width=5).pack(side="left")
+        
+        weekday_row = self._row("Weekdays:")
+        self.weekday_vars = []
+        for name in self.WEEKDAY_NAMES:
+            var = tk.BooleanVar(value=False)
+            tk.Checkbutton(
+                weekday_row,
+                text=name,
+                variable=var,
+                bg=self.colors["bg"],
+                fg=self.colors["fg"],
+                selectcolor=self.colors["secondary"]
+            ).pack(side="left")
+            self.weekday_vars.append(var)
+        
+        button_frame = tk.Frame(self.dialog, bg=self.colors["bg"])
+        button_frame.pack(pady=20)
+        ModernButton(button_frame, text="Add", command=self.save).pack(side="left", padx=5)
+        ModernButton(button_frame, text="Cancel", command=self.dialog.destroy).pack(side="left", padx=5)
+    
+    def save(self):
+        """Validate input and build the rule"""
+        title = self.title_var.get().strip()
+        if not title:
+            messagebox.showerror("Error", "Please enter a title.", parent=self.dialog)
+            return
+        
+        try:
+            self.result = RecurrenceRule(
+                rule_id=hashlib.sha1(f"{title}|{time.time()}".encode("utf-8")).hexdigest()[:16],
+                calendar=self.names[self.cal_var.get()],
+                title=title,
+                freq=self.freq_var.get(),
+                start=_parse_ymd(self.start_var.get().strip()),
+                interval=int(self.interval_var.get()),
+                weekdays=tuple(i for i, var in enumerate(self.weekday_vars) if var.get()),
+            )
+        except (ValueError, tk.TclError) as e:
+            messagebox.showerror("Error", f"Invalid recurring event: {e}", parent=self.dialog)
+            return
+        
+        self.dialog.destroy()
+
 class CalendarSettingsDialog:
     """Calendar settings dialog"""
     
@@ -3037,11 +6230,14 @@ class GlobalCalendarApplication:
             "show_sun_times": True,
             "show_multiple_dates": True,
             "show_events": True,
+            "canvas_grid_modes": [],
+            "year_view_tooltips": True,
             "date_size": 14,
             "secondary_date_size": 9,
             "auto_update": True,
             "notifications": True,
             "timezone": "UTC",
+            "base_index": HOLIDAY_BUNDLE_FILE,
             "first_run": True,
             "version": self.version
         }
@@ -3184,8 +6380,39 @@ class GlobalCalendarApplication:
 # Main Entry Point
 # ============================================================================
 
+def build_holiday_bundle(path: str, first_year: int, last_year: int) -> int:
+    """Expand the default holidays of Gregorian years first_year..last_year,
+    in every calendar with rules, into an offline bundle file
+    
+    Returns the number of records written.
+    """
+    converter = MultiCalendarConverter()
+    engine = HolidayRuleEngine(DEFAULT_HOLIDAY_RULES, converter)
+    ranges = {}
+    for rule in DEFAULT_HOLIDAY_RULES:
+        if rule.calendar not in ranges:
+            first = converter.convert_date(first_year, 1, 1, CalendarType.GREGORIAN, rule.calendar)[0]
+            last = converter.convert_date(last_year, 12, 31, CalendarType.GREGORIAN, rule.calendar)[0]
+            ranges[rule.calendar] = (first, last)
+    return BaseEventIndex.build_from_rules(path, engine, ranges)
+
 def main():
-    """Main entry point"""
+    """Main entry point
+    
+    ``--build-holiday-bundle [path] [first_year] [last_year]`` writes the
+    offline holiday bundle instead of starting the application.
+    """
+    if len(sys.argv) > 1 and sys.argv[1] == "--build-holiday-bundle":
+        this_year = datetime.now().year
+        path = sys.argv[2] if len(sys.argv) > 2 else HOLIDAY_BUNDLE_FILE
+        first_year = int(sys.argv[3]) if len(sys.argv) > 3 else this_year - 50
+        last_year = int(sys.argv[4]) if len(sys.argv) > 4 else this_year + 50
+        start = time.perf_counter()
+        count = build_holiday_bundle(path, first_year, last_year)
+        print(f"Wrote {count} holidays for {first_year}-{last_year} to {path} "
+              f"({os.path.getsize(path) // 1024} KB, {time.perf_counter() - start:.2f} s)")
+        return
+    
     app = GlobalCalendarApplication()
     app.run()
 
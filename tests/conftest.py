@@ -0,0 +1,15 @@
+import os
+import sys
+import types
+
+# The apps import winsound at module level; it only exists on Windows
+if "winsound" not in sys.modules:
+    try:
+        import winsound  # noqa: F401
+    except ImportError:
+        winsound = types.ModuleType("winsound")
+        winsound.MB_OK = 0
+        winsound.MessageBeep = lambda *args: None
+        sys.modules["winsound"] = winsound
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
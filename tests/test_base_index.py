@@ -0,0 +1,24 @@
+import global_calendar_advanced01 as gc
+
+
+def build(path, rules):
+    engine = gc.HolidayRuleEngine(rules)
+    return gc.BaseEventIndex.build_from_rules(str(path), engine, {gc.CalendarType.PERSIAN: (1403, 1404)})
+
+
+def test_bundle_round_trips_rule_expansion(tmp_path):
+    path = tmp_path / "holidays.gcix"
+    build(path, gc.DEFAULT_HOLIDAY_RULES)
+
+    index = gc.BaseEventIndex.open(str(path))
+    assert index is not None and index.covers("persian", 1404)
+    expected = gc.HolidayRuleEngine(gc.DEFAULT_HOLIDAY_RULES).expand(gc.CalendarType.PERSIAN, 1404)
+    assert index.events_for("persian", 1404) == expected
+
+
+def test_bundle_built_from_other_rules_is_rejected(tmp_path):
+    path = tmp_path / "holidays.gcix"
+    build(path, gc.DEFAULT_HOLIDAY_RULES[:-1])
+
+    assert gc.BaseEventIndex.open(str(path)) is None
+    assert gc.BaseEventIndex.open(str(path), gc.DEFAULT_HOLIDAY_RULES[:-1]) is not None
@@ -0,0 +1,19 @@
+from datetime import date
+
+import global_calendar_advanced01 as gc
+
+
+def test_iran_march_2025_keeps_ramadan_as_working_days():
+    calc = gc.BusinessDayCalculator("IR")
+    days_off = [day for day in range(1, 32) if not calc.is_business_day(date(2025, 3, day))]
+
+    # Fridays, Nowruz and its holidays, Eid al-Fitr; Ramadan (1-29 March) is a working month
+    assert days_off == [7, 14, 21, 22, 23, 24, 28, 30]
+    assert calc.business_days_between(date(2025, 3, 1), date(2025, 3, 31)) == 22
+
+
+def test_international_new_years_eve_is_a_working_day():
+    calc = gc.BusinessDayCalculator("INTL")
+
+    assert not calc.is_business_day(date(2025, 12, 25))
+    assert calc.is_business_day(date(2025, 12, 31))
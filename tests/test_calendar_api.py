@@ -0,0 +1,73 @@
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+import global_calendar01 as gc
+
+PAGE = """<html><body><table id="holidays-table">
+<tr><th>Date</th><th>Weekday</th><th>Name</th></tr>
+<tr><td>Mar 21</td><td>Friday</td><td>Nowruz</td></tr>
+</table></body></html>""".encode("utf-8")
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    requests_seen = []
+
+    def do_GET(self):
+        self.requests_seen.append(dict(self.headers))
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("ETag", '"v1"')
+        self.send_header("Content-Length", str(len(PAGE)))
+        self.end_headers()
+        self.wfile.write(PAGE)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    StubHandler.requests_seen = []
+    server = HTTPServer(("127.0.0.1", 0), StubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_conditional_get_reuses_events_on_304(stub_server, monkeypatch):
+    api = gc.CalendarAPI(base_url=stub_server)
+    try:
+        first = api._fetch_online_events(2025, "gregorian")
+        assert [event["title"] for event in first] == ["Nowruz"]
+
+        def fail(*args, **kwargs):
+            raise AssertionError("a 304 response must not be parsed")
+
+        monkeypatch.setattr(api, "parse_holidays_table", fail)
+        second = api._fetch_online_events(2025, "gregorian")
+    finally:
+        api.close()
+
+    assert second == first
+    assert "If-None-Match" not in StubHandler.requests_seen[0]
+    assert StubHandler.requests_seen[1]["If-None-Match"] == '"v1"'
+
+
+def test_sync_year_reports_unchanged_year(stub_server):
+    api = gc.CalendarAPI(base_url=stub_server)
+    try:
+        events, changed = api.sync_year(2025, "gregorian")
+        again, changed_again = api.sync_year(2025, "gregorian")
+    finally:
+        api.close()
+
+    assert changed and not changed_again
+    assert again == events
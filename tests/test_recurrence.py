@@ -0,0 +1,39 @@
+import pytest
+
+import global_calendar_advanced01 as gc
+
+
+def make_rule(start, calendar=gc.CalendarType.PERSIAN, **kwargs):
+    return gc.RecurrenceRule("r1", calendar, "Birthday", "YEARLY", start, **kwargs)
+
+
+@pytest.mark.parametrize("start", [(1403, 13, 1), (1403, 0, 5), (1403, 7, 31), (1404, 12, 30), (1403, 1, 0)])
+def test_invalid_persian_start_dates_are_rejected(start):
+    with pytest.raises(ValueError):
+        make_rule(start)
+
+
+def test_valid_start_dates_are_accepted():
+    make_rule((1403, 12, 30))  # 1403 is a leap year
+    make_rule((1403, 6, 31))
+    make_rule((2024, 2, 29), gc.CalendarType.GREGORIAN)
+
+
+def test_bad_saved_rule_is_skipped_without_breaking_expansion():
+    store = gc.RecurringEventStore(gc.HolidayRuleEngine(gc.DEFAULT_HOLIDAY_RULES))
+    store.load([
+        {"id": "bad", "calendar": "persian", "title": "Bad", "freq": "YEARLY", "start": "1403/13/1"},
+        {"id": "good", "calendar": "persian", "title": "Good", "freq": "YEARLY", "start": "1403/2/10"},
+    ])
+
+    assert list(store.rules) == ["good"]
+    assert [(e.year, e.month, e.day) for e in store.expand(gc.CalendarType.PERSIAN, 1405)] == [(1405, 2, 10)]
+
+
+def test_monthly_rule_skips_short_months():
+    store = gc.RecurringEventStore(gc.HolidayRuleEngine(gc.DEFAULT_HOLIDAY_RULES))
+    store.add(gc.RecurrenceRule("m", gc.CalendarType.PERSIAN, "Rent", "MONTHLY", (1403, 1, 31), count=7))
+
+    months = [e.month for e in store.expand(gc.CalendarType.PERSIAN, 1403)]
+    assert months == [1, 2, 3, 4, 5, 6]
+    assert [e.month for e in store.expand(gc.CalendarType.PERSIAN, 1404)] == [1]
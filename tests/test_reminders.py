@@ -0,0 +1,29 @@
+from datetime import datetime, timedelta
+
+import global_calendar01 as gc
+
+
+class FakeWidget:
+    def after(self, ms, callback):
+        return object()
+
+    def after_cancel(self, after_id):
+        pass
+
+
+def test_rescheduling_does_not_refire_a_fired_reminder():
+    fired = []
+    scheduler = gc.ReminderScheduler(FakeWidget(), fired.append)
+    when = datetime.now(scheduler.timezone).replace(tzinfo=None) - timedelta(minutes=10)
+
+    assert scheduler.add("event:a", when, "A")
+    scheduler._wake()
+    assert fired == ["A"]
+
+    # Same reminder re-added within the grace period, e.g. after saving settings
+    assert not scheduler.add("event:a", when, "A")
+    scheduler._wake()
+    assert fired == ["A"]
+
+    # Moving it into the future schedules it again
+    assert scheduler.add("event:a", when + timedelta(hours=1), "A")
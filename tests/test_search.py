@@ -0,0 +1,17 @@
+import global_calendar_advanced01 as gc
+
+
+def test_heh_with_hamza_folds_to_heh():
+    assert gc.normalize_search_text("خانۀ") == gc.normalize_search_text("خانه")
+    assert gc.normalize_search_text("خانۀ").endswith("ه")
+
+
+def test_letter_variants_digits_and_joiners_fold():
+    assert gc.normalize_search_text("كريم") == gc.normalize_search_text("کریم")
+    assert gc.normalize_search_text("آزادي") == gc.normalize_search_text("ازادی")
+    assert gc.normalize_search_text("می‌روم") == "میروم"
+    assert gc.tokenize_search_text("روز ۱۳ فروردین") == ["روز", "13", "فروردین"]
+
+
+def test_case_and_latin_diacritics_fold():
+    assert gc.tokenize_search_text("Café NOWRUZ") == ["cafe", "nowruz"]